@@ -0,0 +1,2 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Gammapy benchmarks, see ``dev/benchmarks/README.rst``."""
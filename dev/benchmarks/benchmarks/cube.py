@@ -0,0 +1,55 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Benchmarks for `gammapy.cube`."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import shutil
+import tempfile
+from astropy.coordinates import Angle
+from gammapy.cube import MapMaker, MapFit
+from gammapy.utils.scripts import make_path
+from .synthetic import make_geom, make_data_store, make_map_dataset
+
+
+class MapMakerRun(object):
+    """Counts, exposure and background cubes for four observations.
+
+    The events and IRFs are read from disk as part of the run, as in
+    production.
+    """
+
+    timeout = 300
+
+    def setup(self):
+        self.base_dir = tempfile.mkdtemp()
+        data_store = make_data_store(make_path(self.base_dir), n_obs=4)
+        self.obs_list = data_store.obs_list(data_store.obs_table["OBS_ID"])
+        self.geom = make_geom(npix=250, nbin=5)
+
+    def teardown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _run(self):
+        maker = MapMaker(self.geom, offset_max=Angle(2.5, "deg"))
+        maker.run(self.obs_list)
+
+    def time_run(self):
+        self._run()
+
+    def peakmem_run(self):
+        self._run()
+
+
+class MapFitTotalStat(object):
+    """Likelihood and gradient evaluation of a 3D fit."""
+
+    def setup(self):
+        self.fit = MapFit(**make_map_dataset(npix=100, nbin=3))
+        self.parameters = self.fit._model.parameters
+
+    def time_total_stat(self):
+        self.fit.total_stat(self.parameters)
+
+    def time_total_stat_gradient(self):
+        self.fit.total_stat_gradient(self.parameters)
+
+    def peakmem_total_stat(self):
+        self.fit.total_stat(self.parameters)
@@ -0,0 +1,71 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Benchmarks for `gammapy.data`."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import shutil
+import tempfile
+import astropy.units as u
+from astropy.coordinates import Angle
+from gammapy.utils.scripts import make_path
+from .synthetic import POINTING, make_events, make_data_store
+
+
+class EventListSelect(object):
+    """Event selection methods."""
+
+    params = [int(1e5), int(1e6)]
+    param_names = ["n_events"]
+
+    def setup(self, n_events):
+        self.events = make_events(n_events)
+        self.time_interval = self.events.time_ref + [0, 900] * u.s
+
+    def time_select_energy(self, n_events):
+        self.events.select_energy([1, 10] * u.TeV)
+
+    def time_select_time(self, n_events):
+        self.events.select_time(self.time_interval)
+
+    def time_select_offset(self, n_events):
+        self.events.select_offset(Angle([0.5, 1.5], "deg"))
+
+    def time_select_sky_cone(self, n_events):
+        self.events.select_sky_cone(center=POINTING, radius=Angle(1, "deg"))
+
+    def time_select_sky_box(self, n_events):
+        lon_lim = Angle([82.63, 84.63], "deg")
+        lat_lim = Angle([21.01, 23.01], "deg")
+        self.events.select_sky_box(lon_lim=lon_lim, lat_lim=lat_lim)
+
+    def peakmem_select_sky_cone(self, n_events):
+        self.events.select_sky_cone(center=POINTING, radius=Angle(1, "deg"))
+
+
+class DataStoreObsList(object):
+    """Loading observations from a data store on disk."""
+
+    params = [1, 10]
+    param_names = ["n_obs"]
+
+    def setup(self, n_obs):
+        self.base_dir = tempfile.mkdtemp()
+        self.data_store = make_data_store(make_path(self.base_dir), n_obs=n_obs)
+        self.obs_id = list(self.data_store.obs_table["OBS_ID"])
+
+    def teardown(self, n_obs):
+        shutil.rmtree(self.base_dir)
+
+    def _load(self):
+        obs_list = self.data_store.obs_list(self.obs_id)
+        for obs in obs_list:
+            for name in ["events", "aeff", "bkg"]:
+                getattr(obs, name)
+        return obs_list
+
+    def time_obs_list(self, n_obs):
+        self.data_store.obs_list(self.obs_id)
+
+    def time_obs_list_load(self, n_obs):
+        self._load()
+
+    def peakmem_obs_list_load(self, n_obs):
+        self._load()
@@ -0,0 +1,25 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Benchmarks for `gammapy.detect`."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from astropy.convolution import Gaussian2DKernel
+from gammapy.detect import TSMapEstimator
+from .synthetic import make_ts_maps
+
+
+class TSMapEstimatorRun(object):
+    """TS map of a 100 x 100 pixel image."""
+
+    params = ["root brentq", "leastsq iter", "root vectorized"]
+    param_names = ["method"]
+    timeout = 300
+
+    def setup(self, method):
+        self.maps = make_ts_maps(npix=100)
+        self.kernel = Gaussian2DKernel(5)
+        self.estimator = TSMapEstimator(method=method, n_jobs=1)
+
+    def time_run(self, method):
+        self.estimator.run(self.maps, kernel=self.kernel)
+
+    def peakmem_run(self, method):
+        self.estimator.run(self.maps, kernel=self.kernel)
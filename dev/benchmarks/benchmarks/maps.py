@@ -0,0 +1,53 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Benchmarks for `gammapy.maps`."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import astropy.units as u
+from gammapy.maps import Map, WcsGeom
+from gammapy.cube import PSFKernel
+from .synthetic import POINTING, make_geom, make_events
+
+
+class WcsNDMapSuite(object):
+    """Filling, interpolation, reprojection and convolution of a sky cube."""
+
+    def setup(self):
+        geom = make_geom(npix=400, nbin=5)
+        self.map = Map.from_geom(geom)
+        self.map.data += 1.
+
+        events = make_events(int(1e6))
+        self.coords = {
+            "lon": events.table["RA"].data,
+            "lat": events.table["DEC"].data,
+            "energy": events.table["ENERGY"].data,
+        }
+
+        self.geom_gal = WcsGeom.create(
+            skydir=POINTING.galactic,
+            npix=300,
+            binsz=0.025,
+            coordsys="GAL",
+            proj="CAR",
+            axes=geom.axes,
+        )
+        self.kernel = PSFKernel.from_gauss(
+            geom, sigma=0.1 * u.deg, max_radius=0.5 * u.deg
+        )
+
+    def time_fill_by_coord(self):
+        self.map.fill_by_coord(self.coords)
+
+    def peakmem_fill_by_coord(self):
+        self.map.fill_by_coord(self.coords)
+
+    def time_interp_by_coord(self):
+        self.map.interp_by_coord(self.coords, interp="linear")
+
+    def time_reproject(self):
+        self.map.reproject(self.geom_gal)
+
+    def peakmem_reproject(self):
+        self.map.reproject(self.geom_gal)
+
+    def time_convolve(self):
+        self.map.convolve(self.kernel)
@@ -0,0 +1,23 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Benchmarks for `gammapy.spectrum`."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from gammapy.spectrum import SpectrumFit
+from .synthetic import make_spectrum_obs_list
+
+
+class SpectrumFitTotalStat(object):
+    """Likelihood evaluation of a joint 1D fit."""
+
+    params = [1, 10]
+    param_names = ["n_obs"]
+
+    def setup(self, n_obs):
+        obs_list, model = make_spectrum_obs_list(n_obs=n_obs)
+        self.fit = SpectrumFit(obs_list, model, stat="wstat")
+        self.parameters = self.fit._model.parameters
+
+    def time_total_stat(self, n_obs):
+        self.fit.total_stat(self.parameters)
+
+    def time_total_stat_gradient(self, n_obs):
+        self.fit.total_stat_gradient(self.parameters)
@@ -0,0 +1,340 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Synthetic datasets for the benchmarks.
+
+Everything is generated locally from a fixed random seed, so the benchmarks
+need neither network access nor ``GAMMAPY_DATA`` / ``GAMMAPY_EXTRA``.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.io import fits
+from astropy.table import Table
+from gammapy.data import EventList, DataStore
+from gammapy.irf import (
+    EffectiveAreaTable,
+    EffectiveAreaTable2D,
+    Background3D,
+    EnergyDispersion,
+)
+from gammapy.maps import MapAxis, WcsGeom, Map
+from gammapy.cube import MapEvaluator, PSFKernel, make_map_exposure_true_energy
+from gammapy.cube.models import SkyModel
+from gammapy.image.models import SkyGaussian
+from gammapy.spectrum import (
+    CountsPredictor,
+    PHACountsSpectrum,
+    SpectrumObservation,
+    SpectrumObservationList,
+)
+from gammapy.spectrum.models import PowerLaw, ExponentialCutoffPowerLaw
+from gammapy.utils.random import get_random_state
+
+__all__ = [
+    "POINTING",
+    "LIVETIME",
+    "make_geom",
+    "make_aeff_2d",
+    "make_bkg_3d",
+    "make_events",
+    "make_data_store",
+    "make_map_dataset",
+    "make_ts_maps",
+    "make_spectrum_obs_list",
+]
+
+POINTING = SkyCoord(83.63, 22.01, unit="deg", frame="icrs")
+"""Pointing position of the first synthetic observation."""
+
+LIVETIME = 1800 * u.s
+"""Livetime of every synthetic observation."""
+
+
+def make_geom(npix=250, binsz=0.02, nbin=5, emin=0.1, emax=100, skydir=POINTING):
+    """Sky cube geometry with a log energy axis in TeV."""
+    energy = np.logspace(np.log10(emin), np.log10(emax), nbin + 1)
+    axis = MapAxis.from_edges(energy, name="energy", unit="TeV", interp="log")
+    return WcsGeom.create(
+        skydir=skydir, npix=npix, binsz=binsz, coordsys="CEL", axes=[axis]
+    )
+
+
+def make_aeff_2d():
+    """Effective area rising to 1e5 m2 and falling off with offset."""
+    energy = np.logspace(-2, 2, 41) * u.TeV
+    offset = np.linspace(0, 5, 11) * u.deg
+
+    energy_center = np.sqrt(energy[:-1] * energy[1:]).value
+    offset_center = 0.5 * (offset[:-1] + offset[1:]).value
+    data = 1e5 * (1 - np.exp(-energy_center / 0.1))[:, np.newaxis]
+    data = data * np.exp(-0.5 * (offset_center / 2.5) ** 2)
+
+    return EffectiveAreaTable2D(
+        energy_lo=energy[:-1],
+        energy_hi=energy[1:],
+        offset_lo=offset[:-1],
+        offset_hi=offset[1:],
+        data=data * u.m ** 2,
+    )
+
+
+def make_bkg_3d():
+    """Power law background rate falling off with offset."""
+    energy = np.logspace(-1, 2, 21) * u.TeV
+    fov = np.linspace(-5, 5, 21) * u.deg
+
+    energy_center = np.sqrt(energy[:-1] * energy[1:]).value
+    fov_center = 0.5 * (fov[:-1] + fov[1:]).value
+    offset2 = fov_center[:, np.newaxis] ** 2 + fov_center ** 2
+    data = 1e-3 * (energy_center / 0.1)[:, np.newaxis, np.newaxis] ** -2.7
+    data = data * np.exp(-0.5 * offset2 / 2. ** 2)
+
+    return Background3D(
+        energy_lo=energy[:-1],
+        energy_hi=energy[1:],
+        fov_lon_lo=fov[:-1],
+        fov_lon_hi=fov[1:],
+        fov_lat_lo=fov[:-1],
+        fov_lat_hi=fov[1:],
+        data=data * u.Unit("s-1 MeV-1 sr-1"),
+    )
+
+
+def make_events(n_events=int(1e5), pointing=POINTING, obs_id=1, random_state=0):
+    """Power law events distributed in a 3 deg disk around the pointing."""
+    random_state = get_random_state(random_state)
+
+    offset = 3 * np.sqrt(random_state.uniform(size=n_events))
+    phi = random_state.uniform(0, 2 * np.pi, size=n_events)
+    dec = pointing.dec.deg + offset * np.sin(phi)
+    ra = pointing.ra.deg + offset * np.cos(phi) / np.cos(np.radians(dec))
+
+    # power law with index 2.7 above 0.1 TeV
+    energy = 0.1 * (1 - random_state.uniform(size=n_events)) ** (-1 / 1.7)
+    time = np.sort(random_state.uniform(0, LIVETIME.value, size=n_events))
+
+    table = Table()
+    table["EVENT_ID"] = np.arange(n_events)
+    table["TIME"] = time * u.s
+    table["RA"] = ra * u.deg
+    table["DEC"] = dec * u.deg
+    table["ENERGY"] = np.clip(energy, 0.1, 100) * u.TeV
+
+    table.meta.update(
+        OBS_ID=obs_id,
+        RA_PNT=pointing.ra.deg,
+        DEC_PNT=pointing.dec.deg,
+        MJDREFI=51910,
+        MJDREFF=7.428703703703703e-4,
+        TIMESYS="tt",
+        TSTART=0.,
+        TSTOP=LIVETIME.value,
+        ONTIME=LIVETIME.value,
+        LIVETIME=LIVETIME.value,
+        DEADC=1.,
+    )
+    return EventList(table)
+
+
+def make_data_store(base_dir, n_obs=4, n_events=int(1e5)):
+    """Write a data store with events, effective area and background.
+
+    Every observation is stored in one file, the pointing positions are
+    shifted by 0.5 deg in RA.
+
+    Parameters
+    ----------
+    base_dir : `~pathlib.Path`
+        Directory to write the files to.
+    n_obs : int
+        Number of observations
+    n_events : int
+        Number of events per observation
+
+    Returns
+    -------
+    data_store : `~gammapy.data.DataStore`
+        Data store
+    """
+    aeff, bkg = make_aeff_2d(), make_bkg_3d()
+
+    hdu_rows, obs_rows = [], []
+    for idx in range(n_obs):
+        obs_id = idx + 1
+        pointing = SkyCoord(
+            POINTING.ra.deg + 0.5 * idx, POINTING.dec.deg, unit="deg", frame="icrs"
+        )
+        events = make_events(n_events, pointing, obs_id=obs_id, random_state=obs_id)
+
+        filename = "obs_{:06d}.fits".format(obs_id)
+        hdu_list = fits.HDUList(
+            [
+                fits.PrimaryHDU(),
+                fits.BinTableHDU(events.table, name="EVENTS"),
+                aeff.to_fits(),
+                bkg.to_fits(),
+            ]
+        )
+        hdu_list.writeto(str(base_dir / filename))
+
+        for hdu_type, hdu_class, hdu_name in [
+            ("events", "events", "EVENTS"),
+            ("aeff", "aeff_2d", "EFFECTIVE AREA"),
+            ("bkg", "bkg_3d", "BACKGROUND"),
+        ]:
+            hdu_rows.append((obs_id, hdu_type, hdu_class, ".", filename, hdu_name))
+
+        obs_rows.append(
+            (
+                obs_id,
+                pointing.ra.deg,
+                pointing.dec.deg,
+                0.,
+                LIVETIME.value,
+                LIVETIME.value,
+                LIVETIME.value,
+                1.,
+            )
+        )
+
+    names = ["OBS_ID", "HDU_TYPE", "HDU_CLASS", "FILE_DIR", "FILE_NAME", "HDU_NAME"]
+    hdu_table = Table(rows=hdu_rows, names=names)
+    hdu_table.write(str(base_dir / DataStore.DEFAULT_HDU_TABLE), format="fits")
+
+    names = [
+        "OBS_ID",
+        "RA_PNT",
+        "DEC_PNT",
+        "TSTART",
+        "TSTOP",
+        "ONTIME",
+        "LIVETIME",
+        "DEADC",
+    ]
+    obs_table = Table(rows=obs_rows, names=names)
+    obs_table.write(str(base_dir / DataStore.DEFAULT_OBS_TABLE), format="fits")
+
+    return DataStore.from_dir(base_dir)
+
+
+def make_map_dataset(npix=100, nbin=3, random_state=0):
+    """Counts, exposure, background, PSF, energy dispersion and a source model.
+
+    The counts are a Poisson realisation of the model prediction.
+
+    Returns
+    -------
+    dataset : dict
+        Keyword arguments for `~gammapy.cube.MapFit`.
+    """
+    geom = make_geom(npix=npix, nbin=nbin)
+    geom_true = make_geom(npix=npix, nbin=nbin + 1)
+
+    exposure = make_map_exposure_true_energy(
+        pointing=POINTING, livetime=LIVETIME, aeff=make_aeff_2d(), geom=geom_true
+    )
+
+    background = Map.from_geom(geom)
+    background.data += 1e-2
+
+    psf = PSFKernel.from_gauss(geom_true, sigma=0.1 * u.deg, max_radius=0.5 * u.deg)
+
+    e_true = geom_true.get_axis_by_name("energy").edges * u.TeV
+    e_reco = geom.get_axis_by_name("energy").edges * u.TeV
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+
+    spatial_model = SkyGaussian(
+        lon_0=POINTING.ra.deg * u.deg, lat_0=POINTING.dec.deg * u.deg, sigma="0.2 deg"
+    )
+    spectral_model = PowerLaw(
+        index=2.5, amplitude="1e-11 cm-2 s-1 TeV-1", reference="1 TeV"
+    )
+    model = SkyModel(spatial_model=spatial_model, spectral_model=spectral_model)
+
+    evaluator = MapEvaluator(
+        model=model, exposure=exposure, background=background, psf=psf, edisp=edisp
+    )
+    npred = evaluator.compute_npred()
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(random_state).poisson(npred).astype(float)
+
+    return dict(
+        model=model,
+        counts=counts,
+        exposure=exposure,
+        background=background,
+        psf=psf,
+        edisp=edisp,
+    )
+
+
+def make_ts_maps(npix=100, binsz=0.02, random_state=0):
+    """Counts, exposure and background images with a Gaussian source."""
+    geom = WcsGeom.create(skydir=POINTING, npix=npix, binsz=binsz, coordsys="CEL")
+
+    background = Map.from_geom(geom)
+    background.data += 1.
+
+    exposure = Map.from_geom(geom, unit="cm2 s")
+    exposure.data += 1e11
+
+    # Gaussian source with sigma = 0.1 deg and 1e-9 cm-2 s-1 total flux
+    x, y = np.indices(background.data.shape) - 0.5 * (npix - 1)
+    sigma = 0.1 / binsz
+    source = np.exp(-0.5 * (x ** 2 + y ** 2) / sigma ** 2) / (2 * np.pi * sigma ** 2)
+    npred = background.data + 1e-9 * exposure.data * source
+
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(random_state).poisson(npred).astype(float)
+
+    return dict(counts=counts, exposure=exposure, background=background)
+
+
+def make_spectrum_obs_list(n_obs=4, random_state=0):
+    """Spectrum observations of a cutoff power law with a power law background."""
+    random_state = get_random_state(random_state)
+
+    e_true = np.logspace(-1.5, 2.5, 201) * u.TeV
+    e_reco = np.logspace(-1, 2, 73) * u.TeV
+    aeff = EffectiveAreaTable.from_parametrization(e_true)
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.1, bias=0)
+
+    model = ExponentialCutoffPowerLaw(
+        index=2.2,
+        amplitude=3e-11 * u.Unit("cm-2 s-1 TeV-1"),
+        reference=1 * u.TeV,
+        lambda_=0.1 / u.TeV,
+    )
+    bkg_model = PowerLaw(index=2.7, amplitude=1e2 / u.TeV, reference=1 * u.TeV)
+
+    predictor = CountsPredictor(model=model, aeff=aeff, edisp=edisp, livetime=LIVETIME)
+    predictor.run()
+    npred = predictor.npred.data.data.value
+    npred_bkg = bkg_model.integral(e_reco[:-1], e_reco[1:], intervals=True).value
+    alpha = 0.2
+
+    obs_list = SpectrumObservationList()
+    for obs_id in range(1, n_obs + 1):
+        on_vector = PHACountsSpectrum(
+            energy_lo=e_reco[:-1],
+            energy_hi=e_reco[1:],
+            data=random_state.poisson(npred + npred_bkg),
+            backscal=1,
+            obs_id=obs_id,
+            livetime=LIVETIME,
+        )
+        off_vector = PHACountsSpectrum(
+            energy_lo=e_reco[:-1],
+            energy_hi=e_reco[1:],
+            data=random_state.poisson(npred_bkg / alpha),
+            backscal=1. / alpha,
+            is_bkg=True,
+            obs_id=obs_id,
+            livetime=LIVETIME,
+        )
+        obs = SpectrumObservation(
+            on_vector=on_vector, aeff=aeff, off_vector=off_vector, edisp=edisp
+        )
+        obs_list.append(obs)
+
+    return obs_list, model
@@ -5,7 +5,7 @@ from itertools import product
 import numpy as np
 from astropy.convolution import Ring2DKernel, Tophat2DKernel
 from astropy.coordinates import Angle
-from ..image.utils import scale_cube
+from ..maps.utils import FFTMultiConvolver
 
 __all__ = ["AdaptiveRingBackgroundEstimator", "RingBackgroundEstimator"]
 
@@ -92,19 +92,8 @@ class AdaptiveRingBackgroundEstimator(object):
         """Parameter dict."""
         return self._parameters
 
-    def kernels(self, image):
-        """Ring kernels according to the specified method.
-
-        Parameters
-        ----------
-        image : `~gammapy.maps.WcsNDMap`
-            Map specifying the WCS information.
-
-        Returns
-        -------
-        kernels : list
-            List of `~astropy.convolution.Ring2DKernel`
-        """
+    def _radii(self, image):
+        """Ring inner radii and widths in pixels, in the order they are tried."""
         p = self.parameters
 
         scale = image.geom.pixel_scales[0].to("deg")
@@ -122,83 +111,84 @@ class AdaptiveRingBackgroundEstimator(object):
         else:
             raise ValueError("Invalid method: {}".format(p["method"]))
 
+        return list(product(r_ins, widths))
+
+    def kernels(self, image):
+        """Ring kernels according to the specified method.
+
+        Parameters
+        ----------
+        image : `~gammapy.maps.WcsNDMap`
+            Map specifying the WCS information.
+
+        Returns
+        -------
+        kernels : list
+            List of `~astropy.convolution.Ring2DKernel`
+        """
         kernels = []
-        for r_in, width in product(r_ins, widths):
+        for r_in, width in self._radii(image):
             kernel = Ring2DKernel(r_in, width)
             kernel.normalize("peak")
             kernels.append(kernel)
 
         return kernels
 
-    @staticmethod
-    def _alpha_approx_cube(cubes):
-        """Compute alpha as on_exposure / off_exposure.
+    def _exposure_on_image(self, exposure_on):
+        """Compute on exposure image.
 
-        Where off_exposure < 0, alpha is set to infinity.
-        """
-        exposure_on = cubes["exposure_on"]
-        exposure_off = cubes["exposure_off"]
-        alpha_approx = np.where(exposure_off > 0, exposure_on / exposure_off, np.inf)
-        return alpha_approx
-
-    @staticmethod
-    def _exposure_off_cube(exposure_on, exclusion, kernels):
-        """Compute off exposure cube.
-
-        The on exposure is convolved with different
-        ring kernels and stacking the data along the third dimension.
-        """
-        exposure = exposure_on.data
-        exclusion = exclusion.data
-        return scale_cube(exposure * exclusion, kernels)
-
-    def _exposure_on_cube(self, exposure_on, kernels):
-        """Compute on exposure cube.
-
-        Calculated by convolving the on exposure with a tophat
-        of radius theta, and stacking all images along the third dimension.
+        Calculated by convolving the on exposure with a tophat of radius theta.
         """
         scale = exposure_on.geom.pixel_scales[0].to("deg")
         theta = self.parameters["theta"] * scale
 
         tophat = Tophat2DKernel(theta.value)
         tophat.normalize("peak")
-        exposure_on = exposure_on.convolve(tophat.array)
-        exposure_on_cube = np.repeat(
-            exposure_on.data[:, :, np.newaxis], len(kernels), axis=2
-        )
-        return exposure_on_cube
-
-    @staticmethod
-    def _off_cube(counts, exclusion, kernels):
-        """Compute off cube.
+        return exposure_on.convolve(tophat.array).data
 
-        Calculated by convolving the raw counts with different ring kernels
-        and stacking the data along the third dimension.
-        """
-        return scale_cube(counts.data * exclusion.data, kernels)
-
-    def _reduce_cubes(self, cubes):
+    def _reduce_rings(self, exposure_on, exposure_off_excluded, off_excluded, radii):
         """Compute off and off exposure map.
 
-        Calulated by reducing the cubes. The data is
-        iterated along the third axis (i.e. increasing ring sizes), the value
-        with the first approximate alpha < threshold is taken.
+        The rings are iterated by increasing size, for every pixel the value
+        with the first approximate alpha < threshold is taken. A ring
+        convolution is the difference of two disk convolutions, see
+        `_DiskConvolver`, so only one ring image is held in memory at a time.
         """
         threshold = self._parameters["threshold_alpha"]
 
-        alpha_approx_cube = cubes["alpha_approx"]
-        off_cube = cubes["off"]
-        exposure_off_cube = cubes["exposure_off"]
-
-        shape = alpha_approx_cube.shape[:2]
+        shape = exposure_on.shape
         off = np.tile(np.nan, shape)
         exposure_off = np.tile(np.nan, shape)
 
-        for idx in np.arange(alpha_approx_cube.shape[-1]):
-            mask = (alpha_approx_cube[:, :, idx] <= threshold) & np.isnan(off)
-            off[mask] = off_cube[:, :, idx][mask]
-            exposure_off[mask] = exposure_off_cube[:, :, idx][mask]
+        # ring pixels fulfil r_in ** 2 <= r ** 2 <= (r_in + width) ** 2, as
+        # in `~astropy.convolution.Ring2DKernel`
+        disks = [
+            (
+                _DiskConvolver.rr_max(r_in ** 2, closed=False),
+                _DiskConvolver.rr_max((r_in + width) ** 2, closed=True),
+            )
+            for r_in, width in radii
+        ]
+        convolver = _DiskConvolver(
+            [exposure_off_excluded, off_excluded],
+            rr_max=max(rr_out for _, rr_out in disks),
+        )
+
+        for idx, (rr_in, rr_out) in enumerate(disks):
+            exposure_off_outer, off_outer = convolver.convolve(rr_out)
+            exposure_off_inner, off_inner = convolver.convolve(rr_in)
+            convolver.release(keep=[rr for disk in disks[idx + 1 :] for rr in disk])
+            exposure_off_ring = exposure_off_outer - exposure_off_inner
+
+            alpha_approx = np.where(
+                exposure_off_ring > 0, exposure_on / exposure_off_ring, np.inf
+            )
+            mask = (alpha_approx <= threshold) & np.isnan(off)
+            off[mask] = (off_outer - off_inner)[mask]
+            exposure_off[mask] = exposure_off_ring[mask]
+
+            if not np.isnan(off).any():
+                break
 
         return exposure_off, off
 
@@ -221,15 +211,12 @@ class AdaptiveRingBackgroundEstimator(object):
         if not counts.geom.is_image:
             raise ValueError("Only 2D maps are supported")
 
-        kernels = self.kernels(counts)
-        cubes = {
-            "exposure_on": self._exposure_on_cube(exposure_on, kernels),
-            "exposure_off": self._exposure_off_cube(exposure_on, exclusion, kernels),
-            "off": self._off_cube(counts, exclusion, kernels),
-        }
-        cubes["alpha_approx"] = self._alpha_approx_cube(cubes)
-
-        exposure_off, off = self._reduce_cubes(cubes)
+        exposure_off, off = self._reduce_rings(
+            exposure_on=self._exposure_on_image(exposure_on),
+            exposure_off_excluded=exposure_on.data * exclusion.data,
+            off_excluded=counts.data * exclusion.data,
+            radii=self._radii(counts),
+        )
         alpha = exposure_on.data / exposure_off
 
         # set data outside fov to zero
@@ -247,6 +234,78 @@ class AdaptiveRingBackgroundEstimator(object):
         }
 
 
+class _DiskConvolver(object):
+    """Convolve images with disk kernels of many radii.
+
+    The Fourier transforms of the images are computed once and shared by all
+    disks. On a pixel grid a disk is fully defined by the largest squared
+    pixel distance ``rr_max`` it contains, so radii selecting the same pixels
+    share one convolution. Results are cached until `release` is called.
+
+    Parameters
+    ----------
+    images : list of `~numpy.ndarray`
+        Images of equal shape.
+    rr_max : int
+        Largest ``rr_max`` of the disks that will be used.
+    """
+
+    def __init__(self, images, rr_max):
+        size = 2 * int(np.sqrt(max(rr_max, 0)) + 1) + 1
+        center = (size - 1) // 2
+
+        self._convolver = FFTMultiConvolver(images[0].shape, (size, size))
+        self._spectra = [self._convolver.data_spectrum(image) for image in images]
+
+        y, x = np.indices((size, size)) - center
+        self._rr = x ** 2 + y ** 2
+        self._cache = {}
+
+    @staticmethod
+    def rr_max(radius_squared, closed=True):
+        """Largest squared pixel distance inside a disk.
+
+        Parameters
+        ----------
+        radius_squared : float
+            Squared disk radius in pixels.
+        closed : bool
+            Whether pixels at exactly the disk radius are included.
+        """
+        if closed:
+            return int(np.floor(radius_squared))
+        else:
+            return int(np.ceil(radius_squared)) - 1
+
+    def convolve(self, rr_max):
+        """Convolve all images with a peak normalised disk.
+
+        Parameters
+        ----------
+        rr_max : int
+            Largest squared pixel distance inside the disk.
+
+        Returns
+        -------
+        images : list of `~numpy.ndarray`
+            Convolved images, same order as the input images.
+        """
+        if rr_max not in self._cache:
+            kernel = (self._rr <= rr_max).astype(float)
+            kernel_spectrum = self._convolver.kernel_spectrum(kernel)
+            self._cache[rr_max] = [
+                self._convolver.convolve(spectrum, kernel_spectrum)
+                for spectrum in self._spectra
+            ]
+        return self._cache[rr_max]
+
+    def release(self, keep=()):
+        """Drop cached convolutions of disks not listed in ``keep``."""
+        for rr_max in list(self._cache):
+            if rr_max not in keep:
+                del self._cache[rr_max]
+
+
 class RingBackgroundEstimator(object):
     """Ring background method for cartesian coordinates.
 
@@ -97,3 +97,23 @@ class TestAdaptiveRingBackgroundEstimator:
         assert_allclose(result["alpha"].data[0, 0], 0.008928571428571418)
         assert_allclose(result["exposure_off"].data[0, 0], 112 * 1e10)
         assert_allclose(result["off"].data[0, 0], 112)
+
+    @pytest.mark.parametrize("method", ["fixed_width", "fixed_r_in"])
+    def test_ring_convolutions(self, method):
+        from scipy.signal import fftconvolve
+        from ..ring import _DiskConvolver
+
+        ring = AdaptiveRingBackgroundEstimator(
+            r_in=0.22 * u.deg, r_out_max=0.8 * u.deg, width=0.1 * u.deg, method=method
+        )
+        image = self.images["counts"].data * self.images["exclusion"].data
+        radii = ring._radii(self.images["counts"])
+        kernels = ring.kernels(self.images["counts"])
+
+        convolver = _DiskConvolver([image], rr_max=int((0.8 / 0.02) ** 2))
+        for (r_in, width), kernel in zip(radii, kernels):
+            rr_in = _DiskConvolver.rr_max(r_in ** 2, closed=False)
+            rr_out = _DiskConvolver.rr_max((r_in + width) ** 2, closed=True)
+            actual = convolver.convolve(rr_out)[0] - convolver.convolve(rr_in)[0]
+            desired = fftconvolve(image, kernel.array, mode="same")
+            assert_allclose(actual, desired, atol=1e-8)
@@ -2,15 +2,28 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
 from astropy.coordinates import Angle
-from astropy.units import Quantity
 from ..maps import WcsNDMap
+from ..spectrum.utils import _trapz_loglog
 
 __all__ = ["make_map_background_irf"]
 
 
-def make_map_background_irf(pointing, livetime, bkg, geom, n_integration_bins=1):
+def make_map_background_irf(
+    pointing,
+    livetime,
+    bkg,
+    geom,
+    n_integration_bins=1,
+    fov_coordinates="offset",
+    integration_method="trapz",
+):
     """Compute background map from background IRFs.
 
+    The background model is interpolated in one call on the FOV coordinates
+    of the image and all energy nodes, for ``n_integration_bins > 0`` these
+    are the edges of ``n_integration_bins`` log spaced sub bins per energy
+    bin. The rate is then integrated over the sub bins.
+
     Parameters
     ----------
     pointing : `~astropy.coordinates.SkyCoord`
@@ -22,7 +35,17 @@ def make_map_background_irf(pointing, livetime, bkg, geom, n_integration_bins=1)
     geom : `~gammapy.maps.WcsGeom`
         Reference geometry
     n_integration_bins : int
-        Number of bins per energy bin in integration
+        Number of bins per energy bin in integration. For 0 the rate at the
+        energy bin center is multiplied with the bin width.
+    fov_coordinates : {'offset', 'radec'}
+        FOV coordinates used to evaluate the background model. For 'offset'
+        the model is assumed to be symmetric and evaluated at
+        ``(fov_lon, fov_lat) = (offset, 0)``. For 'radec' the longitude and
+        latitude in a frame centered on the pointing with axes aligned to
+        RA / Dec are used.
+    integration_method : {'trapz', 'trapz_loglog'}
+        Integration rule for the sub bins, trapezoidal in linear or in
+        log-log space.
 
     Returns
     -------
@@ -30,36 +53,73 @@ def make_map_background_irf(pointing, livetime, bkg, geom, n_integration_bins=1)
         Background predicted counts sky cube in reco energy
     """
     energy_axis = geom.axes[0]
-    ebounds = energy_axis.edges * energy_axis.unit
-
-    # Compute FOV coordinates; at the moment assume symmetric background model
-    # TODO: implement FOV coordinates properly
-    map_coord = geom.get_coord()
-    fov_lon = map_coord.skycoord.separation(pointing)
-    fov_lat = Angle(np.zeros_like(fov_lon), fov_lon.unit)
+    fov_lon, fov_lat = _fov_coordinates(pointing, geom.to_image(), fov_coordinates)
 
     if n_integration_bins == 0:
-        energy_reco = map_coord[energy_axis.name] * energy_axis.unit
-        data = bkg.evaluate(fov_lon=fov_lon, fov_lat=fov_lat, energy_reco=energy_reco)
+        energy_reco = energy_axis.center * energy_axis.unit
+        data = _evaluate_background(bkg, fov_lon, fov_lat, energy_reco)
         d_energy = np.diff(energy_axis.edges) * energy_axis.unit
         bkg_de = data * d_energy[:, np.newaxis, np.newaxis]
     else:
-        bkg_de = Quantity(np.zeros_like(fov_lat.value), "s^-1 sr^-1")
-        for idx in range(len(ebounds) - 1):
-            energy_range = ebounds[idx], ebounds[idx + 1]
-            bkg_de[idx, :, :] = bkg.integrate_on_energy_range(
-                fov_lon=fov_lon[0, :, :],
-                fov_lat=fov_lat[0, :, :],
-                energy_range=energy_range,
-                n_integration_bins=n_integration_bins,
+        # Energy nodes of all sub bins, neighbouring bins share one node
+        log_edges = np.log10(energy_axis.edges)
+        steps = np.linspace(0, 1, n_integration_bins + 1)[:-1]
+        log_widths = np.diff(log_edges)[:, np.newaxis]
+        sub_edges = log_edges[:-1, np.newaxis] + log_widths * steps
+        log_nodes = np.append(sub_edges.flatten(), log_edges[-1])
+        energy_reco = 10 ** log_nodes * energy_axis.unit
+
+        data = _evaluate_background(bkg, fov_lon, fov_lat, energy_reco)
+
+        if integration_method == "trapz":
+            d_energy = np.diff(energy_reco)[:, np.newaxis, np.newaxis]
+            integrals = 0.5 * (data[1:] + data[:-1]) * d_energy
+        elif integration_method == "trapz_loglog":
+            integrals = _trapz_loglog(data, energy_reco, axis=0, intervals=True)
+        else:
+            raise ValueError(
+                "Invalid integration method: {!r}".format(integration_method)
             )
 
+        shape = (energy_axis.nbin, n_integration_bins) + fov_lon.shape
+        bkg_de = integrals.reshape(shape).sum(axis=1)
+
     d_omega = geom.solid_angle()
     data = (bkg_de * d_omega * livetime).to("").value
 
     return WcsNDMap(geom, data=data)
 
 
+def _fov_coordinates(pointing, geom, fov_coordinates="offset"):
+    """Compute FOV coordinates for the pixels of an image geometry."""
+    skycoord = geom.get_coord().skycoord
+
+    if fov_coordinates == "offset":
+        fov_lon = skycoord.separation(pointing)
+        fov_lat = Angle(np.zeros_like(fov_lon.value), fov_lon.unit)
+    elif fov_coordinates == "radec":
+        offset = skycoord.icrs.transform_to(pointing.icrs.skyoffset_frame())
+        fov_lon = Angle(offset.lon).wrap_at("180 deg")
+        fov_lat = Angle(offset.lat)
+    else:
+        raise ValueError("Invalid FOV coordinates: {!r}".format(fov_coordinates))
+
+    return fov_lon, fov_lat
+
+
+def _evaluate_background(bkg, fov_lon, fov_lat, energy_reco):
+    """Evaluate the background model on the outer product of energy and image.
+
+    Returns a cube with shape ``energy_reco.shape + fov_lon.shape``.
+    """
+    ones = np.ones(energy_reco.shape + fov_lon.shape)
+    return bkg.evaluate(
+        fov_lon=fov_lon * ones,
+        fov_lat=fov_lat * ones,
+        energy_reco=energy_reco.reshape((-1, 1, 1)) * ones,
+    )
+
+
 def _fov_background_norm(acceptance_map, counts_map, exclusion_mask=None):
     """Compute FOV background norm
 
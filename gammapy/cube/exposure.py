@@ -1,18 +1,25 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
+from astropy.units import Quantity
 from ..spectrum.models import PowerLaw
 from ..maps import WcsNDMap
 
 __all__ = ["make_map_exposure_true_energy"]
 
 
-def make_map_exposure_true_energy(pointing, livetime, aeff, geom):
+def make_map_exposure_true_energy(pointing, livetime, aeff, geom, dtype="float64"):
     """Compute exposure map.
 
     This map has a true energy axis, the exposure is not combined
     with energy dispersion.
 
+    The effective area only depends on offset and energy, so it is evaluated
+    once at the offset nodes of the IRF for every energy. The cube is then
+    filled by linear interpolation in offset, which gives the same result as
+    interpolating the IRF at every pixel, because the IRF interpolation is
+    linear in offset.
+
     Parameters
     ----------
     pointing : `~astropy.coordinates.SkyCoord`
@@ -23,6 +30,9 @@ def make_map_exposure_true_energy(pointing, livetime, aeff, geom):
         Effective area
     geom : `~gammapy.maps.WcsGeom`
         Map geometry (must have an energy axis)
+    dtype : str
+        Data type of the exposure map, use ``"float32"`` to halve the memory
+        use for large maps.
 
     Returns
     -------
@@ -32,15 +42,27 @@ def make_map_exposure_true_energy(pointing, livetime, aeff, geom):
     offset = geom.separation(pointing)
     energy = geom.axes[0].center * geom.axes[0].unit
 
-    exposure = aeff.data.evaluate(offset=offset, energy=energy)
-    # TODO: Improve IRF evaluate to preserve energy axis if length 1
-    # For now, we handle that case via this hack:
-    if len(exposure.shape) < 3:
-        exposure = np.expand_dims(exposure.value, 0) * exposure.unit
-
-    exposure = (exposure * livetime).to("m2 s")
-
-    return WcsNDMap(geom, exposure.value, unit=exposure.unit)
+    # Effective area at the offset nodes, shape (energy, offset)
+    offset_nodes = aeff.data.axis("offset").nodes
+    aeff_nodes = aeff.data.evaluate(offset=offset_nodes, energy=energy)
+    factor = (aeff_nodes.unit * Quantity(livetime)).to("m2 s").value
+    aeff_nodes = aeff_nodes.value.reshape(len(energy), len(offset_nodes)) * factor
+
+    # Linear interpolation weights in offset, shared by all energies. Outside
+    # the offset nodes the IRF interpolator extrapolates, so do we.
+    offset_nodes = offset_nodes.to("deg").value
+    offset = offset.to("deg").value
+    idx = np.searchsorted(offset_nodes, offset) - 1
+    idx = np.clip(idx, 0, len(offset_nodes) - 2)
+    lo, hi = offset_nodes[idx], offset_nodes[idx + 1]
+    weight = (offset - lo) / (hi - lo)
+
+    data = np.empty(geom.data_shape, dtype=dtype)
+    for data_energy, aeff_energy in zip(data, aeff_nodes):
+        value = aeff_energy[idx] * (1 - weight) + aeff_energy[idx + 1] * weight
+        np.clip(value, 0, None, out=data_energy)
+
+    return WcsNDMap(geom, data, unit="m2 s")
 
 
 def _map_spectrum_weight(map, spectrum=None):
@@ -1,11 +1,13 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import operator
 import numpy as np
 from astropy.utils import lazyproperty
 import astropy.units as u
 from ..utils.fitting import Fit
-from ..stats import cash
+from ..stats import cash, cash_derivative
 from ..maps import Map, MapAxis
+from .models import SkyModel, SkyModels, CompoundSkyModel
 
 __all__ = ["MapFit", "MapEvaluator"]
 
@@ -58,6 +60,14 @@ class MapFit(Fit):
             edisp=self.edisp,
         )
 
+    @lazyproperty
+    def _counts_data(self):
+        """Counts in the fit mask as a float64 array, fixed during the fit."""
+        data = self.counts.data.astype(np.float64)
+        if self.mask is not None:
+            data = data[self.mask.data]
+        return data
+
     @property
     def stat(self):
         """Likelihood per bin given the current model parameters"""
@@ -67,12 +77,30 @@ class MapFit(Fit):
     def total_stat(self, parameters):
         """Total likelihood given the current model parameters"""
         self._model.parameters = parameters
-        if self.mask:
-            stat = self.stat[self.mask.data]
-        else:
-            stat = self.stat
+        npred = self.evaluator.compute_npred(copy=False)
+        if self.mask is not None:
+            npred = npred[self.mask.data]
+        stat = cash(n_on=self._counts_data, mu_on=npred)
         return np.sum(stat, dtype=np.float64)
 
+    @property
+    def has_gradient(self):
+        """Whether all model components have an analytical gradient (bool)."""
+        return self.evaluator.has_gradient
+
+    def total_stat_gradient(self, parameters):
+        """Gradient of the total likelihood with respect to the parameter values.
+
+        Returns ``None`` if a model component has no analytical gradient,
+        see `has_gradient`.
+        """
+        self._model.parameters = parameters
+        npred = self.evaluator.compute_npred(copy=False)
+        weights = cash_derivative(n_on=self.counts.data, mu_on=npred)
+        if self.mask is not None:
+            weights = np.where(self.mask.data, weights, 0)
+        return self.evaluator.compute_gradient(weights)
+
 
 class MapEvaluator(object):
     """Sky model evaluation on maps.
@@ -83,8 +111,27 @@ class MapEvaluator(object):
     of the analysis, and pre-computes some things.
     It it then evaluated many times during likelihood fit when model parameters
     change, re-using pre-computed quantities each time.
-    At the moment it does some things, e.g. cache and re-use energy and coordinate grids,
-    but overall it is not an efficient implementation yet.
+
+    `compute_npred` runs on plain ``float64`` arrays: exposure times bin volume,
+    the banded energy dispersion matrix (see
+    `~gammapy.irf.EnergyDispersion.get_banded_matrix`) and the background are
+    converted once, and the
+    predicted counts are written to buffers that are re-used between calls.
+    The PSF convolution transforms all energy planes in one batched FFT, using
+    the kernel FFT cached per data shape.
+    The ``apply_*`` methods return `~gammapy.maps.Map` objects and are meant
+    for inspection of the intermediate steps.
+
+    If the model is a sum of components (`~gammapy.cube.models.SkyModels` or a
+    `~gammapy.cube.models.CompoundSkyModel` using addition), the predicted counts
+    are cached per component and only components whose parameter values changed
+    are re-evaluated. Components with all parameters frozen are summed once
+    into a fixed npred term.
+
+    `~gammapy.cube.models.SkyModel` components with a spatial model that defines
+    an ``evaluation_radius`` are evaluated, PSF convolved and folded with the energy
+    dispersion only on a cutout around their position (enlarged by the PSF kernel
+    size), and then added into the full npred cube.
 
     For now, we only make it work for 3D WCS maps with an energy axis.
     No HPX, no other axes, those can be added later here or via new
@@ -110,12 +157,31 @@ class MapEvaluator(object):
     def __init__(
         self, model=None, exposure=None, background=None, psf=None, edisp=None
     ):
+        self._npred_factors = {}
+
+        self._npred_cache = {}
+        self._npred_fixed_key = None
+        self._npred_fixed = None
+        self._psf_checked = None
+
         self.model = model
         self.exposure = exposure
         self.background = background
         self.psf = psf
         self.edisp = edisp
 
+    @property
+    def psf(self):
+        """PSF kernel (`~gammapy.cube.PSFKernel`)"""
+        return self._psf
+
+    @psf.setter
+    def psf(self, psf):
+        # cached model contributions were convolved with the previous kernel
+        self._psf = psf
+        self._npred_cache = {}
+        self._npred_fixed_key = None
+
     @lazyproperty
     def geom(self):
         """This will give the energy axes in e_true"""
@@ -205,6 +271,18 @@ class MapEvaluator(object):
         npred.data = (flux * self.exposure.quantity).to("").value
         return npred
 
+    def _get_npred_factor(self, unit):
+        """Factor converting ``dnde`` in ``unit`` to predicted counts (`~numpy.ndarray`).
+
+        This is exposure times bin volume. It is computed once for every unit
+        returned by the model components.
+        """
+        key = unit.to_string()
+        if key not in self._npred_factors:
+            factor = self.exposure.quantity * self.bin_volume * unit
+            self._npred_factors[key] = factor.to("").value.astype(np.float64)
+        return self._npred_factors[key]
+
     def apply_psf(self, npred):
         """Convolve npred cube with PSF"""
         return npred.convolve(self.psf)
@@ -222,10 +300,7 @@ class MapEvaluator(object):
         npred_reco : `~gammapy.maps.Map`
             Predicted counts in reco energy bins
         """
-        loc = npred.geom.get_axis_index_by_name("energy")
-        data = np.rollaxis(npred.data, loc, len(npred.data))
-        data = np.dot(data, self.edisp.pdf_matrix)
-        data = np.rollaxis(data, -1, loc)
+        data = self._fold_edisp(npred.data)
         e_reco_axis = MapAxis.from_edges(
             self.edisp.e_reco.bins, unit=self.edisp.e_reco.unit
         )
@@ -234,21 +309,298 @@ class MapEvaluator(object):
         npred.data = data
         return npred
 
-    def compute_npred(self):
+    @lazyproperty
+    def _npred_true(self):
+        """Buffer for predicted counts in true energy bins."""
+        return np.empty(self.geom.data_shape, dtype=np.float64)
+
+    @lazyproperty
+    def _npred_reco(self):
+        """Buffer for predicted counts in reco energy bins."""
+        shape = (self.edisp.e_reco.nbins,) + self.geom.data_shape[1:]
+        return np.empty(shape, dtype=np.float64)
+
+    @lazyproperty
+    def _edisp_matrix(self):
+        """Banded energy dispersion matrix, shape ``(n_reco, n_true)``."""
+        return self.edisp.get_banded_matrix()
+
+    @lazyproperty
+    def _background_data(self):
+        return self.background.data.astype(np.float64)
+
+    def _convolve_psf(self, data, flip=False):
+        """Convolve ``data`` with the PSF kernel, in place.
+
+        With ``flip=True`` the kernel is mirrored, which applies the transpose
+        of the convolution. The FFT convolution engines are cached on the
+        `~gammapy.cube.PSFKernel`, the pixel size is checked once per kernel.
+        """
+        if self._psf_checked is not self.psf:
+            kmap = self.psf.psf_kernel_map
+            if not np.allclose(
+                self.geom.pixel_scales.deg, kmap.geom.pixel_scales.deg, rtol=1e-5
+            ):
+                raise ValueError("Pixel size of kernel and map not compatible.")
+            self._psf_checked = self.psf
+
+        self.psf.get_convolver(data.shape, flip=flip)(data, out=data)
+
+    def _fold_edisp(self, data, out=None):
+        """Fold ``data`` with the energy dispersion along the energy axis."""
+        return self._edisp_matrix.dot(data, out=out)
+
+    @lazyproperty
+    def _npred_sum(self):
+        """Buffer for the sum of predicted counts of all model components."""
+        if self.edisp is not None:
+            shape = self._npred_reco.shape
+        else:
+            shape = self.geom.data_shape
+        return np.empty(shape, dtype=np.float64)
+
+    @lazyproperty
+    def _components(self):
+        """Additive model components, cached separately."""
+        return _get_additive_components(self.model)
+
+    def _get_cutout_slices(self, model):
+        """Slices of the map region where ``model`` contributes to npred.
+
+        Returns ``None`` if the model has to be evaluated on the full map.
+        """
+        if not isinstance(model, SkyModel):
+            return None
+
+        radius = model.spatial_model.evaluation_radius
+        if radius is None:
+            return None
+
+        pars = model.spatial_model.parameters
+        lon_0 = pars["lon_0"].quantity.to("deg").value
+        lat_0 = pars["lat_0"].quantity.to("deg").value
+        x, y = self.geom_image.coord_to_pix((lon_0, lat_0))
+        x, y = float(np.squeeze(x)), float(np.squeeze(y))
+        if not (np.isfinite(x) and np.isfinite(y)):
+            return None
+
+        # two extra pixels, so that point sources always cover their neighbours
+        npix = radius.deg / np.min(self.geom.pixel_scales.deg) + 2
+        if self.psf is not None:
+            npix += max(self.psf.data.shape[-2:]) // 2
+        npix = int(np.ceil(npix))
+
+        ny, nx = self.geom.data_shape[-2:]
+        return (
+            Ellipsis,
+            _get_cutout_slice(y, npix, ny),
+            _get_cutout_slice(x, npix, nx),
+        )
+
+    def _evaluate_component(self, model):
+        """Evaluate predicted counts of one model component.
+
+        Returns
+        -------
+        npred, slices : `~numpy.ndarray`, tuple
+            Predicted counts and the map slices they belong to. If ``slices``
+            is ``None``, ``npred`` covers the full map and is an internal buffer.
+            If ``npred`` is ``None``, the model does not overlap with the map.
+        """
+        slices = self._get_cutout_slices(model)
+
+        if slices is None:
+            dnde = model.evaluate(self.lon, self.lat, self.energy_center)
+            npred = self._npred_true
+            np.multiply(dnde.value, self._get_npred_factor(dnde.unit), out=npred)
+            if self.psf is not None:
+                self._convolve_psf(npred)
+            if self.edisp is not None:
+                npred = self._fold_edisp(npred, out=self._npred_reco)
+            return npred, None
+
+        slices_image = slices[1:]
+        if self.lon[slices_image].size == 0:
+            return None, slices
+
+        lon, lat = self.lon[slices_image], self.lat[slices_image]
+        dnde = model.evaluate(lon, lat, self.energy_center)
+        npred = dnde.value * self._get_npred_factor(dnde.unit)[slices]
+        if self.psf is not None:
+            self._convolve_psf(npred)
+        if self.edisp is not None:
+            npred = self._fold_edisp(npred)
+        return npred, slices
+
+    def _compute_npred_components(self):
+        """Sum predicted counts of all components, re-using cached contributions."""
+        keys = [_get_parameter_key(_) for _ in self._components]
+        is_fixed = [
+            all(par.frozen for par in _.parameters.parameters)
+            for _ in self._components
+        ]
+
+        fixed_key = tuple(
+            (idx, key) for idx, (key, fixed) in enumerate(zip(keys, is_fixed)) if fixed
+        )
+        if self._npred_fixed_key != fixed_key:
+            npred_fixed = np.zeros_like(self._npred_sum)
+            for idx, _ in fixed_key:
+                npred, slices = self._evaluate_component(self._components[idx])
+                _add_npred(npred_fixed, npred, slices)
+            self._npred_fixed = npred_fixed
+            self._npred_fixed_key = fixed_key
+
+        out = self._npred_sum
+        out[...] = self._npred_fixed
+
+        for idx, component in enumerate(self._components):
+            if is_fixed[idx]:
+                continue
+
+            cached_key, cached, slices = self._npred_cache.get(idx, (None, None, None))
+            if cached_key != keys[idx]:
+                npred, slices = self._evaluate_component(component)
+                if npred is None:
+                    cached = None
+                elif cached is not None and cached.shape == npred.shape:
+                    cached[...] = npred
+                else:
+                    cached = npred.copy()
+                self._npred_cache[idx] = (keys[idx], cached, slices)
+
+            _add_npred(out, cached, slices)
+        return out
+
+    def compute_npred(self, copy=True):
         """
         Evaluate model predicted counts.
 
+        Parameters
+        ----------
+        copy : bool
+            Return a copy of the result. With ``copy=False`` an internal buffer
+            is returned, which is overwritten by the next call.
+
         Returns
         -------
         npred.data : ~numpy.ndarray
             array of the predicted counts in each bin (in reco energy)
         """
-        flux = self.compute_flux()
-        npred = self.apply_exposure(flux)
-        if self.psf is not None:
-            npred = self.apply_psf(npred)
+        if len(self._components) > 1:
+            npred = self._compute_npred_components()
+        else:
+            npred, slices = self._evaluate_component(self.model)
+            if slices is not None:
+                out = self._npred_sum
+                out.fill(0)
+                _add_npred(out, npred, slices)
+                npred = out
+
+        if self.background is not None:
+            npred += self._background_data
+
+        return npred.copy() if copy else npred
+
+    @property
+    def has_gradient(self):
+        """Whether all model components have an analytical gradient (bool)."""
+        return all(_.has_gradient for _ in self._components)
+
+    def _backproject(self, weights):
+        """Apply the transposed energy dispersion and PSF to ``weights``."""
         if self.edisp is not None:
-            npred = self.apply_edisp(npred)
-        if self.background:
-            npred.data += self.background.data
-        return npred.data
+            data = self._edisp_matrix.dot_transposed(weights)
+        else:
+            data = np.array(weights, dtype=np.float64)
+
+        if self.psf is not None:
+            self._convolve_psf(data, flip=True)
+        return data
+
+    def compute_gradient(self, weights):
+        """Gradient of ``sum(weights * npred)`` with respect to the parameter values.
+
+        ``weights`` is typically the derivative of the fit statistic with respect
+        to the predicted counts. It is projected back through the energy
+        dispersion and PSF once, and then combined with the analytical model
+        derivatives in true energy.
+
+        Parameters
+        ----------
+        weights : `~numpy.ndarray`
+            Weights with the shape of the predicted counts.
+
+        Returns
+        -------
+        gradient : `~numpy.ndarray` or None
+            Gradient, ``None`` if a model component has no analytical gradient.
+        """
+        data = self._backproject(weights)
+
+        gradient = []
+        for component in self._components:
+            pars = component.parameters.parameters
+            slices = self._get_cutout_slices(component)
+            if slices is None:
+                slices = (Ellipsis, slice(None), slice(None))
+
+            lon, lat = self.lon[slices[1:]], self.lat[slices[1:]]
+            if lon.size == 0:
+                gradient.extend([0.] * len(pars))
+                continue
+
+            values = component.evaluate_gradient(lon, lat, self.energy_center)
+            if values is None:
+                return None
+
+            for par, value in zip(pars, values):
+                if par.frozen:
+                    gradient.append(0.)
+                    continue
+                factor = self._get_npred_factor(value.unit * par.unit)[slices]
+                gradient.append(np.sum(data[slices] * factor * value.value))
+
+        return np.array(gradient, dtype=np.float64)
+
+
+def _get_additive_components(model):
+    """Split a sky model into a list of components that are summed."""
+    if isinstance(model, SkyModels):
+        components = []
+        for skymodel in model.skymodels:
+            components.extend(_get_additive_components(skymodel))
+        return components
+    elif isinstance(model, CompoundSkyModel) and model.operator is operator.add:
+        return _get_additive_components(model.model1) + _get_additive_components(
+            model.model2
+        )
+    else:
+        return [model]
+
+
+def _get_parameter_key(model):
+    """Hashable key of the current parameter values of a model."""
+    return tuple(par.value for par in model.parameters.parameters)
+
+
+def _get_cutout_slice(center, npix, n):
+    """Slice of ``npix`` pixels around ``center``, clipped to ``[0, n)``.
+
+    Non-empty slices have at least two pixels, if the axis allows it.
+    """
+    center = int(np.round(center))
+    lo, hi = max(center - npix, 0), min(center + npix + 1, n)
+    if hi - lo == 1 and n > 1:
+        lo, hi = (lo, hi + 1) if hi < n else (lo - 1, hi)
+    return slice(lo, max(lo, hi))
+
+
+def _add_npred(out, npred, slices):
+    """Add component ``npred`` to ``out``, in the region given by ``slices``."""
+    if npred is None:
+        return
+    elif slices is None:
+        out += npred
+    else:
+        out[slices] += npred
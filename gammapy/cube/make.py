@@ -1,10 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
+from functools import partial
 import numpy as np
 from astropy.nddata.utils import NoOverlapError
 from astropy.coordinates import Angle
 from ..maps import Map, WcsGeom
+from ..utils.parallel import SharedArrayPool
 from .counts import fill_map_counts
 from .exposure import make_map_exposure_true_energy, _map_spectrum_weight
 from .background import make_map_background_irf
@@ -28,9 +30,28 @@ class MapMaker(object):
          If none, the same as geom is assumed
     exclusion_mask : `~gammapy.maps.Map`
         Exclusion mask
+    n_jobs : int
+        Number of processes used to make the maps of the observations, see
+        `~gammapy.utils.parallel.SharedArrayPool`. The per observation maps
+        are sent back to the main process, which stacks them.
+    max_in_flight : int, optional
+        Maximum number of observations processed or waiting to be stacked at
+        the same time, this bounds the memory use. Default is ``2 * n_jobs``.
+    cache : `~gammapy.data.ObservationCache`, optional
+        Cache for the maps of the observations. Maps found in the cache are
+        only stacked, new maps are added to the cache.
     """
 
-    def __init__(self, geom, offset_max, geom_true=None, exclusion_mask=None):
+    def __init__(
+        self,
+        geom,
+        offset_max,
+        geom_true=None,
+        exclusion_mask=None,
+        n_jobs=1,
+        max_in_flight=None,
+        cache=None,
+    ):
         if not isinstance(geom, WcsGeom):
             raise ValueError("MapMaker only works with WcsGeom")
 
@@ -40,6 +61,9 @@ class MapMaker(object):
         self.geom = geom
         self.geom_true = geom_true if geom_true else geom
         self.offset_max = Angle(offset_max)
+        self.n_jobs = n_jobs
+        self.max_in_flight = max_in_flight
+        self.cache = cache
         self.maps = {}
 
         # Some background estimation methods need an exclusion mask.
@@ -73,62 +97,70 @@ class MapMaker(object):
             else:
                 self.maps[name] = Map.from_geom(self.geom, unit="")
 
+        make_obs_maps = partial(
+            _make_obs_maps,
+            offset_max=self.offset_max,
+            selection=selection,
+            cache=self.cache,
+        )
+        cutouts = self._iter_cutouts(obs_list)
+
+        with SharedArrayPool(n_jobs=self.n_jobs) as pool:
+            results = pool.imap(
+                make_obs_maps, cutouts, max_in_flight=self.max_in_flight
+            )
+            for maps_obs in results:
+                self._stack(maps_obs, selection)
+
+        return self.maps
+
+    def _iter_cutouts(self, obs_list):
+        """Observations with the cutout geometries and exclusion mask.
+
+        Observations not overlapping with the map are skipped. Items are
+        created lazily, so that only the observations in flight are held
+        in memory.
+        """
         for obs in obs_list:
             try:
-                self._process_obs(obs, selection)
+                geom = self.geom.cutout(
+                    position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
+                )
             except NoOverlapError:
                 log.info(
                     "Skipping observation {}, no overlap with map.".format(obs.obs_id)
                 )
                 continue
 
-        return self.maps
-
-    def _process_obs(self, obs, selection):
-        # Compute cutout geometry and slices to stack results back later
-        cutout_map = Map.from_geom(self.geom).cutout(
-            position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
-        )
-        cutout_map_etrue = Map.from_geom(self.geom_true).cutout(
-            position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
-        )
+            geom_true = self.geom_true.cutout(
+                position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
+            )
 
-        log.info("Processing observation: OBS_ID = {}".format(obs.obs_id))
+            # Only if there is an exclusion mask, make a cutout
+            # Exclusion mask only on the background, so only in reco-energy
+            exclusion_mask = self.maps.get("exclusion", None)
+            if exclusion_mask is not None:
+                exclusion_mask = exclusion_mask.cutout(
+                    position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
+                )
 
-        # Compute field of view mask on the cutout
-        coords = cutout_map.geom.get_coord()
-        offset = coords.skycoord.separation(obs.pointing_radec)
-        fov_mask = offset >= self.offset_max
+            yield obs, geom, geom_true, exclusion_mask
 
-        # Compute field of view mask on the cutout in true energy
-        coords_etrue = cutout_map_etrue.geom.get_coord()
-        offset_etrue = coords_etrue.skycoord.separation(obs.pointing_radec)
-        fov_mask_etrue = offset_etrue >= self.offset_max
+    def _stack(self, maps_obs, selection):
+        """Stack observation maps to total.
 
-        # Only if there is an exclusion mask, make a cutout
-        # Exclusion mask only on the background, so only in reco-energy
-        exclusion_mask = self.maps.get("exclusion", None)
-        if exclusion_mask is not None:
-            exclusion_mask = exclusion_mask.cutout(
-                position=obs.pointing_radec, width=2 * self.offset_max, mode="trim"
-            )
-
-        # Make maps for this observation
-        maps_obs = MapMakerObs(
-            obs=obs,
-            geom=cutout_map.geom,
-            geom_true=cutout_map_etrue.geom,
-            fov_mask=fov_mask,
-            fov_mask_etrue=fov_mask_etrue,
-            exclusion_mask=exclusion_mask,
-        ).run(selection)
-
-        # Stack observation maps to total
+        Cutout maps are added in place using the cutout slices, other maps
+        are filled by coordinates.
+        """
         for name in selection:
             data = maps_obs[name].quantity.to(self.maps[name].unit).value
-            if name == "exposure":
-                self.maps[name].fill_by_coord(coords_etrue, data)
+            cutout_info = maps_obs[name].geom.cutout_info
+            if cutout_info is not None:
+                parent_slices = cutout_info["parent-slices"]
+                cutout_slices = cutout_info["cutout-slices"]
+                self.maps[name].data[parent_slices] += data[cutout_slices]
             else:
+                coords = maps_obs[name].geom.get_coord()
                 self.maps[name].fill_by_coord(coords, data)
 
     def make_images(self, spectrum=None):
@@ -246,6 +278,69 @@ class MapMakerObs(object):
         self.maps["background"] = background
 
 
+def _make_obs_maps(cutout, offset_max, selection, cache=None):
+    """Make maps for one observation on its cutout geometries.
+
+    This is a module level function, so that `MapMaker` can run it in
+    worker processes.
+
+    Parameters
+    ----------
+    cutout : tuple
+        Observation, reco and true energy cutout geometries and exclusion
+        mask cutout, see `MapMaker._iter_cutouts`.
+    offset_max : `~astropy.coordinates.Angle`
+        Maximum offset angle
+    selection : list
+        List of str, selecting which maps to make.
+    cache : `~gammapy.data.ObservationCache`, optional
+        Cache for the observation maps.
+
+    Returns
+    -------
+    maps : dict of `~gammapy.maps.WcsNDMap`
+        Observation maps
+    """
+    obs, geom, geom_true, exclusion_mask = cutout
+
+    geoms = {"counts": geom, "exposure": geom_true, "background": geom}
+
+    # Only the data is cached, the maps are always created on the cutout
+    # geometries of the current run. Cutouts with equal WCS can belong to
+    # different parent geometries, so cached ``cutout_info`` could be wrong.
+    if cache is not None:
+        key = cache.key(obs, geom, geom_true, exclusion_mask, offset_max, selection)
+        cached = cache.get(key)
+        if cached is not None:
+            log.info("Using cached observation: OBS_ID = {}".format(obs.obs_id))
+            return {
+                name: Map.from_geom(geoms[name], data=data, unit=unit)
+                for name, (data, unit) in cached.items()
+            }
+
+    log.info("Processing observation: OBS_ID = {}".format(obs.obs_id))
+
+    # Compute field of view masks on the cutouts in reco and true energy
+    offset = geom.to_image().get_coord().skycoord.separation(obs.pointing_radec)
+    offset_etrue = geom_true.to_image().get_coord().skycoord.separation(
+        obs.pointing_radec
+    )
+
+    maps = MapMakerObs(
+        obs=obs,
+        geom=geom,
+        geom_true=geom_true,
+        fov_mask=offset >= offset_max,
+        fov_mask_etrue=offset_etrue >= offset_max,
+        exclusion_mask=exclusion_mask,
+    ).run(selection)
+
+    if cache is not None:
+        cache.set(key, {name: (m.data, str(m.unit)) for name, m in maps.items()})
+
+    return maps
+
+
 def _check_selection(selection):
     """Handle default and validation of selection"""
     available = ["counts", "exposure", "background"]
@@ -33,6 +33,18 @@ class SkyModelBase(object):
     def __call__(self, lon, lat, energy):
         return self.evaluate(lon, lat, energy)
 
+    def evaluate_gradient(self, lon, lat, energy):
+        """Derivatives of the model with respect to its parameters.
+
+        Returns ``None`` if the model has no analytical gradient.
+        """
+        return None
+
+    @property
+    def has_gradient(self):
+        """Whether `evaluate_gradient` is implemented (bool)."""
+        return type(self).evaluate_gradient is not SkyModelBase.evaluate_gradient
+
 
 class SkyModels(object):
     """Collection of `~gammapy.cube.models.SkyModel`
@@ -222,6 +234,40 @@ class SkyModel(SkyModelBase):
         # always do this themselves. For fitting this also adds a performance penalty...
         return val.to("cm-2 s-1 TeV-1 deg-2")
 
+    def evaluate_gradient(self, lon, lat, energy):
+        """Derivatives of the model with respect to its parameters.
+
+        Parameters
+        ----------
+        lon, lat : `~astropy.units.Quantity`
+            Spatial coordinates
+        energy : `~astropy.units.Quantity`
+            Energy coordinate
+
+        Returns
+        -------
+        gradient : list of `~astropy.units.Quantity` or None
+            Derivatives with respect to each parameter, ``None`` if the spatial
+            or spectral model has no analytical gradient.
+        """
+        grad_spatial = self.spatial_model.gradient(lon, lat)
+        grad_spectral = self.spectral_model.gradient(energy)
+        if grad_spatial is None or grad_spectral is None:
+            return None
+
+        val_spatial = self.spatial_model(lon, lat)  # pylint:disable=not-callable
+        val_spectral = self.spectral_model(energy)  # pylint:disable=not-callable
+        gradient = [_ * val_spectral for _ in grad_spatial]
+        gradient += [val_spatial * _ for _ in grad_spectral]
+        return gradient
+
+    @property
+    def has_gradient(self):
+        """Whether the spatial and spectral models have an analytical gradient (bool)."""
+        return hasattr(self.spatial_model, "evaluate_gradient") and hasattr(
+            self.spectral_model, "evaluate_gradient"
+        )
+
 
 class CompoundSkyModel(SkyModelBase):
     """Represents the algebraic combination of two
@@ -347,6 +393,16 @@ class SkyDiffuseCube(SkyModelBase):
         norm = self.parameters["norm"].value
         return u.Quantity(norm * val, self.map.unit, copy=False)
 
+    def evaluate_gradient(self, lon, lat, energy):
+        """Derivatives of the model with respect to its parameters."""
+        coord = {
+            "lon": lon.to("deg").value,
+            "lat": lat.to("deg").value,
+            "energy": energy,
+        }
+        val = self.map.interp_by_coord(coord, **self._interp_kwargs)
+        return [u.Quantity(val, self.map.unit, copy=False)]
+
     def copy(self):
         """A shallow copy"""
         return copy.copy(self)
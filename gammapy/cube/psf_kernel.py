@@ -6,6 +6,7 @@ from astropy.coordinates.angle_utilities import angular_separation
 import astropy.units as u
 from ..utils.gauss import Gauss2DPDF
 from ..maps import Map, WcsGeom
+from ..maps.utils import FFTConvolver
 from ..irf import TablePSF
 
 __all__ = ["PSFKernel"]
@@ -159,6 +160,8 @@ class PSFKernel(object):
 
     def __init__(self, psf_kernel_map):
         self._psf_kernel_map = psf_kernel_map
+        self._convolvers = {}
+        self._convolvers_data = None
 
     @property
     def data(self):
@@ -170,6 +173,41 @@ class PSFKernel(object):
         """The map object holding the kernel (`~gammapy.maps.Map`)"""
         return self._psf_kernel_map
 
+    def get_convolver(self, shape, flip=False):
+        """FFT convolution engine for data of a given shape.
+
+        The engine holds the padded Fourier transform of the kernel and is
+        cached per data shape, so that repeated convolutions of maps with the
+        same shape, e.g. during a likelihood fit, don't re-compute it. The
+        cache is cleared when the kernel data are replaced or modified in
+        place. The cache is not thread-safe.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the data to convolve.
+        flip : bool
+            Mirror the kernel along the image axes. This applies the transpose
+            of the convolution.
+
+        Returns
+        -------
+        convolver : `~gammapy.maps.utils.FFTConvolver`
+            Convolution engine.
+        """
+        data = self.data
+        if self._convolvers_data is None or not np.array_equal(
+            self._convolvers_data, data
+        ):
+            self._convolvers = {}
+            self._convolvers_data = data.copy()
+
+        key = (tuple(shape), flip)
+        if key not in self._convolvers:
+            kernel = data[..., ::-1, ::-1] if flip else data
+            self._convolvers[key] = FFTConvolver(kernel, shape)
+        return self._convolvers[key]
+
     @classmethod
     def read(cls, *args, **kwargs):
         """Read kernel Map from file."""
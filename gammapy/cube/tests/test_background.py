@@ -2,6 +2,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
 from numpy.testing import assert_allclose
+import astropy.units as u
 from astropy.coordinates import SkyCoord
 from ...utils.testing import requires_data
 from ...maps import WcsGeom, HpxGeom, MapAxis
@@ -62,3 +63,59 @@ def test_make_map_background_irf(bkg_3d, pars):
     assert m.data.shape == pars["shape"]
     assert m.unit == ""
     assert_allclose(m.data.sum(), pars["sum"], rtol=1e-5)
+
+
+@requires_data("gammapy-extra")
+def test_make_map_background_irf_integration(bkg_3d):
+    pointing = SkyCoord(2, 1, unit="deg")
+    geom_ = geom(map_type="wcs", ebounds=[0.1, 1, 10])
+
+    m = make_map_background_irf(
+        pointing=pointing,
+        livetime="42 s",
+        bkg=bkg_3d,
+        geom=geom_,
+        n_integration_bins=5,
+    )
+
+    # compare with the integration one energy bin at a time
+    offset = geom_.to_image().separation(pointing)
+    solid_angle = geom_.to_image().solid_angle()
+    ebounds = geom_.axes[0].edges * u.TeV
+    for idx in range(len(ebounds) - 1):
+        desired = bkg_3d.integrate_on_energy_range(
+            fov_lon=offset,
+            fov_lat=0 * offset,
+            energy_range=ebounds[idx : idx + 2],
+            n_integration_bins=5,
+        )
+        desired = (desired * solid_angle * u.Quantity("42 s")).to("")
+        assert_allclose(m.data[idx], desired.value, rtol=1e-5)
+
+    m_loglog = make_map_background_irf(
+        pointing=pointing,
+        livetime="42 s",
+        bkg=bkg_3d,
+        geom=geom_,
+        n_integration_bins=5,
+        integration_method="trapz_loglog",
+    )
+    assert_allclose(m_loglog.data.sum(), m.data.sum(), rtol=1e-2)
+
+
+@requires_data("gammapy-extra")
+def test_make_map_background_irf_fov_coordinates(bkg_3d):
+    kwargs = dict(
+        pointing=SkyCoord(2, 1, unit="deg"),
+        livetime="42 s",
+        bkg=bkg_3d,
+        geom=geom(map_type="wcs", ebounds=[0.1, 1, 10]),
+    )
+    m_offset = make_map_background_irf(fov_coordinates="offset", **kwargs)
+    m_radec = make_map_background_irf(fov_coordinates="radec", **kwargs)
+
+    # the CTA background model is radially symmetric
+    assert_allclose(m_radec.data.sum(), m_offset.data.sum(), rtol=1e-2)
+
+    with pytest.raises(ValueError):
+        make_map_background_irf(fov_coordinates="altaz", **kwargs)
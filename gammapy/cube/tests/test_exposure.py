@@ -2,6 +2,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
 from numpy.testing import assert_allclose
+import astropy.units as u
 from astropy.coordinates import SkyCoord
 from ...utils.testing import requires_data
 from ...maps import WcsGeom, HpxGeom, MapAxis, WcsNDMap
@@ -76,3 +77,24 @@ def test_map_spectrum_weight():
     assert weighted_expo.data.shape == (2, 10, 10)
     assert weighted_expo.unit == "m2 s"
     assert_allclose(weighted_expo.data.sum(), 100)
+
+
+@requires_data("gammapy-extra")
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_make_map_exposure_true_energy_interp(aeff, dtype):
+    ebounds = [0.1, 0.5, 2, 10]
+    axis = MapAxis.from_edges(ebounds, name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(skydir=(0, 0), npix=(60, 50), binsz=0.1, axes=[axis])
+    pointing = SkyCoord(0.5, 0.3, unit="deg")
+
+    m = make_map_exposure_true_energy(
+        pointing=pointing, livetime="42 s", aeff=aeff, geom=geom, dtype=dtype
+    )
+
+    # compare to the IRF interpolated at every pixel
+    offset = geom.separation(pointing)
+    energy = axis.center * axis.unit
+    desired = aeff.data.evaluate(offset=offset, energy=energy) * u.Quantity("42 s")
+
+    assert m.data.dtype == dtype
+    assert_allclose(m.data, desired.to("m2 s").value, rtol=1e-5)
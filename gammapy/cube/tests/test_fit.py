@@ -12,7 +12,7 @@ from ...irf.energy_dispersion import EnergyDispersion
 from ...maps import MapAxis, WcsGeom, WcsNDMap, Map
 from ...image.models import SkyGaussian
 from ...spectrum.models import PowerLaw
-from ..models import SkyModel
+from ..models import SkyModel, SkyModels
 from .. import MapEvaluator, MapFit, make_map_exposure_true_energy, PSFKernel
 
 
@@ -97,6 +97,43 @@ def counts(sky_model, exposure, background, psf, edisp):
     return WcsNDMap(background.geom, npred)
 
 
+@requires_dependency("scipy")
+@requires_data("gammapy-extra")
+def test_map_evaluator_psf_update(sky_model, exposure, background, psf, geom_etrue):
+    model_2 = sky_model.copy()
+    model_2.parameters["lon_0"].value = -0.3
+    model = SkyModels([sky_model, model_2])
+
+    evaluator = MapEvaluator(
+        model=model, exposure=exposure, background=background, psf=psf
+    )
+    evaluator.compute_npred()
+
+    # replacing the kernel after a first evaluation
+    psf_gauss = PSFKernel.from_gauss(geom_etrue, sigma="0.1 deg", max_radius="0.5 deg")
+    evaluator.psf = psf_gauss
+    actual = evaluator.compute_npred()
+
+    desired = MapEvaluator(
+        model=model, exposure=exposure, background=background, psf=psf_gauss
+    ).compute_npred()
+    assert_allclose(actual, desired, rtol=1e-10)
+
+    # modifying the kernel data in place
+    evaluator = MapEvaluator(
+        model=sky_model, exposure=exposure, background=background, psf=psf_gauss
+    )
+    evaluator.compute_npred()
+    psf_gauss.psf_kernel_map.data **= 2
+    actual = evaluator.compute_npred()
+
+    psf_copy = PSFKernel(psf_gauss.psf_kernel_map.copy())
+    desired = MapEvaluator(
+        model=sky_model, exposure=exposure, background=background, psf=psf_copy
+    ).compute_npred()
+    assert_allclose(actual, desired, rtol=1e-10)
+
+
 @requires_dependency("scipy")
 @requires_dependency("iminuit")
 @requires_data("gammapy-extra")
@@ -1,11 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
 from astropy.coordinates import SkyCoord
+from astropy.table import Table
 from ...utils.testing import requires_data
-from ...data import DataStore
+from ...utils.random import get_random_state
+from ...data import DataStore, EventList, ObservationCache
+from ...irf import EffectiveAreaTable2D, Background3D
 from ...maps import WcsGeom, MapAxis, Map
 from ..make import MapMaker
 
@@ -19,6 +23,59 @@ def obs_list():
     return data_store.obs_list(obs_id)
 
 
+class SimpleObservation(object):
+    """Minimal in-memory observation with the attributes used by `MapMaker`.
+
+    Defined at module level, so that it can be sent to worker processes.
+    """
+
+    def __init__(self, obs_id, pointing_radec, events, aeff, bkg):
+        self.obs_id = obs_id
+        self.pointing_radec = pointing_radec
+        self.events = events
+        self.aeff = aeff
+        self.bkg = bkg
+        self.observation_live_time_duration = 1800 * u.s
+
+
+def make_simple_obs_list(n_obs=3, n_events=1000):
+    energy = np.logspace(-2, 2, 21) * u.TeV
+    offset = np.linspace(0, 5, 11) * u.deg
+    aeff = EffectiveAreaTable2D(
+        energy_lo=energy[:-1],
+        energy_hi=energy[1:],
+        offset_lo=offset[:-1],
+        offset_hi=offset[1:],
+        data=np.ones((20, 10)) * 1e5 * u.m ** 2,
+    )
+
+    fov = np.linspace(-5, 5, 11) * u.deg
+    bkg = Background3D(
+        energy_lo=energy[:-1],
+        energy_hi=energy[1:],
+        fov_lon_lo=fov[:-1],
+        fov_lon_hi=fov[1:],
+        fov_lat_lo=fov[:-1],
+        fov_lat_hi=fov[1:],
+        data=np.ones((20, 10, 10)) * 1e-3 * u.Unit("s-1 MeV-1 sr-1"),
+    )
+
+    random_state = get_random_state(0)
+    obs_list = []
+    for obs_id in range(n_obs):
+        pointing = SkyCoord(obs_id - 1, -1, unit="deg", frame="galactic").icrs
+
+        table = Table()
+        table["RA"] = pointing.ra.deg + random_state.normal(0, 1, n_events) * u.deg
+        table["DEC"] = pointing.dec.deg + random_state.normal(0, 1, n_events) * u.deg
+        table["ENERGY"] = 10 ** random_state.uniform(-1, 1, n_events) * u.TeV
+
+        obs = SimpleObservation(obs_id, pointing, EventList(table), aeff, bkg)
+        obs_list.append(obs)
+
+    return obs_list
+
+
 def geom(ebounds):
     skydir = SkyCoord(0, -1, unit="deg", frame="galactic")
     energy_axis = MapAxis.from_edges(ebounds, name="energy", unit="TeV", interp="log")
@@ -104,3 +161,78 @@ def test_map_maker(pars, obs_list):
     background = images["background"]
     assert background.unit == ""
     assert_allclose(background.data.sum(), pars["background"], rtol=1e-5)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_map_maker_max_in_flight(n_jobs):
+    obs_list = make_simple_obs_list()
+
+    maker = MapMaker(geom=geom(ebounds=[0.1, 1, 10]), offset_max="2 deg")
+    maps = maker.run(obs_list)
+
+    maker = MapMaker(
+        geom=geom(ebounds=[0.1, 1, 10]),
+        offset_max="2 deg",
+        n_jobs=n_jobs,
+        max_in_flight=1,
+    )
+    maps_bounded = maker.run(obs_list)
+
+    assert maps["counts"].data.sum() > 0
+    for name in ["counts", "exposure", "background"]:
+        assert_allclose(maps_bounded[name].data, maps[name].data)
+
+
+@requires_data("gammapy-extra")
+def test_map_maker_parallel(obs_list):
+    maker = MapMaker(geom=geom(ebounds=[0.1, 1, 10]), offset_max="2 deg")
+    maps = maker.run(obs_list)
+
+    maker = MapMaker(
+        geom=geom(ebounds=[0.1, 1, 10]), offset_max="2 deg", n_jobs=2, max_in_flight=1
+    )
+    maps_parallel = maker.run(obs_list)
+
+    for name in ["counts", "exposure", "background"]:
+        assert_allclose(maps_parallel[name].data, maps[name].data)
+
+
+@requires_data("gammapy-extra")
+def test_map_maker_cache(obs_list, tmpdir):
+    cache = ObservationCache(str(tmpdir))
+
+    results = []
+    for _ in range(2):
+        maker = MapMaker(
+            geom=geom(ebounds=[0.1, 1, 10]), offset_max="2 deg", cache=cache
+        )
+        results.append(maker.run(obs_list))
+
+    assert len(tmpdir.listdir()) == len(obs_list)
+    for name in ["counts", "exposure", "background"]:
+        assert_allclose(results[1][name].data, results[0][name].data)
+
+
+@requires_data("gammapy-extra")
+def test_map_maker_cache_other_parent_geom(obs_list, tmpdir):
+    cache = ObservationCache(str(tmpdir))
+    maker = MapMaker(geom=geom(ebounds=[0.1, 1, 10]), offset_max="2 deg", cache=cache)
+    maker.run(obs_list)
+
+    # larger parent geometry with the same pixel grid, the cutouts are
+    # identical but at other positions in the parent map
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom_large = WcsGeom.create(
+        binsz=0.5 * u.deg,
+        skydir=SkyCoord(0, -1, unit="deg", frame="galactic"),
+        width=(12, 7),
+        coordsys="GAL",
+        axes=[axis],
+    )
+    maps = MapMaker(geom=geom_large, offset_max="2 deg").run(obs_list)
+    maps_cached = MapMaker(geom=geom_large, offset_max="2 deg", cache=cache).run(
+        obs_list
+    )
+
+    for name in ["counts", "exposure", "background"]:
+        assert_allclose(maps_cached[name].data, maps[name].data)
@@ -9,9 +9,9 @@ from ...maps import MapAxis, WcsGeom, Map
 from ...irf.energy_dispersion import EnergyDispersion
 from ...cube.psf_kernel import PSFKernel
 from ...cube.models import SkyDiffuseCube
-from ...image.models import SkyGaussian
+from ...image.models import SkyGaussian, SkyDisk
 from ...spectrum.models import PowerLaw
-from ..fit import MapEvaluator
+from ..fit import MapEvaluator, MapFit
 from ..models import SkyModel, SkyModels, CompoundSkyModel
 
 
@@ -372,3 +372,119 @@ class TestSkyModelMapEvaluator:
         assert out.shape == (2, 4, 5)
         assert_allclose(out.sum(), 6.25133e-06, rtol=1e-5)
         assert_allclose(out[0, 0, 0], 1.240524e-07, rtol=1e-5)
+
+    @staticmethod
+    def test_compute_npred_matches_maps(evaluator):
+        flux = evaluator.compute_flux()
+        npred = evaluator.apply_exposure(flux)
+        npred = evaluator.apply_psf(npred)
+        npred = evaluator.apply_edisp(npred)
+        expected = npred.data + evaluator.background.data
+
+        out = evaluator.compute_npred()
+        assert out.dtype == np.float64
+        assert_allclose(out, expected, rtol=1e-5)
+
+        # buffers are re-used internally, returned arrays are independent
+        out2 = evaluator.compute_npred()
+        assert out2 is not out
+        assert_allclose(out2, out)
+
+        buffer = evaluator.compute_npred(copy=False)
+        assert evaluator.compute_npred(copy=False) is buffer
+        assert_allclose(buffer, out)
+
+    @staticmethod
+    def test_compute_npred_components(sky_model, exposure, psf, edisp):
+        model_fixed, model_free = sky_model.copy(), sky_model.copy()
+        for par in model_fixed.parameters.parameters:
+            par.frozen = True
+        model_fixed.parameters["lon_0"].value = 1
+        sky_models = SkyModels([model_fixed, model_free])
+
+        evaluator = MapEvaluator(sky_models, exposure, psf=psf, edisp=edisp)
+
+        def npred_single(model):
+            return MapEvaluator(model, exposure, psf=psf, edisp=edisp).compute_npred()
+
+        out = evaluator.compute_npred()
+        expected = npred_single(model_fixed) + npred_single(model_free)
+        assert_allclose(out, expected, rtol=1e-5)
+        assert list(evaluator._npred_cache) == [1]
+
+        model_free.parameters["index"].value = 3
+        out = evaluator.compute_npred()
+        expected = npred_single(model_fixed) + npred_single(model_free)
+        assert_allclose(out, expected, rtol=1e-5)
+
+    @staticmethod
+    def test_compute_npred_cutout():
+        axis = MapAxis.from_edges(np.logspace(-1, 1, 4), unit=u.TeV, name="energy")
+        geom = WcsGeom.create(
+            skydir=(0, 0), binsz=0.1, width=(6, 4), coordsys="GAL", axes=[axis]
+        )
+        exposure = Map.from_geom(geom, unit="m2 s")
+        exposure.data += 1e6
+        psf = PSFKernel.from_gauss(geom, 0.1 * u.deg)
+        e_true = axis.edges * u.TeV
+        edisp = EnergyDispersion.from_diagonal_response(e_true=e_true)
+
+        spatial_model = SkyDisk(lon_0="1 deg", lat_0="0.5 deg", r_0="0.3 deg")
+        spectral_model = PowerLaw(
+            index=2, amplitude="1e-11 cm-2 s-1 TeV-1", reference="1 TeV"
+        )
+        model = SkyModel(spatial_model, spectral_model)
+        evaluator = MapEvaluator(model, exposure, psf=psf, edisp=edisp)
+
+        _, slice_lat, slice_lon = evaluator._get_cutout_slices(model)
+        assert slice_lon.stop - slice_lon.start < 60
+        assert slice_lat.stop - slice_lat.start < 40
+
+        flux = evaluator.compute_flux()
+        npred = evaluator.apply_exposure(flux)
+        npred = evaluator.apply_psf(npred)
+        expected = evaluator.apply_edisp(npred).data
+
+        out = evaluator.compute_npred()
+        assert_allclose(out, expected, rtol=1e-4, atol=1e-6 * expected.max())
+        assert_allclose(out.sum(), expected.sum(), rtol=1e-5)
+
+    @staticmethod
+    def test_compute_gradient(sky_model, exposure, psf, edisp):
+        model = sky_model.copy()
+        evaluator = MapEvaluator(model, exposure, psf=psf, edisp=edisp)
+        weights = np.linspace(-1, 1, 40).reshape((2, 4, 5))
+
+        gradient = evaluator.compute_gradient(weights)
+        assert gradient.shape == (6,)
+
+        for idx, par in enumerate(model.parameters.parameters):
+            if par.frozen:
+                assert gradient[idx] == 0
+                continue
+            value = par.value
+            eps = 1e-5 * abs(value)
+            par.value = value + eps
+            stat_up = np.sum(weights * evaluator.compute_npred())
+            par.value = value - eps
+            stat_lo = np.sum(weights * evaluator.compute_npred())
+            par.value = value
+            assert_allclose(gradient[idx], (stat_up - stat_lo) / (2 * eps), rtol=1e-4)
+
+    @staticmethod
+    def test_has_gradient(sky_model, exposure):
+        evaluator = MapEvaluator(sky_model, exposure)
+        assert evaluator.has_gradient
+
+        model_disk = SkyModel(
+            SkyDisk(lon_0="1 deg", lat_0="0.5 deg", r_0="0.3 deg"),
+            sky_model.spectral_model,
+        )
+        evaluator = MapEvaluator(SkyModels([sky_model, model_disk]), exposure)
+        assert not evaluator.has_gradient
+
+        counts = Map.from_geom(exposure.geom)
+        fit = MapFit(model=model_disk, counts=counts, exposure=exposure)
+        assert not fit.has_gradient
+        with pytest.raises(ValueError):
+            fit.optimize(gradient=True)
@@ -0,0 +1,292 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""On-disk cache of reduced per-observation data products."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+from astropy.units import Quantity
+from astropy.coordinates import SkyCoord
+from regions import SkyRegion, CompoundSkyRegion
+from ..utils.scripts import make_path
+
+__all__ = ["ObservationCache"]
+
+log = logging.getLogger(__name__)
+
+# shape parameters of the sky regions, see `_hash_update`
+_REGION_PARAMS = [
+    "center",
+    "vertices",
+    "start",
+    "end",
+    "radius",
+    "inner_radius",
+    "outer_radius",
+    "width",
+    "height",
+    "angle",
+]
+
+
+class ObservationCache(object):
+    """On-disk cache of reduced per-observation data products.
+
+    Reducing an observation, e.g. filling the counts, exposure and background
+    cutout maps in `~gammapy.cube.MapMaker` or the ON / OFF vectors, ARF and
+    RMF in `~gammapy.spectrum.SpectrumExtraction`, is the expensive part of an
+    analysis. The reduced products are stored as pickle files, so reruns with
+    the same observations and configuration only have to restack them.
+
+    Every product is stored under a key, see `ObservationCache.key`, computed
+    from the observation ID, the checksums of the observation data files, the
+    Gammapy version and the reduction configuration. Changing any of them
+    therefore gives a cache miss, there is no need to invalidate entries.
+
+    The checksums of the observation data files are stored in the
+    ``checksums`` sub-directory, keyed by file name, size and modification
+    time, so that new processes don't have to read the files again to compute
+    the key.
+
+    If the total size of the cache exceeds ``max_size``, the least recently
+    used entries are removed.
+
+    Parameters
+    ----------
+    path : str or `~pathlib.Path`
+        Cache directory, created if it doesn't exist.
+    max_size : int
+        Maximum total size of the cache in bytes, default is 10 GB.
+
+    Examples
+    --------
+    Use the cache for map making::
+
+        from gammapy.data import ObservationCache
+        from gammapy.cube import MapMaker
+
+        cache = ObservationCache("$HOME/.gammapy/cache", max_size=int(1e11))
+        maker = MapMaker(geom, offset_max="2 deg", cache=cache)
+        maps = maker.run(obs_list)
+    """
+
+    def __init__(self, path, max_size=int(1e10)):
+        self.path = make_path(path)
+        self.max_size = max_size
+
+        if not self._checksum_path.exists():
+            self._checksum_path.mkdir(parents=True)
+
+    def __contains__(self, key):
+        return self._filename(key).exists()
+
+    def _filename(self, key):
+        return self.path / (key + ".pkl")
+
+    @property
+    def _checksum_path(self):
+        return self.path / "checksums"
+
+    def _checksum(self, filename):
+        """SHA1 checksum of a file, stored by file name, size and modification time."""
+        stat = os.stat(filename)
+        mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)
+        memo_key = repr((filename, stat.st_size, mtime)).encode("utf-8")
+        memo = self._checksum_path / (hashlib.sha1(memo_key).hexdigest() + ".sha1")
+
+        try:
+            with open(str(memo), "rb") as fh:
+                return fh.read().decode("ascii")
+        except (IOError, OSError):
+            pass
+
+        sha1 = hashlib.sha1()
+        with open(filename, "rb") as fh:
+            for block in iter(lambda: fh.read(2 ** 20), b""):
+                sha1.update(block)
+        checksum = sha1.hexdigest()
+
+        self._write(memo, lambda fh: fh.write(checksum.encode("ascii")))
+        return checksum
+
+    def key(self, obs, *config):
+        """Cache key for an observation and a reduction configuration.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        *config : object
+            Everything the reduced products depend on, e.g. geometries,
+            regions, energy binnings and options. Supported are arrays,
+            quantities, sky coordinates, sky regions, maps, map geometries,
+            lists, tuples and dicts of those, all other objects are included
+            by their ``repr``.
+
+        Returns
+        -------
+        key : str
+            Cache key
+        """
+        from .. import __version__
+
+        sha1 = hashlib.sha1()
+        _hash_update(sha1, [__version__, obs.obs_id, list(obs.obs_info.items())])
+
+        hdu_table = obs.data_store.hdu_table
+        for idx in hdu_table.row_idx(obs_id=obs.obs_id):
+            location = hdu_table.location_info(idx)
+            filename = str(location.path(abs_path=True))
+            _hash_update(sha1, [location.hdu_name, self._checksum(filename)])
+
+        _hash_update(sha1, list(config))
+        return sha1.hexdigest()
+
+    def get(self, key):
+        """Load a cached product.
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+
+        Returns
+        -------
+        product : object
+            Cached product, None if the key is not in the cache.
+        """
+        filename = str(self._filename(key))
+        try:
+            with open(filename, "rb") as fh:
+                product = pickle.load(fh)
+        except (IOError, OSError):
+            return None
+
+        # mark as recently used
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+
+        log.debug("Loaded {} from cache.".format(key))
+        return product
+
+    def set(self, key, product):
+        """Store a product in the cache.
+
+        The file is written to a temporary file and renamed, so concurrent
+        processes using the same cache never read incomplete entries.
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+        product : object
+            Product to store, must be picklable.
+        """
+        self._write(
+            self._filename(key),
+            lambda fh: pickle.dump(product, fh, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        self._evict()
+
+    def _write(self, filename, dump):
+        """Write a file via a temporary file, ``dump`` writes to the file handle."""
+        fh = tempfile.NamedTemporaryFile(
+            dir=str(self.path), suffix=".tmp", delete=False
+        )
+        try:
+            with fh:
+                dump(fh)
+            shutil.move(fh.name, str(filename))
+        finally:
+            if os.path.exists(fh.name):
+                os.remove(fh.name)
+
+    def _entries(self):
+        """Cache files and their stat results, least recently used first."""
+        entries = []
+        for filename in self.path.glob("*.pkl"):
+            try:
+                entries.append((str(filename), os.stat(str(filename))))
+            except OSError:
+                # removed by another process
+                continue
+        return sorted(entries, key=lambda entry: entry[1].st_mtime)
+
+    @property
+    def size(self):
+        """Total size of the cache in bytes (int)."""
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _evict(self):
+        """Remove least recently used entries until the size is below ``max_size``."""
+        entries = self._entries()
+        size = sum(stat.st_size for _, stat in entries)
+
+        for filename, stat in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+                log.debug("Removed {} from cache.".format(filename))
+            except OSError:
+                pass
+            size -= stat.st_size
+
+    def clear(self):
+        """Remove all entries and stored checksums."""
+        filenames = [filename for filename, _ in self._entries()]
+        filenames += [str(path) for path in self._checksum_path.glob("*.sha1")]
+        for filename in filenames:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def _hash_update(sha1, obj):
+    """Update hash with a stable representation of an object."""
+    if isinstance(obj, (list, tuple)):
+        sha1.update(repr(type(obj).__name__).encode("utf-8"))
+        for item in obj:
+            _hash_update(sha1, item)
+    elif isinstance(obj, dict):
+        for key in sorted(obj):
+            _hash_update(sha1, [key, obj[key]])
+    elif isinstance(obj, Quantity):
+        _hash_update(sha1, [obj.value, str(obj.unit)])
+    elif isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        _hash_update(sha1, [str(array.dtype), array.shape])
+        sha1.update(array.tobytes())
+    elif isinstance(obj, SkyCoord):
+        coords = obj.frame.spherical
+        lon, lat = np.atleast_1d(coords.lon.deg), np.atleast_1d(coords.lat.deg)
+        _hash_update(sha1, [obj.frame.name, lon, lat])
+    elif isinstance(obj, CompoundSkyRegion):
+        operator = obj.operator.__name__
+        _hash_update(sha1, [type(obj).__name__, operator, obj.region1, obj.region2])
+    elif isinstance(obj, SkyRegion):
+        # the region repr is not a stable serialization, use the parameters
+        params = []
+        for name in _REGION_PARAMS:
+            if not hasattr(obj, name):
+                continue
+            value = getattr(obj, name)
+            if isinstance(value, Quantity):
+                value = np.atleast_1d(value.to("deg").value)
+            params.append([name, value])
+        _hash_update(sha1, [type(obj).__name__, params])
+    elif hasattr(obj, "geom") and hasattr(obj, "data"):
+        # map
+        _hash_update(sha1, [obj.geom, obj.data, str(obj.unit)])
+    elif hasattr(obj, "wcs") and hasattr(obj, "axes"):
+        # map geometry
+        axes = [[axis.name, axis.edges, str(axis.unit)] for axis in obj.axes]
+        _hash_update(sha1, [obj.wcs.to_header_string(), obj.npix, axes])
+    else:
+        sha1.update(repr(obj).encode("utf-8"))
@@ -0,0 +1,94 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import os
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from regions import CircleSkyRegion
+from ...utils.testing import requires_data
+from ...data import DataStore, ObservationCache
+from ..cache import _hash_update
+
+
+@pytest.fixture(scope="session")
+def data_store():
+    return DataStore.from_dir("$GAMMAPY_EXTRA/datasets/hess-dl3-dr1/")
+
+
+def test_observation_cache_lru(tmpdir):
+    data = np.ones(1000)
+    cache = ObservationCache(str(tmpdir), max_size=2500 * data.itemsize)
+
+    cache.set("a", data)
+    cache.set("b", 2 * data)
+    assert "a" in cache and "b" in cache
+    assert_allclose(cache.get("b"), 2)
+    assert cache.get("c") is None
+
+    # make "b" the least recently used entry
+    os.utime(str(tmpdir / "a.pkl"), (1, 1))
+    os.utime(str(tmpdir / "b.pkl"), (2, 2))
+    cache.get("a")
+
+    cache.set("c", 3 * data)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size <= cache.max_size
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_observation_cache_checksum(tmpdir):
+    filename = str(tmpdir / "events.fits")
+    with open(filename, "wb") as fh:
+        fh.write(b"events")
+
+    cache = ObservationCache(str(tmpdir / "cache"))
+    checksum = cache._checksum(filename)
+    assert checksum == hashlib.sha1(b"events").hexdigest()
+
+    # a new instance uses the stored checksum instead of reading the file
+    memo = list((tmpdir / "cache" / "checksums").listdir())
+    assert len(memo) == 1
+    memo[0].write("stored")
+    assert ObservationCache(str(tmpdir / "cache"))._checksum(filename) == "stored"
+
+    # a modified file is read again
+    with open(filename, "ab") as fh:
+        fh.write(b"more")
+    assert cache._checksum(filename) == hashlib.sha1(b"eventsmore").hexdigest()
+
+    cache.clear()
+    assert (tmpdir / "cache" / "checksums").listdir() == []
+
+
+def test_hash_region():
+    def digest(obj):
+        sha1 = hashlib.sha1()
+        _hash_update(sha1, obj)
+        return sha1.hexdigest()
+
+    center = SkyCoord(83.63, 22.01, unit="deg")
+    region = CircleSkyRegion(center, 0.1 * u.deg)
+
+    assert digest(region) == digest(CircleSkyRegion(center, 6 * u.arcmin))
+    assert digest(region) != digest(CircleSkyRegion(center, 0.2 * u.deg))
+
+    center_galactic = SkyCoord(83.63, 22.01, unit="deg", frame="galactic")
+    assert digest(region) != digest(CircleSkyRegion(center_galactic, 0.1 * u.deg))
+
+
+@requires_data("gammapy-extra")
+def test_observation_cache_key(data_store, tmpdir):
+    cache = ObservationCache(str(tmpdir))
+    obs = data_store.obs(23523)
+
+    key = cache.key(obs, np.arange(3) * u.TeV, "config")
+    assert key == cache.key(obs, np.arange(3) * u.TeV, "config")
+    assert key != cache.key(obs, np.arange(3) * u.GeV, "config")
+    assert key != cache.key(data_store.obs(23526), np.arange(3) * u.TeV, "config")
@@ -7,6 +7,7 @@ from astropy.io import fits
 from astropy.table import Table
 from astropy.convolution import Gaussian2DKernel, MexicanHat2DKernel
 from ..maps import WcsNDMap, MapAxis, WcsGeom
+from ..maps.utils import FFTMultiConvolver
 
 __all__ = ["CWT", "CWTData", "CWTKernels"]
 
@@ -38,6 +39,91 @@ def difference_of_gauss_kernel(radius, scale_step, n_sigmas=8):
     return g1 - g2
 
 
+class _CWTKernelSpectra(object):
+    """Fourier transforms of the CWT kernels for a fixed image shape.
+
+    All kernels are zero padded to the size of the largest kernel, keeping
+    their centers aligned, so that every image is transformed once and
+    multiplied with the spectra of all kernels. The results are the same as
+    `scipy.signal.fftconvolve` with ``mode="same"``.
+
+    Parameters
+    ----------
+    kernels : `~gammapy.detect.CWTKernels`
+        Kernels
+    shape : tuple
+        Image shape
+    dtype : `~numpy.dtype`
+        Data type used to store the kernel spectra. The FFTs themselves are
+        always computed in double precision.
+    scale_chunk : int
+        Number of scales transformed back at once.
+    """
+
+    def __init__(self, kernels, shape, dtype=np.float64, scale_chunk=1):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.scale_chunk = scale_chunk
+
+        base = [kernels.kern_base[idx] for idx in range(kernels.n_scale)]
+        all_kernels = base + [kernels.kern_approx]
+        size = tuple(max(_.shape[axis] for _ in all_kernels) for axis in [0, 1])
+        self._convolver = FFTMultiConvolver(self.shape, size)
+
+        self.base = self._transform_kernels(base)
+        self.base_squared = self._transform_kernels([_ ** 2 for _ in base])
+        self.approx = self._transform_kernels([kernels.kern_approx])[0]
+
+    def _transform_kernels(self, kernels):
+        complex_dtype = np.result_type(self.dtype, np.complex64)
+        spectra = [
+            self._convolver.kernel_spectrum(_).astype(complex_dtype) for _ in kernels
+        ]
+        return np.array(spectra)
+
+    def convolve_scales(self, image, out, squared=False):
+        """Convolve the image with the kernels of all scales.
+
+        Parameters
+        ----------
+        image : `~numpy.ndarray`
+            Image
+        out : `~numpy.ndarray`
+            Output cube.
+        squared : bool
+            Use the squared kernels.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Cube of convolved images.
+        """
+        spectra = self.base_squared if squared else self.base
+        spectrum = self._convolver.data_spectrum(image)
+        for idx in range(0, len(spectra), self.scale_chunk):
+            chunk = slice(idx, idx + self.scale_chunk)
+            self._convolver.convolve(spectrum, spectra[chunk], out=out[chunk])
+        return out
+
+    def convolve_approx(self, image, out):
+        """Convolve the image with the approximation kernel.
+
+        Parameters
+        ----------
+        image : `~numpy.ndarray`
+            Image
+        out : `~numpy.ndarray`
+            Output image.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Convolved image.
+        """
+        spectrum = self._convolver.data_spectrum(image)
+        return self._convolver.convolve(spectrum, self.approx, out=out)
+
+
 class CWT(object):
     """Continuous wavelet transform.
 
@@ -70,6 +156,21 @@ class CWT(object):
         If ``True``, isolated pixels will be removed.
     keep_history : boolean, optional (default False)
         Save cwt data from all the iterations.
+    dtype : `~numpy.dtype`, optional (default float64)
+        Data type of the cached kernel spectra. ``np.float32`` halves their
+        memory, use it together with ``CWTData(..., dtype=np.float32)`` to
+        also store the transform cubes in single precision. The FFTs are
+        always computed in double precision.
+    scale_chunk : int, optional (default 1)
+        Number of scales transformed back at once. Each scale in a chunk needs
+        a temporary complex array of the padded image size.
+
+    Notes
+    -----
+    The Fourier transforms of the kernels are computed once per image shape
+    and reused in every iteration. Every iteration then needs only one forward
+    transform per input image and one inverse transform per scale, and the
+    results are written into the arrays of `~gammapy.detect.CWTData`.
 
     References
     ----------
@@ -86,6 +187,8 @@ class CWT(object):
         significance_island_threshold=None,
         remove_isolated=True,
         keep_history=False,
+        dtype=np.float64,
+        scale_chunk=1,
     ):
         self.kernels = kernels
         self.max_iter = max_iter
@@ -94,6 +197,9 @@ class CWT(object):
         self.significance_island_threshold = significance_island_threshold
         self.remove_isolated = remove_isolated
         self.history = [] if keep_history else None
+        self.dtype = dtype
+        self.scale_chunk = scale_chunk
+        self._kernel_spectra = {}
 
         # previous_variance is initialized on the first iteration
         self.previous_variance = None
@@ -110,10 +216,19 @@ class CWT(object):
         self._compute_support(data=data)
         self._inverse_transform(data=data)
 
+    def _get_kernel_spectra(self, shape):
+        """Kernel spectra for the given image shape, computed on first use."""
+        shape = tuple(shape)
+        if shape not in self._kernel_spectra:
+            self._kernel_spectra[shape] = _CWTKernelSpectra(
+                self.kernels, shape, dtype=self.dtype, scale_chunk=self.scale_chunk
+            )
+        return self._kernel_spectra[shape]
+
     def _transform(self, data):
         """Do the transform itself.
 
-        The transform is made by using `scipy.signal.fftconvolve`.
+        The transform is made by FFT convolutions with the cached kernel spectra.
 
         TODO: document.
 
@@ -122,7 +237,7 @@ class CWT(object):
         data : `~gammapy.detect.CWTData`
             Images for transform.
         """
-        from scipy.signal import fftconvolve
+        spectra = self._get_kernel_spectra(data._counts.shape)
 
         total_background = data._model + data._background + data._approx
         excess = data._counts - total_background
@@ -130,23 +245,17 @@ class CWT(object):
         log.debug("Excess max: {0:.4f}".format(excess.max()))
 
         log.debug("Computing transform and error")
-        for idx_scale, kern in self.kernels.kern_base.items():
-            data._transform_3d[idx_scale] = fftconvolve(excess, kern, mode="same")
-            data._error[idx_scale] = np.sqrt(
-                fftconvolve(total_background, kern ** 2, mode="same")
-            )
+        spectra.convolve_scales(excess, out=data._transform_3d)
+        spectra.convolve_scales(total_background, out=data._error, squared=True)
+        np.sqrt(data._error, out=data._error)
         log.debug("Error sum: {0:.4f}".format(data._error.sum()))
         log.debug("Error max: {0:.4f}".format(data._error.max()))
 
         log.debug("Computing approx and approx_bkg")
-        data._approx = fftconvolve(
-            data._counts - data._model - data._background,
-            self.kernels.kern_approx,
-            mode="same",
-        )
-        data._approx_bkg = fftconvolve(
-            data._background, self.kernels.kern_approx, mode="same"
+        spectra.convolve_approx(
+            data._counts - data._model - data._background, out=data._approx
         )
+        spectra.convolve_approx(data._background, out=data._approx_bkg)
         log.debug("Approximate sum: {0:.4f}".format(data._approx.sum()))
         log.debug("Approximate background sum: {0:.4f}".format(data._approx_bkg.sum()))
 
@@ -440,6 +549,8 @@ class CWTData(object):
         2D background image.
     n_scale : int
         Number of scales.
+    dtype : `~numpy.dtype`, optional (default float64)
+        Data type of the transform and error cubes.
 
     Examples
     --------
@@ -451,7 +562,7 @@ class CWTData(object):
     >>> data = CWTData(counts=image, background=background, n_scale=2)
     """
 
-    def __init__(self, counts, background, n_scale):
+    def __init__(self, counts, background, n_scale, dtype=np.float64):
         self._counts = np.array(counts.data, dtype=float)
         self._background = np.array(background.data, dtype=float)
         self._geom2d = counts.geom.copy()
@@ -467,8 +578,8 @@ class CWTData(object):
         self._transform_2d = np.zeros(shape_2d)
 
         shape_3d = n_scale, shape_2d[0], shape_2d[1]
-        self._transform_3d = np.zeros(shape_3d)
-        self._error = np.zeros(shape_3d)
+        self._transform_3d = np.zeros(shape_3d, dtype=dtype)
+        self._error = np.zeros(shape_3d, dtype=dtype)
         self._support = np.zeros(shape_3d, dtype=bool)
 
     @property
@@ -584,6 +695,7 @@ class CWTData(object):
             counts=self.counts,
             background=self.background,
             n_scale=len(self._transform_3d),
+            dtype=self._transform_3d.dtype,
         )
         data._model = self._model - other._model
         data._approx = self._approx - other._approx
@@ -3,9 +3,9 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from astropy.coordinates import SkyCoord
 from astropy.table import Table
-from ..maps import WcsNDMap
+from ..maps import WcsNDMap, HpxNDMap
 
-__all__ = ["find_peaks"]
+__all__ = ["find_peaks", "find_peaks_refined"]
 
 
 def find_peaks(image, threshold, min_distance=1):
@@ -98,3 +98,234 @@ def find_peaks(image, threshold, min_distance=1):
     table.reverse()
 
     return table
+
+
+def find_peaks_refined(image, threshold, min_distance=1, tile_shape=None):
+    """Find local peaks in an image with sub-pixel positions.
+
+    Peaks are found as with `find_peaks`, as pixels above ``threshold``
+    which are the maximum within ``min_distance`` pixels. Their positions
+    are then refined by fitting a quadratic function to the values of the
+    peak pixel and its neighbours. If the fitted function has no maximum
+    within one pixel of the peak pixel, the pixel center is kept.
+
+    Large images can be processed in tiles to limit the memory needed. Each
+    tile is extended by a margin of ``min_distance + 1`` pixels and only the
+    peaks in the tile itself are kept, so the result does not depend on the
+    tiling.
+
+    The output table contains one row per peak and the following columns:
+
+    - ``value`` is the pixel value of the peak pixel
+    - ``x`` and ``y`` are the refined pixel coordinates (first pixel at zero),
+      for `~gammapy.maps.WcsNDMap` images
+    - ``idx`` is the global HEALPix pixel index of the peak pixel, for
+      `~gammapy.maps.HpxNDMap` images
+    - ``ra`` and ``dec`` are the refined RA / DEC sky coordinates (ICRS frame)
+
+    It is sorted by peak value, starting with the highest value.
+
+    Parameters
+    ----------
+    image : `~gammapy.maps.WcsNDMap` or `~gammapy.maps.HpxNDMap`
+        2D map
+    threshold : float or array-like
+        The data value or pixel-wise data values to be used for the
+        detection threshold.  A 2D ``threshold`` must have the same
+        shape as tha map ``data``.
+    min_distance : int
+        Minimum pixel distance between peaks. For HEALPix maps the
+        distance is counted in steps between neighbouring pixels.
+    tile_shape : tuple of int, optional
+        Shape of the tiles for `~gammapy.maps.WcsNDMap` images. By default
+        the image is processed in one go.
+
+    Returns
+    -------
+    output : `~astropy.table.Table`
+        Table with parameters of detected peaks
+    """
+    if not isinstance(image, (WcsNDMap, HpxNDMap)):
+        raise TypeError("find_peaks_refined only supports WcsNDMap and HpxNDMap")
+
+    if not image.geom.is_image:
+        raise ValueError("find_peaks_refined only supports 2D images")
+
+    # Remove non-finite values to avoid warnings or spurious detection
+    data = image.data.astype(float)
+    data[~np.isfinite(data)] = np.nanmin(data)
+    threshold = np.broadcast_to(threshold, data.shape)
+
+    # Handle edge case of constant data; treat as no peak
+    if np.all(data == data.flat[0]):
+        return Table()
+
+    if isinstance(image, WcsNDMap):
+        table = _find_peaks_wcs(image, data, threshold, min_distance, tile_shape)
+    else:
+        table = _find_peaks_hpx(image, data, threshold, min_distance)
+
+    if len(table) == 0:
+        return Table()
+
+    table["value"].unit = image.unit
+    table["ra"].format = ".5f"
+    table["dec"].format = ".5f"
+    table["value"].format = ".5g"
+
+    table.sort("value")
+    table.reverse()
+    return table
+
+
+def _tile_slices(shape, tile_shape, margin):
+    """Slices of the tiles and of the tiles extended by a margin."""
+    if tile_shape is None:
+        tile_shape = shape
+
+    for y0 in range(0, shape[0], tile_shape[0]):
+        for x0 in range(0, shape[1], tile_shape[1]):
+            y1 = min(y0 + tile_shape[0], shape[0])
+            x1 = min(x0 + tile_shape[1], shape[1])
+            extended = (
+                slice(max(y0 - margin, 0), min(y1 + margin, shape[0])),
+                slice(max(x0 - margin, 0), min(x1 + margin, shape[1])),
+            )
+            tile = (
+                slice(y0 - extended[0].start, y1 - extended[0].start),
+                slice(x0 - extended[1].start, x1 - extended[1].start),
+            )
+            yield extended, tile
+
+
+def _find_peaks_wcs(image, data, threshold, min_distance, tile_shape):
+    from scipy.ndimage import maximum_filter
+
+    size = 2 * min_distance + 1
+
+    y, x = [], []
+    for extended, tile in _tile_slices(data.shape, tile_shape, min_distance + 1):
+        data_tile = data[extended]
+        data_max = maximum_filter(data_tile, size=size, mode="constant")
+        mask = (data_tile == data_max) & (data_tile > threshold[extended])
+
+        y_tile, x_tile = mask[tile].nonzero()
+        y.append(y_tile + extended[0].start + tile[0].start)
+        x.append(x_tile + extended[1].start + tile[1].start)
+
+    y, x = np.concatenate(y), np.concatenate(x)
+
+    # values of the 3 x 3 neighbourhood, missing neighbours get zero weight
+    dy, dx = [_.ravel() for _ in np.mgrid[-1:2, -1:2]]
+    y_nb, x_nb = y[:, np.newaxis] + dy, x[:, np.newaxis] + dx
+    ny, nx = data.shape
+    weights = (y_nb >= 0) & (y_nb < ny) & (x_nb >= 0) & (x_nb < nx)
+    values = data[np.clip(y_nb, 0, ny - 1), np.clip(x_nb, 0, nx - 1)]
+
+    offset_x, offset_y = _fit_quadratic_peak(
+        dx * np.ones_like(values), dy * np.ones_like(values), values, weights
+    )
+    x_refined, y_refined = x + offset_x, y + offset_y
+
+    coord = SkyCoord.from_pixel(x_refined, y_refined, wcs=image.geom.wcs).icrs
+
+    table = Table()
+    table["value"] = data[y, x]
+    table["x"] = x_refined
+    table["y"] = y_refined
+    table["ra"] = coord.ra
+    table["dec"] = coord.dec
+    return table
+
+
+def _find_peaks_hpx(image, data, threshold, min_distance):
+    import healpy as hp
+
+    geom = image.geom
+    idx_global = geom.local_to_global((np.arange(data.size),))[0]
+
+    # local indices of the neighbours, -1 for missing neighbours
+    idx_nb = hp.get_all_neighbours(geom.nside[0], idx_global, nest=geom.nest)
+    idx_nb = np.where(idx_nb >= 0, idx_nb, idx_global)
+    idx_nb = geom.global_to_local((idx_nb,))[0].T
+    missing = idx_nb < 0
+    idx_nb = np.where(missing, np.arange(data.size)[:, np.newaxis], idx_nb)
+
+    # maximum within min_distance steps between neighbouring pixels
+    data_max = data
+    for _ in range(min_distance):
+        data_max = np.maximum(data_max, data_max[idx_nb].max(axis=1))
+
+    (idx,) = ((data == data_max) & (data > threshold)).nonzero()
+
+    # neighbourhood coordinates in the tangent plane at the peak pixel
+    lon, lat = geom.pix_to_coord((idx_global,))
+    idx_fit = np.concatenate([idx[:, np.newaxis], idx_nb[idx]], axis=1)
+    weights = np.concatenate(
+        [np.ones((len(idx), 1), dtype=bool), ~missing[idx]], axis=1
+    )
+
+    lon_0, lat_0 = lon[idx][:, np.newaxis], lat[idx][:, np.newaxis]
+    cos_lat = np.cos(np.radians(lat_0))
+    dx = ((lon[idx_fit] - lon_0 + 180) % 360 - 180) * cos_lat
+    dy = lat[idx_fit] - lat_0
+
+    offset_x, offset_y = _fit_quadratic_peak(dx, dy, data[idx_fit], weights)
+    lon_refined = lon[idx] + offset_x / cos_lat[:, 0]
+    lat_refined = lat[idx] + offset_y
+
+    frame = "icrs" if geom.coordsys == "CEL" else "galactic"
+    coord = SkyCoord(lon_refined, lat_refined, unit="deg", frame=frame).icrs
+
+    table = Table()
+    table["value"] = data[idx]
+    table["idx"] = idx_global[idx]
+    table["ra"] = coord.ra
+    table["dec"] = coord.dec
+    return table
+
+
+def _fit_quadratic_peak(dx, dy, values, weights):
+    """Position of the maximum of a quadratic function fitted to many peaks.
+
+    The function ``a + b x + c y + d x^2 + e x y + f y^2`` is fitted by
+    weighted least squares to every row of the inputs, with the peak pixel
+    at ``x = y = 0``. Where the fitted function has no maximum within the
+    range of the given offsets, zero offsets are returned.
+
+    Parameters
+    ----------
+    dx, dy : `~numpy.ndarray`
+        Coordinate offsets of the neighbourhood pixels, shape ``(n, m)``.
+    values : `~numpy.ndarray`
+        Values of the neighbourhood pixels.
+    weights : `~numpy.ndarray`
+        Weights of the neighbourhood pixels, zero for missing pixels.
+
+    Returns
+    -------
+    offset_x, offset_y : `~numpy.ndarray`
+        Offsets of the maximum.
+    """
+    offset_x, offset_y = np.zeros(len(values)), np.zeros(len(values))
+    if len(values) == 0:
+        return offset_x, offset_y
+
+    design = np.stack([np.ones_like(dx), dx, dy, dx ** 2, dx * dy, dy ** 2], axis=-1)
+    weights = weights.astype(float)
+    design = design * weights[..., np.newaxis]
+    coeff = np.einsum("nij,nj->ni", np.linalg.pinv(design), values * weights)
+    _, b, c, d, e, f = coeff.T
+
+    # stationary point, a maximum if the Hessian is negative definite
+    det = 4 * d * f - e ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = (e * c - 2 * f * b) / det
+        y = (e * b - 2 * d * c) / det
+
+    x_max = np.max(np.abs(dx) * weights, axis=1)
+    y_max = np.max(np.abs(dy) * weights, axis=1)
+    valid = (det > 0) & (d < 0) & (np.abs(x) <= x_max) & (np.abs(y) <= y_max)
+
+    offset_x[valid], offset_y[valid] = x[valid], y[valid]
+    return offset_x, offset_y
@@ -39,7 +39,16 @@ class KernelBackgroundEstimator(object):
     mask_dilation_radius : `~astropy.coordinates.Angle`
         Radius by which mask is dilated with each iteration.
     keep_record : bool
-        Keep record of intermediate results while the algorithm runs?
+        Keep record of intermediate results while the algorithm runs? In
+        incremental mode only the changed pixels are stored for every
+        iteration, use `get_record` to obtain the full images.
+    incremental : bool
+        Update the convolved background images of the previous iteration
+        with convolutions of the changed exclusion mask pixels, instead of
+        convolving the full images again.
+    max_change_fraction : float
+        Maximum fraction of changed exclusion mask pixels for an incremental
+        update. For larger changes the images are convolved again.
 
     See Also
     --------
@@ -74,17 +83,22 @@ class KernelBackgroundEstimator(object):
         significance_threshold=5,
         mask_dilation_radius="0.02 deg",
         keep_record=False,
+        incremental=False,
+        max_change_fraction=0.1,
     ):
 
         self.parameters = {
             "significance_threshold": significance_threshold,
             "mask_dilation_radius": Angle(mask_dilation_radius),
             "keep_record": keep_record,
+            "incremental": incremental,
+            "max_change_fraction": max_change_fraction,
         }
 
         self.kernel_src = kernel_src
         self.kernel_bkg = kernel_bkg
         self.images_stack = []
+        self._background_state = None
 
     def run(self, images, niter_min=2, niter_max=10):
         """Run iterations until mask does not change (stopping condition).
@@ -123,12 +137,17 @@ class KernelBackgroundEstimator(object):
         )
 
         self.images_stack.append(images)
+        record = images
 
         for idx in range(niter_max):
             result = self.run_iteration(images)
 
             if self.parameters["keep_record"]:
-                self.images_stack.append(result)
+                if self.parameters["incremental"]:
+                    self.images_stack.append(self._images_diff(result, record))
+                else:
+                    self.images_stack.append(result)
+                record = result
 
             if self._is_converged(result, images) and (idx >= niter_min):
                 log.info(
@@ -181,16 +200,122 @@ class KernelBackgroundEstimator(object):
 
         return counts.copy(data=mask.astype("float"))
 
+    def get_record(self, idx):
+        """Images of a recorded iteration.
+
+        Parameters
+        ----------
+        idx : int
+            Index in `images_stack`.
+
+        Returns
+        -------
+        images : dict
+            Sky images: counts, background, exclusion, significance
+        """
+        images = self.images_stack[0]
+        for diff in self.images_stack[1 : idx + 1]:
+            if not diff.get("is_diff", False):
+                images = diff
+                continue
+
+            updated = {"counts": images["counts"]}
+            for name in ["background", "exclusion", "significance"]:
+                pix, values = diff[name]
+                data = images[name].data.copy()
+                data.flat[pix] = values
+                updated[name] = images[name].copy(data=data)
+            images = updated
+        return images
+
+    @staticmethod
+    def _images_diff(result, previous):
+        """Changed pixels of the result images w.r.t. previous ones."""
+        diff = {"is_diff": True}
+        for name in ["background", "exclusion", "significance"]:
+            data, data_previous = result[name].data, previous[name].data
+            changed = (data != data_previous) & ~(
+                np.isnan(data) & np.isnan(data_previous)
+            )
+            pix = np.flatnonzero(changed)
+            diff[name] = (pix, data.flat[pix])
+        return diff
+
     def _estimate_background(self, counts, exclusion):
         """
         Estimate background by convolving the excluded counts image with
         the background kernel and renormalizing the image.
         """
+        if self.parameters["incremental"]:
+            vals, norm = self._convolve_incremental(counts, exclusion)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return counts.copy(data=vals / norm)
+
         counts_excluded = counts.copy(data=counts.data * exclusion.data)
         vals = counts_excluded.convolve(self.kernel_bkg)
         norm = exclusion.convolve(self.kernel_bkg)
         return counts.copy(data=vals.data / norm.data)
 
+    def _convolve_incremental(self, counts, exclusion):
+        """Convolve the excluded counts and exclusion images.
+
+        The convolved images of the previous call are updated with the
+        convolutions of the changed exclusion pixels, if the same counts image
+        is used and not more than ``max_change_fraction`` of the pixels changed.
+        """
+        state = self._background_state
+
+        if state is not None and state["counts"] is counts:
+            diff = exclusion.data - state["exclusion"]
+            changed = diff != 0
+            if changed.mean() <= self.parameters["max_change_fraction"]:
+                self._add_convolved_diff(state["vals"], counts.data * diff, changed)
+                self._add_convolved_diff(state["norm"], diff, changed)
+                state["exclusion"] = exclusion.data.copy()
+                return state["vals"].copy(), state["norm"].copy()
+
+        counts_excluded = counts.copy(data=counts.data * exclusion.data)
+        vals = counts_excluded.convolve(self.kernel_bkg).data.astype(float)
+        norm = exclusion.convolve(self.kernel_bkg).data.astype(float)
+
+        self._background_state = {
+            "counts": counts,
+            "exclusion": exclusion.data.copy(),
+            "vals": vals,
+            "norm": norm,
+        }
+        return vals.copy(), norm.copy()
+
+    def _add_convolved_diff(self, convolved, diff, changed):
+        """Add the convolution of a sparse difference image in place.
+
+        Groups of changed pixels are convolved separately in their bounding
+        boxes, with the same alignment as `~gammapy.maps.WcsNDMap.convolve`.
+        """
+        from scipy.ndimage import binary_dilation, find_objects, label
+        from scipy.signal import fftconvolve
+
+        kernel = np.asarray(self.kernel_bkg)
+        ky, kx = kernel.shape
+        ny, nx = convolved.shape
+
+        # merge changed pixels closer than the kernel size into one group
+        structure = np.ones((ky, kx), dtype=bool)
+        labels, _ = label(binary_dilation(changed, structure=structure))
+
+        for slice_y, slice_x in find_objects(labels):
+            y0, x0 = slice_y.start, slice_x.start
+            update = fftconvolve(diff[slice_y, slice_x], kernel, mode="full")
+
+            # position of the full convolution in the "same" output
+            y0, x0 = y0 - (ky - 1) // 2, x0 - (kx - 1) // 2
+            y1, x1 = y0 + update.shape[0], x0 + update.shape[1]
+
+            convolved[max(y0, 0) : min(y1, ny), max(x0, 0) : min(x1, nx)] += update[
+                max(-y0, 0) : update.shape[0] - max(y1 - ny, 0),
+                max(-x0, 0) : update.shape[1] - max(x1 - nx, 0),
+            ]
+
     @staticmethod
     def _is_converged(result, result_previous):
         """Check convergence.
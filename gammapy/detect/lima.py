@@ -3,9 +3,17 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 from copy import deepcopy
 import logging
 import numpy as np
+from astropy.coordinates import Angle
+from astropy.convolution import Tophat2DKernel
+from ..maps.utils import FFTMultiConvolver
 from ..stats import significance, significance_on_off
 
-__all__ = ["compute_lima_image", "compute_lima_on_off_image"]
+__all__ = [
+    "compute_lima_image",
+    "compute_lima_on_off_image",
+    "compute_lima_maps",
+    "compute_lima_on_off_maps",
+]
 
 log = logging.getLogger(__name__)
 
@@ -98,3 +106,152 @@ def compute_lima_on_off_image(n_on, n_off, a_on, a_off, kernel):
         "excess": n_on.copy(data=excess_conv),
         "alpha": n_on.copy(data=alpha_conv),
     }
+
+
+def _convolve_tophats(arrays, radii):
+    """Convolve arrays with peak normalised tophat kernels of several radii.
+
+    Every array is Fourier transformed only once, with a padding suitable for
+    the largest kernel, and then multiplied with the transforms of all kernels.
+    The result is the same as `scipy.signal.fftconvolve` with ``mode="same"``
+    applied to every image plane.
+
+    Parameters
+    ----------
+    arrays : list of `~numpy.ndarray`
+        Arrays of the same shape, the last two axes are the image axes.
+    radii : list of float
+        Kernel radii in pixels.
+
+    Returns
+    -------
+    convolved : list of list of `~numpy.ndarray`
+        Convolved arrays for every radius.
+    """
+    kernels = []
+    for radius in radii:
+        kernel = Tophat2DKernel(radius)
+        kernel.normalize("peak")
+        kernels.append(kernel.array)
+
+    # the tophat kernels are square
+    size = max(kernel.shape[0] for kernel in kernels)
+    convolver = FFTMultiConvolver(arrays[0].shape, (size, size))
+    spectra = [convolver.data_spectrum(array) for array in arrays]
+
+    convolved = []
+    for kernel in kernels:
+        kernel_spectrum = convolver.kernel_spectrum(kernel)
+        convolved.append([convolver.convolve(_, kernel_spectrum) for _ in spectra])
+    return convolved
+
+
+def _radii_to_pix(radii, geom):
+    pixel_scale = geom.pixel_scales[0].deg
+    return [Angle(radius).deg / pixel_scale for radius in radii]
+
+
+def compute_lima_maps(counts, background, radii):
+    """Compute Li & Ma significance maps for known background and several
+    correlation radii.
+
+    Same as `compute_lima_image` with `~astropy.convolution.Tophat2DKernel`
+    kernels, but the maps may have non-spatial axes (e.g. energy) and are
+    Fourier transformed only once for all radii.
+
+    Parameters
+    ----------
+    counts : `~gammapy.maps.WcsNDMap`
+        Counts map
+    background : `~gammapy.maps.WcsNDMap`
+        Background map
+    radii : list of `~astropy.coordinates.Angle`
+        Correlation radii
+
+    Returns
+    -------
+    results : list of dict
+        Result maps for every radius.
+        Keys are: significance, counts, background and excess
+
+    See Also
+    --------
+    gammapy.stats.significance
+    """
+    radii_pix = _radii_to_pix(radii, counts.geom)
+    convolved = _convolve_tophats([counts.data, background.data], radii_pix)
+
+    results = []
+    for counts_conv, background_conv in convolved:
+        excess_conv = counts_conv - background_conv
+        significance_conv = significance(counts_conv, background_conv, method="lima")
+
+        results.append(
+            {
+                "significance": counts.copy(data=significance_conv),
+                "counts": counts.copy(data=counts_conv),
+                "background": counts.copy(data=background_conv),
+                "excess": counts.copy(data=excess_conv),
+            }
+        )
+    return results
+
+
+def compute_lima_on_off_maps(n_on, n_off, a_on, a_off, radii):
+    """Compute Li & Ma significance maps for on-off observations and several
+    correlation radii.
+
+    Same as `compute_lima_on_off_image` with
+    `~astropy.convolution.Tophat2DKernel` kernels, but the maps may have
+    non-spatial axes (e.g. energy) and are Fourier transformed only once for
+    all radii.
+
+    Parameters
+    ----------
+    n_on : `~gammapy.maps.WcsNDMap`
+        Counts map
+    n_off : `~gammapy.maps.WcsNDMap`
+        Off counts map
+    a_on : `~gammapy.maps.WcsNDMap`
+        Relative background efficiency in the on region
+    a_off : `~gammapy.maps.WcsNDMap`
+        Relative background efficiency in the off region
+    radii : list of `~astropy.coordinates.Angle`
+        Correlation radii
+
+    Returns
+    -------
+    results : list of dict
+        Result maps for every radius.
+        Keys are: significance, n_on, background, excess, alpha
+
+    See also
+    --------
+    gammapy.stats.significance_on_off
+    """
+    radii_pix = _radii_to_pix(radii, n_on.geom)
+    convolved = _convolve_tophats([n_on.data, a_on.data], radii_pix)
+
+    results = []
+    for n_on_conv, a_on_conv in convolved:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha_conv = a_on_conv / a_off.data
+
+        significance_conv = significance_on_off(
+            n_on_conv, n_off.data, alpha_conv, method="lima"
+        )
+
+        with np.errstate(invalid="ignore"):
+            background_conv = alpha_conv * n_off.data
+        excess_conv = n_on_conv - background_conv
+
+        results.append(
+            {
+                "significance": n_on.copy(data=significance_conv),
+                "n_on": n_on.copy(data=n_on_conv),
+                "background": n_on.copy(data=background_conv),
+                "excess": n_on.copy(data=excess_conv),
+                "alpha": n_on.copy(data=alpha_conv),
+            }
+        )
+    return results
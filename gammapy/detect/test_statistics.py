@@ -2,13 +2,15 @@
 """Functions to compute TS images."""
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
-import contextlib
 import warnings
 from functools import partial
-from multiprocessing import Pool
 import numpy as np
+import astropy.units as u
 from astropy.convolution import CustomKernel, Kernel2D
+from ..maps import Map
+from ..spectrum.models import PowerLaw
 from ..utils.array import shape_2N, symmetric_crop_pad_width
+from ..utils.parallel import SharedArrayPool
 from ._test_statistics_cython import (
     _cash_cython,
     _amplitude_bounds_cython,
@@ -17,13 +19,14 @@ from ._test_statistics_cython import (
     _x_best_leastsq,
 )
 
-__all__ = ["TSMapEstimator"]
+__all__ = ["TSMapEstimator", "TSCubeEstimator"]
 
 log = logging.getLogger(__name__)
 
 FLUX_FACTOR = 1e-12
 MAX_NITER = 20
 RTOL = 1e-3
+MAX_PATCH_ELEMENTS = int(1e7)
 
 
 def _extract_array(array, shape, position):
@@ -51,6 +54,39 @@ def _extract_array(array, shape, position):
     return array[y_lo:y_hi, x_lo:x_hi]
 
 
+def _extract_patches(array, shape, positions):
+    """Stack the patches around many pixel positions.
+
+    The patches are selected from a sliding window view of the array, so only
+    the selected patches are copied. The spatial axes are the last two axes,
+    the patches extend over all other axes (e.g. energy) of the array.
+
+    Parameters
+    ----------
+    array : `~numpy.ndarray`
+        The array from which to extract.
+    shape : tuple
+        The shape of the patches, only the last two entries are used.
+    positions : tuple of `~numpy.ndarray`
+        Pixel indices ``(j, i)`` of the patch centers.
+
+    Returns
+    -------
+    patches : `~numpy.ndarray`
+        Array of shape ``(len(j),) + array.shape[:-2] + shape[-2:]``.
+    """
+    array = np.ascontiguousarray(array)
+    ny, nx = shape[-2:]
+    view_shape = (array.shape[-2] - ny + 1, array.shape[-1] - nx + 1)
+    view = np.lib.stride_tricks.as_strided(
+        array,
+        shape=view_shape + array.shape[:-2] + (ny, nx),
+        strides=array.strides[-2:] + array.strides,
+    )
+    j, i = positions
+    return view[j - ny // 2, i - nx // 2]
+
+
 def f_cash(x, counts, background, model):
     """Wrapper for cash statistics, that defines the model function.
 
@@ -92,6 +128,10 @@ class TSMapEstimator(object):
         * ``'leastsq iter'``
             Fit the amplitude by an iterative least square fit, that can be solved
             analytically.
+        * ``'root vectorized'``
+            Fit the amplitudes of all pixels at once by Newton iterations on
+            stacked kernel-sized patches, falling back to bisection where a
+            step leaves the bracket of the root. No worker processes are used.
     error_method : ['covar', 'conf']
         Error estimation method.
     error_sigma : int (1)
@@ -101,7 +141,12 @@ class TSMapEstimator(object):
     ul_sigma : int (2)
         Sigma for flux upper limits.
     n_jobs : int
-        Number of parallel jobs to use for the computation.
+        Number of parallel jobs to use for the computation. The input maps
+        are shared with the worker processes, see
+        `~gammapy.utils.parallel.SharedArrayPool`.
+    chunksize : int, optional
+        Number of pixel positions sent to a worker process at once. By
+        default the positions are split into ``4 * n_jobs`` chunks.
     threshold : float (None)
         If the TS value corresponding to the initial flux estimate is not above
         this threshold, the optimizing step is omitted to save computing time.
@@ -137,11 +182,17 @@ class TSMapEstimator(object):
         ul_method="covar",
         ul_sigma=2,
         n_jobs=1,
+        chunksize=None,
         threshold=None,
         rtol=0.001,
     ):
 
-        if method not in ["root brentq", "root newton", "leastsq iter"]:
+        if method not in [
+            "root brentq",
+            "root newton",
+            "leastsq iter",
+            "root vectorized",
+        ]:
             raise ValueError("Not a valid method: '{}'".format(method))
 
         if error_method not in ["covar", "conf"]:
@@ -154,6 +205,7 @@ class TSMapEstimator(object):
             "ul_method": ul_method,
             "ul_sigma": ul_sigma,
             "n_jobs": n_jobs,
+            "chunksize": chunksize,
             "threshold": threshold,
             "rtol": rtol,
         }
@@ -240,7 +292,7 @@ class TSMapEstimator(object):
             sqrt_ts = np.where(ts > 0, np.sqrt(ts), -np.sqrt(-ts))
         return map_ts.copy(data=sqrt_ts)
 
-    def run(self, maps, kernel, which="all", downsampling_factor=None):
+    def run(self, maps, kernel, which="all", downsampling_factor=None, pool=None):
         """
         Run TS map estimation.
 
@@ -258,6 +310,10 @@ class TSMapEstimator(object):
             Sample down the input maps to speed up the computation. Only integer
             values that are a multiple of 2 are allowed. Note that the kernel is
             not sampled down, but must be provided with the downsampled bin size.
+        pool : `~gammapy.utils.parallel.SharedArrayPool`, optional
+            Worker pool to use, so that the worker processes can be reused for
+            several calls. By default a pool with ``n_jobs`` processes is
+            created for this call. Not used by the ``'root vectorized'`` method.
 
         Returns
         -------
@@ -309,21 +365,15 @@ class TSMapEstimator(object):
         background = maps["background"].data.astype(float)
         exposure = maps["exposure"].data.astype(float)
 
-        # Compute null statistics per pixel for the whole image
-        c_0 = _cash_cython(counts, background)
-
         error_method = p["error_method"] if "flux_err" in which else "none"
         ul_method = p["ul_method"] if "flux_ul" in which else "none"
 
-        wrap = partial(
-            _ts_value,
+        kwargs = dict(
             counts=counts,
             exposure=exposure,
             background=background,
-            c_0=c_0,
             kernel=kernel,
             flux=flux,
-            method=p["method"],
             error_method=error_method,
             threshold=p["threshold"],
             error_sigma=p["error_sigma"],
@@ -332,23 +382,43 @@ class TSMapEstimator(object):
             rtol=p["rtol"],
         )
 
-        x, y = np.where(mask.data)
-        positions = list(zip(x, y))
+        j, i = np.where(mask.data)
+
+        if p["method"] == "root vectorized":
+            kwargs["kernel"] = kernel.array
+            values = _ts_values_vectorized((j, i), **kwargs)
+        else:
+            # Compute null statistics per pixel for the whole image
+            kwargs["c_0"] = _cash_cython(counts, background)
+
+            # share large arrays with the workers, pass the rest with the function
+            names = ["counts", "exposure", "background", "c_0", "flux"]
+            arrays = {name: kwargs.pop(name) for name in names}
+            if arrays["flux"] is None:
+                kwargs["flux"] = arrays.pop("flux")
+
+            wrap = partial(_ts_value, method=p["method"], **kwargs)
+
+            if pool is None:
+                with SharedArrayPool(p["n_jobs"], p["chunksize"]) as pool:
+                    log.info("Using {} jobs to compute TS map.".format(p["n_jobs"]))
+                    results = pool.map(wrap, zip(j, i), arrays=arrays)
+            else:
+                log.info("Using {} jobs to compute TS map.".format(pool.n_jobs))
+                results = pool.map(wrap, zip(j, i), arrays=arrays)
 
-        with contextlib.closing(Pool(processes=p["n_jobs"])) as pool:
-            log.info("Using {} jobs to compute TS map.".format(p["n_jobs"]))
-            results = pool.map(wrap, positions)
+            names = ["ts", "flux", "niter", "flux_err", "flux_ul"]
+            values = {name: [_.get(name) for _ in results] for name in names}
 
         # Set TS values at given positions
-        j, i = zip(*positions)
         for name in ["ts", "flux", "niter"]:
-            result[name].data[j, i] = [_[name] for _ in results]
+            result[name].data[j, i] = values[name]
 
         if "flux_err" in which:
-            result["flux_err"].data[j, i] = [_["flux_err"] for _ in results]
+            result["flux_err"].data[j, i] = values["flux_err"]
 
         if "flux_ul" in which:
-            result["flux_ul"].data[j, i] = [_["flux_ul"] for _ in results]
+            result["flux_ul"].data[j, i] = values["flux_ul"]
 
         # Compute sqrt(TS) values
         if "sqrt_ts" in which:
@@ -364,6 +434,114 @@ class TSMapEstimator(object):
 
         return result
 
+    def run_coarse_to_fine(
+        self,
+        maps,
+        kernel,
+        kernel_coarse,
+        downsampling_factor=2,
+        threshold=25,
+        peak_threshold=None,
+        which="all",
+        pool=None,
+    ):
+        """
+        Run TS map estimation with a coarse-to-fine search.
+
+        The TS map is first computed on maps sampled down by
+        ``downsampling_factor``. It is then refined at full resolution
+        around the pixels, where the coarse TS exceeds ``threshold`` and
+        around the local maxima of the coarse TS map above
+        ``peak_threshold``. Everywhere else the upsampled coarse result
+        is returned. In the refined regions the result is identical to
+        the result of `run` at full resolution.
+
+        Parameters
+        ----------
+        maps : dict
+            Input sky maps.
+        kernel : `astropy.convolution.Kernel2D` or 2D `~numpy.ndarray`
+            Source model kernel with the bin size of the input maps.
+        kernel_coarse : `astropy.convolution.Kernel2D` or 2D `~numpy.ndarray`
+            Source model kernel with the bin size of the downsampled maps.
+        downsampling_factor : int
+            Downsampling factor for the coarse TS map, see `run`.
+        threshold : float
+            TS threshold of the coarse TS map for the refinement.
+        peak_threshold : float
+            TS threshold for the local maxima of the coarse TS map, which are
+            refined. By default ``threshold / 4``, i.e. half the significance.
+        which : list of str or 'all'
+            Which maps to compute.
+        pool : `~gammapy.utils.parallel.SharedArrayPool`, optional
+            Worker pool to use, see `run`. By default one pool is created and
+            used for both the coarse and the fine TS map.
+
+        Returns
+        -------
+        maps : dict
+            Result maps.
+        """
+        if pool is None:
+            p = self.parameters
+            with SharedArrayPool(p["n_jobs"], p["chunksize"]) as pool:
+                return self.run_coarse_to_fine(
+                    maps,
+                    kernel,
+                    kernel_coarse,
+                    downsampling_factor=downsampling_factor,
+                    threshold=threshold,
+                    peak_threshold=peak_threshold,
+                    which=which,
+                    pool=pool,
+                )
+
+        from scipy.ndimage import binary_dilation, maximum_filter
+
+        if which != "all" and not {"ts", "sqrt_ts"} & set(which):
+            raise ValueError("Coarse-to-fine search requires 'ts' or 'sqrt_ts'")
+
+        if peak_threshold is None:
+            peak_threshold = threshold / 4.
+
+        # `run` modifies the dict of input maps when sampling down
+        coarse = self.run(
+            dict(maps),
+            kernel_coarse,
+            which,
+            downsampling_factor=downsampling_factor,
+            pool=pool,
+        )
+
+        if "ts" in coarse:
+            ts = coarse["ts"].data
+        else:
+            ts = coarse["sqrt_ts"].data ** 2 * np.sign(coarse["sqrt_ts"].data)
+
+        size = 2 * downsampling_factor + 1
+        with np.errstate(invalid="ignore"):
+            peaks = (maximum_filter(ts, size=size) == ts) & (ts >= peak_threshold)
+            refine = (ts >= threshold) | peaks
+
+        structure = np.ones((size, size), dtype=bool)
+        refine = binary_dilation(refine, structure=structure)
+
+        maps_fine = dict(maps)
+        mask = refine.astype(int)
+        if "mask" in maps:
+            mask &= maps["mask"].data
+        maps_fine["mask"] = maps["counts"].copy(data=mask)
+
+        log.info(
+            "Refining TS map for {} of {} pixels".format(refine.sum(), refine.size)
+        )
+        fine = self.run(maps_fine, kernel, which, pool=pool)
+
+        for name in coarse:
+            coarse[name].data[refine] = fine[name].data[refine]
+
+        return coarse
+
     def __repr__(self):
         p = self.parameters
         info = self.__class__.__name__
@@ -373,6 +551,211 @@ class TSMapEstimator(object):
         return info
 
 
+class TSCubeEstimator(object):
+    """Compute TS map from counts, background and exposure cubes.
+
+    A single flux amplitude per pixel is fitted jointly to all energy bins.
+    The source model in every energy bin is given by the exposure, the PSF
+    kernel of the bin and the fraction of the flux in the bin for an assumed
+    spectral shape. The fitted flux is the integral flux over the energy range
+    of the cube.
+
+    The amplitudes are fitted with the same vectorized solver as used by the
+    ``'root vectorized'`` method of `TSMapEstimator`. Energy dispersion is
+    not taken into account, the exposure is expected to be given on the energy
+    axis of the counts cube.
+
+    Parameters
+    ----------
+    spectral_model : `~gammapy.spectrum.models.SpectralModel`
+        Assumed spectral shape of the source. By default a power law with
+        index 2.
+    error_method : ['covar', 'conf']
+        Error estimation method.
+    error_sigma : int (1)
+        Sigma for flux error.
+    ul_method : ['covar', 'conf']
+        Upper limit estimation method.
+    ul_sigma : int (2)
+        Sigma for flux upper limits.
+    rtol : float (0.001)
+        Relative precision of the flux estimate. Used as a stopping criterion for
+        the amplitude fit.
+    """
+
+    def __init__(
+        self,
+        spectral_model=None,
+        error_method="covar",
+        error_sigma=1,
+        ul_method="covar",
+        ul_sigma=2,
+        rtol=0.001,
+    ):
+        if error_method not in ["covar", "conf"]:
+            raise ValueError("Not a valid error method '{}'".format(error_method))
+
+        if ul_method not in ["covar", "conf"]:
+            raise ValueError("Not a valid upper limit method '{}'".format(ul_method))
+
+        if spectral_model is None:
+            spectral_model = PowerLaw(index=2)
+
+        self.parameters = {
+            "spectral_model": spectral_model,
+            "error_method": error_method,
+            "error_sigma": error_sigma,
+            "ul_method": ul_method,
+            "ul_sigma": ul_sigma,
+            "rtol": rtol,
+        }
+
+    def spectral_weights(self, geom):
+        """Fraction of the source flux in every energy bin.
+
+        Parameters
+        ----------
+        geom : `~gammapy.maps.WcsGeom`
+            Map geometry with an energy axis.
+
+        Returns
+        -------
+        weights : `~numpy.ndarray`
+            Flux fractions.
+        """
+        energy_axis = geom.get_axis_by_name("energy")
+        edges = energy_axis.edges * u.Unit(energy_axis.unit)
+        model = self.parameters["spectral_model"]
+        flux = model.integral(emin=edges[:-1], emax=edges[1:], intervals=True)
+        return (flux / flux.sum()).to("").value
+
+    @staticmethod
+    def mask_default(maps, psf_kernel):
+        """Compute default mask where to estimate TS values.
+
+        Parameters
+        ----------
+        maps : dict
+            Input sky maps. Requires `background` and `exposure`.
+        psf_kernel : `~gammapy.cube.PSFKernel`
+            PSF kernel.
+
+        Returns
+        -------
+        mask : `WcsNDMap`
+            Mask image.
+        """
+        shape = psf_kernel.data.shape
+        exposure = maps["exposure"].data.sum(axis=0)
+        mask = np.zeros(exposure.shape, dtype=int)
+
+        # mask boundary
+        slice_x = slice(shape[-1] // 2, -shape[-1] // 2 + 1)
+        slice_y = slice(shape[-2] // 2, -shape[-2] // 2 + 1)
+        mask[slice_y, slice_x] = 1
+
+        # positions where exposure == 0 are not processed
+        mask &= exposure > 0
+        mask[maps["background"].data.sum(axis=0) == 0] = 0
+
+        geom = maps["exposure"].geom.to_image()
+        return Map.from_geom(geom, data=mask)
+
+    def run(self, maps, psf_kernel, which="all"):
+        """
+        Run TS map estimation.
+
+        Requires `counts`, `exposure` and `background` cubes with the same
+        energy axis.
+
+        Parameters
+        ----------
+        maps : dict
+            Input sky cubes.
+        psf_kernel : `~gammapy.cube.PSFKernel`
+            PSF kernel with the energy axis of the input cubes.
+        which : list of str or 'all'
+            Which maps to compute.
+
+        Returns
+        -------
+        maps : dict
+            Result maps, the flux is given in units of ``cm-2 s-1``.
+        """
+        p = self.parameters
+
+        shape = maps["counts"].data.shape
+        kernel_shape = psf_kernel.data.shape
+        if maps["exposure"].data.shape != shape:
+            raise ValueError("Exposure and counts cubes must have the same shape")
+
+        if kernel_shape[0] != shape[0]:
+            raise ValueError(
+                "PSF kernel has {} energy bins, but cubes have {}".format(
+                    kernel_shape[0], shape[0]
+                )
+            )
+
+        if (np.array(kernel_shape[1:]) > np.array(shape[1:])).any():
+            raise ValueError(
+                "Kernel shape larger than map shape, please adjust"
+                " size of the kernel"
+            )
+
+        if which == "all":
+            which = ["ts", "sqrt_ts", "flux", "flux_err", "flux_ul", "niter"]
+
+        geom = maps["counts"].geom.to_image()
+        result = {}
+        for name in which:
+            unit = "cm-2 s-1" if name in ["flux", "flux_err", "flux_ul"] else ""
+            result[name] = Map.from_geom(geom, unit=unit)
+            result[name].data += np.nan
+
+        mask = self.mask_default(maps, psf_kernel)
+
+        if "mask" in maps:
+            mask.data &= maps["mask"].data
+
+        weights = self.spectral_weights(maps["counts"].geom)
+        kernel = psf_kernel.data * weights[:, np.newaxis, np.newaxis]
+
+        # covariance upper limits are computed from the flux errors
+        ul_method = p["ul_method"] if "flux_ul" in which else "none"
+        if "flux_err" in which or ul_method == "covar":
+            error_method = p["error_method"]
+        else:
+            error_method = "none"
+
+        j, i = np.where(mask.data)
+        values = _ts_values_vectorized(
+            (j, i),
+            counts=maps["counts"].data.astype(float),
+            exposure=maps["exposure"].quantity.to("cm2 s").value,
+            background=maps["background"].data.astype(float),
+            kernel=kernel,
+            flux=None,
+            error_method=error_method,
+            error_sigma=p["error_sigma"],
+            ul_method=ul_method,
+            ul_sigma=p["ul_sigma"],
+            threshold=None,
+            rtol=p["rtol"],
+        )
+
+        for name in ["ts", "flux", "niter", "flux_err", "flux_ul"]:
+            if name in which:
+                result[name].data[j, i] = values[name]
+
+        if "sqrt_ts" in which:
+            ts = Map.from_geom(geom)
+            ts.data += np.nan
+            ts.data[j, i] = values["ts"]
+            result["sqrt_ts"] = TSMapEstimator.sqrt_ts(ts)
+
+        return result
+
+
 def _ts_value(
     position,
     counts,
@@ -480,6 +863,351 @@ def _ts_value(
     return result
 
 
+def _ts_values_vectorized(
+    positions,
+    counts,
+    exposure,
+    background,
+    kernel,
+    flux,
+    error_method,
+    error_sigma,
+    ul_method,
+    ul_sigma,
+    threshold,
+    rtol,
+):
+    """Compute TS values at many pixel positions at once.
+
+    The positions are processed in chunks, such that the stacked patches
+    contain at most ``MAX_PATCH_ELEMENTS`` elements.
+
+    Parameters
+    ----------
+    positions : tuple of `~numpy.ndarray`
+        Pixel indices ``(j, i)``.
+    kernel : `~numpy.ndarray`
+        Source model kernel, with the same axes as the input arrays.
+
+    See `_ts_value` for the other parameters.
+
+    Returns
+    -------
+    values : dict of `~numpy.ndarray`
+        TS, flux, number of iterations, flux error and flux upper limit for
+        every position.
+    """
+    n_positions = len(positions[0])
+    names = ["ts", "flux", "niter", "flux_err", "flux_ul"]
+    values = {name: np.full(n_positions, np.nan) for name in names}
+
+    chunk_size = max(MAX_PATCH_ELEMENTS // kernel.size, 1)
+
+    for start in range(0, n_positions, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        positions_chunk = positions[0][chunk], positions[1][chunk]
+
+        counts_ = _extract_patches(counts, kernel.shape, positions_chunk)
+        background_ = _extract_patches(background, kernel.shape, positions_chunk)
+        exposure_ = _extract_patches(exposure, kernel.shape, positions_chunk)
+        model = exposure_ * kernel
+
+        flux_ = None if flux is None else flux[positions_chunk]
+
+        values_chunk = _ts_values_patches(
+            counts_,
+            background_,
+            model,
+            flux=flux_,
+            error_method=error_method,
+            error_sigma=error_sigma,
+            ul_method=ul_method,
+            ul_sigma=ul_sigma,
+            threshold=threshold,
+            rtol=rtol,
+        )
+        for name in names:
+            values[name][chunk] = values_chunk[name]
+
+    return values
+
+
+def _ts_values_patches(
+    counts,
+    background,
+    model,
+    flux,
+    error_method,
+    error_sigma,
+    ul_method,
+    ul_sigma,
+    threshold,
+    rtol,
+):
+    """Compute TS values for stacked patches.
+
+    The first axis of the input arrays runs over the pixel positions, the
+    fit statistics are summed over all other axes.
+
+    Parameters
+    ----------
+    counts : `~numpy.ndarray`
+        Stacked counts patches
+    background : `~numpy.ndarray`
+        Stacked background patches
+    model : `~numpy.ndarray`
+        Stacked source templates (multiplied with exposure).
+    flux : `~numpy.ndarray`
+        Flux estimate per position, only used with a ``threshold``.
+
+    See `_ts_value` for the other parameters.
+
+    Returns
+    -------
+    values : dict of `~numpy.ndarray`
+        TS, flux, number of iterations, flux error and flux upper limit.
+    """
+    n_positions = len(counts)
+    values = {
+        "ts": np.full(n_positions, np.nan),
+        "flux": np.full(n_positions, np.nan),
+        "niter": np.zeros(n_positions),
+        "flux_err": np.full(n_positions, np.nan),
+        "flux_ul": np.full(n_positions, np.nan),
+    }
+
+    c_0 = _cash_sum_vectorized(counts, background)
+    fit = np.ones(n_positions, dtype=bool)
+
+    if threshold is not None:
+        mu = background + _expand_dims(flux, model) * model
+        c_1 = _cash_sum_vectorized(counts, mu)
+        with np.errstate(invalid="ignore"):
+            # Don't fit if pixel significance is low
+            below = c_0 - c_1 < threshold
+        values["ts"][below] = ((c_0 - c_1) * np.sign(flux))[below]
+        values["flux"][below] = flux[below]
+        fit = ~below
+
+    counts, background, model = counts[fit], background[fit], model[fit]
+    amplitude, niter = _root_amplitude_vectorized(counts, background, model, rtol)
+
+    mu = background + _expand_dims(amplitude, model) * FLUX_FACTOR * model
+    c_1 = _cash_sum_vectorized(counts, mu)
+
+    values["ts"][fit] = (c_0[fit] - c_1) * np.sign(amplitude)
+    values["flux"][fit] = amplitude * FLUX_FACTOR
+    values["niter"][fit] = niter
+
+    if error_method == "covar":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stat = model ** 2 * counts / mu ** 2
+            stat = np.sum(stat, axis=tuple(range(1, stat.ndim)))
+            flux_err = np.sqrt(1. / stat)
+        values["flux_err"][fit] = flux_err * error_sigma
+    elif error_method == "conf":
+        flux_err = _compute_flux_err_conf_vectorized(
+            amplitude, counts, background, model, c_1, error_sigma
+        )
+        values["flux_err"][fit] = FLUX_FACTOR * flux_err
+
+    if ul_method == "covar":
+        values["flux_ul"] = values["flux"] + ul_sigma * values["flux_err"]
+    elif ul_method == "conf":
+        flux_ul = _compute_flux_err_conf_vectorized(
+            amplitude, counts, background, model, c_1, ul_sigma
+        )
+        values["flux_ul"][fit] = FLUX_FACTOR * flux_ul + values["flux"][fit]
+
+    return values
+
+
+def _expand_dims(values, patches):
+    """Reshape values per position to broadcast against stacked patches."""
+    return values.reshape((-1,) + (1,) * (patches.ndim - 1))
+
+
+def _cash_sum_vectorized(counts, model):
+    """Summed cash fit statistics for stacked patches, see `_cash_sum_cython`."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cash = np.where(model > 0, model - counts * np.log(model), 0)
+    return 2 * np.sum(cash, axis=tuple(range(1, cash.ndim)))
+
+
+def _amplitude_bounds_vectorized(counts, background, model):
+    """Bounds for the root of the fit statistic derivative for stacked patches.
+
+    Vectorized version of `_amplitude_bounds_cython`.
+    """
+    n_positions = len(counts)
+    counts = counts.reshape(n_positions, -1)
+    background = background.reshape(n_positions, -1)
+    model = model.reshape(n_positions, -1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sn = np.where(model > 0, background / model, np.inf)
+
+    s_model = np.sum(np.where(model > 0, model, 0), axis=1)
+    s_counts = np.sum(np.where(counts > 0, counts, 0), axis=1)
+    sn_min_total = np.minimum(sn.min(axis=1), 1e14)
+
+    sn_counts = np.where(counts > 0, sn, np.inf)
+    idx = np.argmin(sn_counts, axis=1)
+    rows = np.arange(n_positions)
+    sn_min, c_min = sn_counts[rows, idx], counts[rows, idx]
+
+    no_min = ~(sn_min < 1e14)
+    sn_min[no_min], c_min[no_min] = 1e14, 1
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        b_min = c_min / s_model - sn_min
+        b_max = s_counts / s_model - sn_min
+    return b_min / FLUX_FACTOR, b_max / FLUX_FACTOR, -sn_min_total / FLUX_FACTOR
+
+
+def _root_amplitude_vectorized(counts, background, model, rtol=RTOL):
+    """Fit amplitudes for stacked patches by finding the roots of the
+    derivative of the fit statistics.
+
+    Vectorized version of `_root_amplitude_brentq`, using bracketed Newton
+    iterations. See Appendix A Stewart (2009).
+
+    Parameters
+    ----------
+    counts : `~numpy.ndarray`
+        Stacked counts patches
+    background : `~numpy.ndarray`
+        Stacked background patches
+    model : `~numpy.ndarray`
+        Stacked source templates (multiplied with exposure).
+    rtol : float
+        Relative precision of the amplitudes.
+
+    Returns
+    -------
+    amplitude : `~numpy.ndarray`
+        Fitted flux amplitudes.
+    niter : `~numpy.ndarray`
+        Number of iterations needed for the fit.
+    """
+    axis = tuple(range(1, counts.ndim))
+    amplitude_min, amplitude_max, amplitude_min_total = _amplitude_bounds_vectorized(
+        counts, background, model
+    )
+    has_counts = np.sum(counts, axis=axis) > 0
+
+    model_ = np.where(model > 0, model, 0) * FLUX_FACTOR
+
+    def f_cash_root(x, idx):
+        mu = _expand_dims(x, model) * model_[idx] + background[idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = counts[idx] / mu
+            f = np.sum(model_[idx] * (1 - ratio), axis=axis)
+            df = np.sum(model_[idx] ** 2 * ratio / mu, axis=axis)
+        return f, df
+
+    amplitude = amplitude_min_total.copy()
+    niter = np.zeros(len(counts))
+
+    idx = np.where(has_counts)[0]
+    amplitude[idx], niter[idx] = _root_newton_bracketed(
+        f_cash_root, amplitude_min[idx], amplitude_max[idx], idx, rtol=rtol
+    )
+    return np.maximum(amplitude, amplitude_min_total), niter
+
+
+def _compute_flux_err_conf_vectorized(
+    amplitude, counts, background, model, c_1, error_sigma
+):
+    """Compute amplitude errors for stacked patches using the likelihood
+    profile method.
+
+    Vectorized version of `_compute_flux_err_conf`.
+    """
+    axis = tuple(range(1, counts.ndim))
+    model_ = model * FLUX_FACTOR
+
+    def ts_diff(x, idx):
+        mu = _expand_dims(x, model) * model_[idx] + background[idx]
+        f = _cash_sum_vectorized(counts[idx], mu) - (c_1[idx] + error_sigma ** 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            df = 2 * np.sum(model_[idx] * (1 - counts[idx] / mu), axis=axis)
+        return f, df
+
+    idx = np.where(np.isfinite(amplitude))[0]
+    err = np.full(len(amplitude), np.nan)
+    root, _ = _root_newton_bracketed(
+        ts_diff, amplitude[idx], amplitude[idx] + 1E4, idx, rtol=1e-3
+    )
+    err[idx] = root - amplitude[idx]
+    return err
+
+
+def _root_newton_bracketed(func, lo, hi, idx, rtol=RTOL, maxiter=MAX_NITER):
+    """Find the roots of many increasing functions at once.
+
+    Newton steps which leave the bracket ``[lo, hi]`` of a root are replaced
+    by bisection steps. Where the bracket contains no root or the iteration
+    does not converge, NaN is returned.
+
+    Parameters
+    ----------
+    func : callable
+        Function ``func(x, idx)`` returning the function values and
+        derivatives at ``x`` for the problems ``idx``.
+    lo, hi : `~numpy.ndarray`
+        Brackets of the roots.
+    idx : `~numpy.ndarray`
+        Indices of the problems, passed on to ``func``.
+    rtol : float
+        Relative precision of the roots.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    root : `~numpy.ndarray`
+        Roots
+    niter : `~numpy.ndarray`
+        Number of iterations needed.
+    """
+    lo, hi = lo.astype(float), hi.astype(float)
+    x = 0.5 * (lo + hi)
+    niter = np.full(len(x), maxiter)
+
+    # the root must be bracketed, as for `scipy.optimize.brentq`
+    f_lo, _ = func(lo, idx)
+    f_hi, _ = func(hi, idx)
+    with np.errstate(invalid="ignore"):
+        active = np.where((f_lo <= 0) & (f_hi >= 0))[0]
+    invalid = np.ones(len(x), dtype=bool)
+    invalid[active] = False
+
+    for n_iter in range(1, maxiter + 1):
+        if len(active) == 0:
+            break
+
+        x_a, lo_a, hi_a = x[active], lo[active], hi[active]
+        f, df = func(x_a, idx[active])
+
+        lo_a = np.where(f < 0, x_a, lo_a)
+        hi_a = np.where(f > 0, x_a, hi_a)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_new = x_a - f / df
+            inside = (x_new > lo_a) & (x_new < hi_a)
+        x_new = np.where(inside, x_new, 0.5 * (lo_a + hi_a))
+
+        converged = (np.abs(x_new - x_a) <= rtol * np.abs(x_new)) | (f == 0)
+        x[active], lo[active], hi[active] = x_new, lo_a, hi_a
+        niter[active[converged]] = n_iter
+        active = active[~converged]
+
+    invalid[active] = True
+    x[invalid] = np.nan
+    return x, niter
+
+
 def _leastsq_iter_amplitude(counts, background, model, maxiter=MAX_NITER, rtol=RTOL):
     """Fit amplitude using an iterative least squares algorithm.
 
@@ -1,8 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
 import numpy as np
 from numpy.testing import assert_allclose, assert_equal
 from ...utils.testing import requires_dependency, requires_data
+from ...utils.random import get_random_state
 from ...detect import CWT, CWTKernels, CWTData
 from ...maps import Map
 
@@ -263,3 +265,40 @@ class TestCWTData:
         assert_allclose(
             transform_2d.data[36, 63], self.cwt_data.transform_2d.data[36, 63]
         )
+
+
+@requires_dependency("scipy")
+@pytest.mark.parametrize(
+    "dtype, scale_chunk, rtol", [(np.float64, 2, 1e-7), (np.float32, 1, 1e-3)]
+)
+def test_cwt_transform_fftconvolve(dtype, scale_chunk, rtol):
+    from scipy.signal import fftconvolve
+
+    counts = Map.create(npix=(50, 40), binsz=0.1)
+    counts.data = get_random_state(0).poisson(2, size=counts.data.shape)
+    background = counts.copy(data=np.full(counts.data.shape, 2.))
+
+    kernels = CWTKernels(n_scale=2, min_scale=1.5, step_scale=2, old=True)
+    cwt = CWT(kernels=kernels, dtype=dtype, scale_chunk=scale_chunk)
+    data = CWTData(counts=counts, background=background, n_scale=2, dtype=dtype)
+    buffers = [data._transform_3d, data._error, data._approx, data._approx_bkg]
+    cwt._transform(data=data)
+
+    # results are written into the existing arrays
+    results = [data._transform_3d, data._error, data._approx, data._approx_bkg]
+    for buffer, result in zip(buffers, results):
+        assert buffer is result
+
+    excess = counts.data - background.data
+    for idx, kern in kernels.kern_base.items():
+        expected = fftconvolve(excess, kern, mode="same")
+        atol = rtol * np.abs(expected).max()
+        assert_allclose(data._transform_3d[idx], expected, rtol=rtol, atol=atol)
+
+        expected = np.sqrt(fftconvolve(background.data, kern ** 2, mode="same"))
+        assert_allclose(data._error[idx], expected, rtol=rtol)
+
+    expected = fftconvolve(excess, kernels.kern_approx, mode="same")
+    atol = rtol * np.abs(expected).max()
+    assert_allclose(data._approx, expected, rtol=rtol, atol=atol)
+    assert data._transform_3d.dtype == dtype
@@ -3,8 +3,8 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from numpy.testing import assert_allclose
 from ...utils.testing import requires_dependency
-from ...maps import Map
-from ..find import find_peaks
+from ...maps import Map, HpxGeom
+from ..find import find_peaks, find_peaks_refined
 
 
 @requires_dependency("scipy")
@@ -47,3 +47,68 @@ class TestFindPeaks:
 
         table = find_peaks(image, threshold=3)
         assert len(table) == 0
+
+
+@requires_dependency("scipy")
+class TestFindPeaksRefined:
+    def setup(self):
+        self.image = Map.create(npix=(40, 30), binsz=0.1, unit="s")
+        y, x = np.indices(self.image.data.shape)
+        for x_0, y_0, amplitude in [(20.3, 15.6, 10), (5.8, 3.1, 5), (35, 25, 3)]:
+            r2 = (x - x_0) ** 2 + (y - y_0) ** 2
+            self.image.data += amplitude * np.exp(-0.5 * r2 / 2 ** 2)
+
+    def test_simple(self):
+        table = find_peaks_refined(self.image, threshold=2)
+
+        assert len(table) == 3
+        assert table["value"].unit == "s"
+        assert table["ra"].unit == "deg"
+
+        assert_allclose(table["x"], [20.3, 5.8, 35], atol=0.05)
+        assert_allclose(table["y"], [15.6, 3.1, 25], atol=0.05)
+
+        coord = self.image.geom.pix_to_coord((table["x"], table["y"]))
+        assert_allclose(table["ra"][0], coord[0][0] % 360)
+        assert_allclose(table["dec"][0], coord[1][0])
+
+        expected = find_peaks(self.image, threshold=2)
+        assert_allclose(np.round(table["x"]), expected["x"])
+        assert_allclose(table["value"], expected["value"])
+
+    def test_tiles(self):
+        expected = find_peaks_refined(self.image, threshold=2, min_distance=3)
+        table = find_peaks_refined(
+            self.image, threshold=2, min_distance=3, tile_shape=(7, 9)
+        )
+        assert len(table) == len(expected)
+        for name in ["value", "x", "y", "ra", "dec"]:
+            assert_allclose(table[name], expected[name])
+
+    def test_no_peak(self):
+        table = find_peaks_refined(self.image, threshold=100)
+        assert len(table) == 0
+
+
+@requires_dependency("scipy")
+@requires_dependency("healpy")
+def test_find_peaks_refined_hpx():
+    geom = HpxGeom.create(nside=64, coordsys="CEL")
+    lon, lat = geom.pix_to_coord(geom.get_idx())
+
+    lon_0, lat_0 = np.radians(10.1), np.radians(20.2)
+    lon, lat = np.radians(lon), np.radians(lat)
+    cos_sep = np.sin(lat) * np.sin(lat_0) + np.cos(lat) * np.cos(lat_0) * np.cos(
+        lon - lon_0
+    )
+    sep = np.degrees(np.arccos(np.clip(cos_sep, -1, 1)))
+
+    image = Map.from_geom(geom)
+    image.data = np.exp(-0.5 * (sep / 3.) ** 2)
+
+    table = find_peaks_refined(image, threshold=0.5, min_distance=2)
+
+    assert len(table) == 1
+    assert_allclose(table["ra"][0], 10.1, atol=0.3)
+    assert_allclose(table["dec"][0], 20.2, atol=0.3)
+    assert "idx" in table.colnames
@@ -4,6 +4,7 @@ import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 from ...utils.testing import requires_data
+from ...utils.random import get_random_state
 from ...maps import Map
 from ..kernel import KernelBackgroundEstimator
 
@@ -72,3 +73,82 @@ def test_run_without_defaults(kbe, images):
     assert_allclose(mask.sum(), 89)
     assert_allclose(background, 42 * np.ones((10, 10)))
     assert len(kbe.images_stack) == 4
+
+
+def test_run_incremental(images):
+    kwargs = dict(
+        kernel_src=np.ones((1, 3)),
+        kernel_bkg=np.ones((5, 3)),
+        significance_threshold=4,
+        mask_dilation_radius="1 deg",
+        keep_record=True,
+    )
+    expected = KernelBackgroundEstimator(**kwargs).run(dict(images))
+
+    kbe = KernelBackgroundEstimator(incremental=True, **kwargs)
+    result = kbe.run(dict(images))
+
+    assert_allclose(result["exclusion"].data, expected["exclusion"].data)
+    assert_allclose(result["background"].data, expected["background"].data, rtol=1e-5)
+    assert len(kbe.images_stack) == 4
+
+    record = kbe.get_record(3)
+    for name in ["exclusion", "background", "significance"]:
+        assert_allclose(record[name].data, result[name].data)
+
+
+def test_convolve_incremental():
+    counts = Map.create(npix=20, binsz=1)
+    counts.data = np.arange(400.).reshape(20, 20)
+
+    exclusion = Map.from_geom(counts.geom)
+    exclusion.data += 1
+
+    kernel = np.ones((5, 3))
+    kbe = KernelBackgroundEstimator(
+        kernel_src=np.ones((1, 3)), kernel_bkg=kernel, incremental=True
+    )
+    kbe._convolve_incremental(counts, exclusion)
+
+    exclusion = exclusion.copy()
+    exclusion.data[0, 1] = 0
+    exclusion.data[10:12, 18:] = 0
+    vals, norm = kbe._convolve_incremental(counts, exclusion)
+
+    expected = counts.copy(data=counts.data * exclusion.data).convolve(kernel)
+    assert_allclose(vals, expected.data, rtol=1e-5)
+    assert_allclose(norm, exclusion.convolve(kernel).data, rtol=1e-5)
+
+
+def test_estimate_background_incremental():
+    counts = Map.create(npix=20, binsz=1)
+    counts.data = get_random_state(0).poisson(42, size=(20, 20)).astype(float)
+
+    kwargs = dict(kernel_src=np.ones((1, 3)), kernel_bkg=np.ones((5, 3)))
+    kbe_full = KernelBackgroundEstimator(**kwargs)
+    kbe = KernelBackgroundEstimator(incremental=True, **kwargs)
+
+    exclusions = []
+    exclusion = np.ones((20, 20))
+    exclusions.append(exclusion.copy())
+    exclusion[4:7, 4:7] = 0
+    exclusions.append(exclusion.copy())
+    exclusion[4:7, 6] = 1
+    exclusion[0, 15:19] = 0
+    exclusions.append(exclusion.copy())
+    # more than max_change_fraction of the pixels change
+    exclusion[8:18:2, 8:18] = 0
+    exclusions.append(exclusion.copy())
+    exclusion[12, 12] = 1
+    exclusions.append(exclusion.copy())
+
+    is_incremental = [False, True, True, False, True]
+    for data, incremental in zip(exclusions, is_incremental):
+        state = kbe._background_state
+        exclusion = counts.copy(data=data)
+
+        actual = kbe._estimate_background(counts, exclusion)
+        expected = kbe_full._estimate_background(counts, exclusion)
+        assert_allclose(actual.data, expected.data, rtol=1e-5)
+        assert (kbe._background_state is state) == incremental
+        assert_allclose(kbe._background_state["exclusion"], data)
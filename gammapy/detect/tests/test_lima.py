@@ -1,10 +1,17 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
 from numpy.testing import assert_allclose
 from astropy.convolution import Tophat2DKernel
 from ...utils.testing import requires_dependency, requires_data
-from ...detect import compute_lima_image, compute_lima_on_off_image
-from ...maps import Map
+from ...utils.random import get_random_state
+from ...detect import (
+    compute_lima_image,
+    compute_lima_on_off_image,
+    compute_lima_maps,
+    compute_lima_on_off_maps,
+)
+from ...maps import Map, MapAxis, WcsGeom
 
 
 @requires_dependency("scipy")
@@ -55,3 +62,38 @@ def test_compute_lima_on_off_image():
 
     # Set boundary to NaN in reference image
     assert_allclose(actual, desired, atol=1e-5)
+
+
+@requires_dependency("scipy")
+def test_compute_lima_maps():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(40, 30), binsz=0.02, axes=[axis])
+    random_state = get_random_state(0)
+
+    n_on = Map.from_geom(geom)
+    n_on.data = random_state.poisson(2, size=n_on.data.shape).astype(float)
+    n_off = Map.from_geom(geom)
+    n_off.data = random_state.poisson(10, size=n_off.data.shape).astype(float)
+    a_on = Map.from_geom(geom)
+    a_on.data += 1
+    a_off = Map.from_geom(geom)
+    a_off.data += 50
+    background = n_off.copy(data=n_off.data / 5)
+
+    radii = ["0.06 deg", "0.1 deg"]
+    results = compute_lima_maps(n_on, background, radii)
+    results_on_off = compute_lima_on_off_maps(n_on, n_off, a_on, a_off, radii)
+
+    for radius, result, result_on_off in zip([3, 5], results, results_on_off):
+        kernel = Tophat2DKernel(radius)
+
+        expected = compute_lima_image(n_on, background, kernel)
+        for name in ["significance", "counts", "background", "excess"]:
+            assert result[name].data.shape == (2, 30, 40)
+            assert_allclose(result[name].data, expected[name].data, atol=1e-4)
+
+        expected = compute_lima_on_off_image(n_on, n_off, a_on, a_off, kernel)
+        for name in ["significance", "n_on", "background", "excess", "alpha"]:
+            assert_allclose(result_on_off[name].data, expected[name].data, atol=1e-4)
+
+    assert np.all(np.isfinite(results[1]["significance"].data))
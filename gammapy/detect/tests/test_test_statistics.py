@@ -1,11 +1,16 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
+import astropy.units as u
 from astropy.convolution import Gaussian2DKernel
 from ...utils.testing import requires_data
-from ...maps import Map
-from ...detect import TSMapEstimator
+from ...utils.random import get_random_state
+from ...maps import Map, MapAxis, WcsGeom
+from ...cube import PSFKernel
+from ...utils.parallel import SharedArrayPool
+from ...detect import TSMapEstimator, TSCubeEstimator
 
 pytest.importorskip("scipy")
 
@@ -22,6 +27,25 @@ def input_maps():
     }
 
 
+@pytest.fixture(scope="session")
+def simulated_maps():
+    geom = WcsGeom.create(npix=40, binsz=0.02)
+
+    background = Map.from_geom(geom)
+    background.data += 1.
+
+    exposure = Map.from_geom(geom, unit="cm2 s")
+    exposure.data += 1e11
+
+    x, y = np.indices(background.data.shape) - 19.5
+    source = np.exp(-0.5 * (x ** 2 + y ** 2) / 5 ** 2) / (2 * np.pi * 5 ** 2)
+    npred = background.data + 1e-9 * exposure.data * source
+
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(0).poisson(npred).astype(float)
+    return {"counts": counts, "exposure": exposure, "background": background}
+
+
 @requires_data("gammapy-extra")
 def test_compute_ts_map(input_maps):
     """Minimal test of compute_ts_image"""
@@ -64,3 +88,172 @@ def test_large_kernel(input_maps):
     with pytest.raises(ValueError) as err:
         ts_estimator.run(input_maps, kernel=kernel)
         assert "Kernel shape larger" in str(err.value)
+
+
+def test_compute_ts_map_vectorized(simulated_maps):
+    kernel = Gaussian2DKernel(3)
+
+    ts_estimator = TSMapEstimator(method="root brentq", n_jobs=1)
+    expected = ts_estimator.run(simulated_maps, kernel=kernel)
+
+    ts_estimator = TSMapEstimator(method="root vectorized")
+    result = ts_estimator.run(simulated_maps, kernel=kernel)
+
+    mask = np.isfinite(expected["ts"].data)
+    assert_allclose(mask, np.isfinite(result["ts"].data))
+
+    for name in ["ts", "flux", "flux_err", "flux_ul"]:
+        assert_allclose(
+            result[name].data[mask], expected[name].data[mask], rtol=1e-2, atol=1e-3
+        )
+
+
+def test_compute_ts_map_pool(simulated_maps):
+    ts_estimator = TSMapEstimator(method="root brentq", n_jobs=1)
+    expected = ts_estimator.run(dict(simulated_maps), kernel=Gaussian2DKernel(3))
+
+    with SharedArrayPool(n_jobs=2) as pool:
+        for _ in range(2):
+            result = ts_estimator.run(
+                dict(simulated_maps), kernel=Gaussian2DKernel(3), pool=pool
+            )
+            assert_allclose(result["ts"].data, expected["ts"].data)
+        # the worker processes are reused between calls
+        workers = pool._pool
+        ts_estimator.run(dict(simulated_maps), kernel=Gaussian2DKernel(3), pool=pool)
+        assert pool._pool is workers
+
+
+def test_compute_ts_map_coarse_to_fine(simulated_maps):
+    ts_estimator = TSMapEstimator(method="root brentq", n_jobs=1)
+    expected = ts_estimator.run(dict(simulated_maps), kernel=Gaussian2DKernel(3))
+
+    result = ts_estimator.run_coarse_to_fine(
+        simulated_maps,
+        kernel=Gaussian2DKernel(3),
+        kernel_coarse=Gaussian2DKernel(1.5),
+        downsampling_factor=2,
+        threshold=25,
+    )
+
+    with np.errstate(invalid="ignore"):
+        mask = expected["ts"].data > 25
+    assert mask.sum() > 0
+
+    for name in ["ts", "sqrt_ts", "flux", "flux_err", "flux_ul", "niter"]:
+        assert_allclose(result[name].data[mask], expected[name].data[mask])
+
+
+def test_compute_ts_cube():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=30, binsz=0.02, axes=[axis])
+    psf_kernel = PSFKernel.from_gauss(geom, sigma="0.06 deg", max_radius="0.1 deg")
+
+    background = Map.from_geom(geom)
+    background.data += 1.
+
+    exposure = Map.from_geom(geom, unit="m2 s")
+    exposure.data += 1e7
+
+    # point source with 1e-9 cm-2 s-1 total flux and power law index 2
+    weights = np.array([10. / 11, 1. / 11])
+    source = Map.from_geom(geom)
+    source.data[:, 15, 15] = 1e-9 * 1e11 * weights
+    source = source.convolve(psf_kernel)
+
+    # expected counts without noise, the flux is recovered up to the solver precision
+    counts = Map.from_geom(geom)
+    counts.data = background.data + source.data
+    maps = {"counts": counts, "exposure": exposure, "background": background}
+
+    estimator = TSCubeEstimator()
+    assert_allclose(estimator.spectral_weights(geom), weights)
+
+    result = estimator.run(maps, psf_kernel)
+
+    assert result["ts"].data.shape == (30, 30)
+    assert result["flux"].unit == u.Unit("cm-2 s-1")
+    assert np.isnan(result["ts"].data[0, 0])
+
+    idx = np.nanargmax(result["ts"].data)
+    assert np.unravel_index(idx, (30, 30)) == (15, 15)
+    assert result["ts"].data[15, 15] > 25
+    assert_allclose(result["flux"].data[15, 15], 1e-9, rtol=1e-2)
+    assert np.isfinite(result["flux_err"].data[15, 15])
+    assert result["flux_ul"].data[15, 15] > result["flux"].data[15, 15]
+
+
+def test_compute_ts_cube_single_bin():
+    axis = MapAxis.from_edges([1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=30, binsz=0.02, axes=[axis])
+    psf_kernel = PSFKernel.from_gauss(geom, sigma="0.06 deg", max_radius="0.1 deg")
+
+    background = Map.from_geom(geom)
+    background.data += 1.
+
+    exposure = Map.from_geom(geom, unit="cm2 s")
+    exposure.data += 1e11
+
+    npred = background.data.copy()
+    npred[:, 15, 15] += 100
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(0).poisson(npred).astype(float)
+    maps = {"counts": counts, "exposure": exposure, "background": background}
+
+    result = TSCubeEstimator().run(maps, psf_kernel)
+
+    maps_image = {name: m.sum_over_axes() for name, m in maps.items()}
+    estimator = TSMapEstimator(method="root vectorized")
+    expected = estimator.run(maps_image, kernel=psf_kernel.data[0].astype(float))
+
+    mask = np.isfinite(expected["ts"].data)
+    assert_allclose(mask, np.isfinite(result["ts"].data))
+
+    assert_allclose(result["ts"].data[mask], expected["ts"].data[mask], atol=1e-3)
+    for name in ["flux", "flux_err", "flux_ul"]:
+        assert_allclose(
+            result[name].data[mask], expected[name].data[mask], rtol=1e-3, atol=1e-14
+        )
+
+
+def test_compute_ts_cube_which():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=30, binsz=0.02, axes=[axis])
+    psf_kernel = PSFKernel.from_gauss(geom, sigma="0.06 deg", max_radius="0.1 deg")
+
+    background = Map.from_geom(geom)
+    background.data += 1.
+    exposure = Map.from_geom(geom, unit="cm2 s")
+    exposure.data += 1e11
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(0).poisson(background.data).astype(float)
+    maps = {"counts": counts, "exposure": exposure, "background": background}
+
+    estimator = TSCubeEstimator()
+    expected = estimator.run(maps, psf_kernel)
+
+    result = estimator.run(maps, psf_kernel, which=["sqrt_ts", "flux_ul"])
+    assert set(result) == {"sqrt_ts", "flux_ul"}
+    for name in ["sqrt_ts", "flux_ul"]:
+        assert_allclose(result[name].data, expected[name].data)
+    assert np.isfinite(result["flux_ul"].data[15, 15])
+
+
+def test_compute_ts_cube_invalid_method():
+    with pytest.raises(ValueError):
+        TSCubeEstimator(error_method="covariance")
+
+    with pytest.raises(ValueError):
+        TSCubeEstimator(ul_method="confidence")
+
+
+def test_compute_ts_cube_invalid_kernel():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=30, binsz=0.02, axes=[axis])
+    maps = {name: Map.from_geom(geom) for name in ["counts", "exposure", "background"]}
+
+    geom_kernel = WcsGeom.create(npix=30, binsz=0.02, axes=[axis.slice(slice(0, 1))])
+    psf_kernel = PSFKernel.from_gauss(geom_kernel, sigma="0.06 deg")
+
+    with pytest.raises(ValueError):
+        TSCubeEstimator().run(maps, psf_kernel)
@@ -7,7 +7,7 @@ import numpy as np
 from astropy.coordinates import Angle
 from astropy.convolution import Gaussian2DKernel, Tophat2DKernel
 from ..stats import significance
-from .utils import scale_cube
+from .utils import _fftconvolve_wrap
 
 __all__ = ["ASmooth"]
 
@@ -95,6 +95,14 @@ class ASmooth(object):
         """
         Run image smoothing.
 
+        The scales are processed one at a time, from the smallest to the
+        largest. Every pixel is assigned the smallest scale for which its
+        significance exceeds the threshold, so only the current smoothed
+        images and the output images are kept in memory.
+
+        Maps with non-spatial axes (e.g. energy) are smoothed plane by plane,
+        every plane with its own scale selection.
+
         Parameters
         ----------
         counts : `~gammapy.maps.WcsNDMap`
@@ -116,83 +124,82 @@ class ASmooth(object):
         """
         from ..maps import WcsNDMap
 
-        pixel_scale = counts.geom.pixel_scales.mean()
-        kernels = self.kernels(pixel_scale)
-
-        cubes = {}
-        cubes["counts"] = scale_cube(counts.data, kernels)
-
-        if background is not None:
-            cubes["background"] = scale_cube(background.data, kernels)
-        else:
+        if background is None:
             # TODO: Estimate background with asmooth method
             raise ValueError("Background estimation required.")
 
-        if exposure is not None:
-            flux = (counts.data - background.data) / exposure.data
-            cubes["flux"] = scale_cube(flux, kernels)
+        pixel_scale = counts.geom.pixel_scales.mean()
+        kernels = self.kernels(pixel_scale)
 
-        cubes["significance"] = self._significance_cube(
-            cubes, method=self.parameters["method"]
-        )
+        data = {"counts": counts.data, "background": background.data}
+        if exposure is not None:
+            data["flux"] = (counts.data - background.data) / exposure.data
 
-        smoothed = self._reduce_cubes(cubes, kernels)
+        smoothed = self._smooth_scales(data, kernels)
 
         result = {}
-
-        for key in ["counts", "background", "scale", "significance"]:
-            data = smoothed[key]
+        for key in ["counts", "background", "scale", "significance", "flux"]:
+            if key not in smoothed:
+                continue
 
             # set remaining pixels with significance < threshold to mean value
-            if key in ["counts", "background"]:
-                mask = np.isnan(data)
-                data[mask] = np.mean(locals()[key].data[mask])
-            result[key] = WcsNDMap(counts.geom, data)
+            if key in data:
+                self._fill_mean(smoothed[key], data[key])
 
-        if exposure is not None:
-            data = smoothed["flux"]
-            mask = np.isnan(data)
-            data[mask] = np.mean(flux[mask])
-            result["flux"] = WcsNDMap(counts.geom, data)
+            result[key] = WcsNDMap(counts.geom, smoothed[key])
 
         return result
 
-    def _reduce_cubes(self, cubes, kernels):
-        """
-        Combine scale cube to image.
+    def _smooth_scales(self, data, kernels):
+        """Select the smallest significant scale for every pixel.
 
         Parameters
         ----------
-        cubes : dict
-            Data cubes
+        data : dict of `~numpy.ndarray`
+            Counts, background and optionally flux data.
+        kernels : list
+            List of `~astropy.convolution.Kernel`
+
+        Returns
+        -------
+        smoothed : dict of `~numpy.ndarray`
+            Smoothed data, scale and significance. Pixels that are not
+            significant on any scale are NaN.
         """
         p = self.parameters
-        shape = cubes["counts"].shape[:2]
-        smoothed = {}
+        shape = data["counts"].shape
 
         # Init smoothed data arrays
-        for key in ["counts", "background", "scale", "significance", "flux"]:
-            smoothed[key] = np.tile(np.nan, shape)
+        smoothed = {}
+        for key in list(data) + ["scale", "significance"]:
+            smoothed[key] = np.full(shape, np.nan)
 
-        for idx, scale in enumerate(p["scales"]):
-            # slice out 2D image at index idx out of cube
-            slice_ = np.s_[:, :, idx]
+        for scale, kernel in zip(p["scales"], kernels):
+            images = {key: _fftconvolve_wrap(kernel, val) for key, val in data.items()}
+            significance_ = self._significance_cube(images, method=p["method"])
 
             mask = np.isnan(smoothed["counts"])
-            mask = (cubes["significance"][slice_] > p["threshold"]) & mask
+            mask &= significance_ > p["threshold"]
 
             smoothed["scale"][mask] = scale
-            smoothed["significance"][mask] = cubes["significance"][slice_][mask]
+            smoothed["significance"][mask] = significance_[mask]
 
             # renormalize smoothed data arrays
-            norm = kernels[idx].array.sum()
-            for key in ["counts", "background"]:
-                smoothed[key][mask] = cubes[key][slice_][mask] / norm
-            if "flux" in cubes:
-                smoothed["flux"][mask] = cubes["flux"][slice_][mask] / norm
+            norm = kernel.array.sum()
+            for key in data:
+                smoothed[key][mask] = images[key][mask] / norm
 
         return smoothed
 
+    @staticmethod
+    def _fill_mean(smoothed, data):
+        """Set NaN pixels to the mean of the input data there, per image plane."""
+        smoothed_planes = smoothed.reshape((-1,) + smoothed.shape[-2:])
+        data_planes = data.reshape((-1,) + data.shape[-2:])
+        for smoothed_plane, data_plane in zip(smoothed_planes, data_planes):
+            mask = np.isnan(smoothed_plane)
+            smoothed_plane[mask] = np.mean(data_plane[mask])
+
     @staticmethod
     def make_scales(n_scales, factor=np.sqrt(2), kernel=Gaussian2DKernel):
         """Create list of Gaussian widths."""
@@ -51,6 +51,37 @@ class SkySpatialModel(object):
 
         return self.evaluate(lon, lat, **kwargs)
 
+    def gradient(self, lon, lat):
+        """Evaluate the derivatives of the model with respect to its parameters.
+
+        Models that provide an analytical gradient implement an
+        ``evaluate_gradient`` method with the same signature as ``evaluate``,
+        returning one derivative per parameter in parameter order.
+
+        Returns
+        -------
+        gradient : list of `~astropy.units.Quantity` or None
+            Derivatives with respect to each parameter, ``None`` if the model
+            has no analytical gradient.
+        """
+        if not hasattr(self, "evaluate_gradient"):
+            return None
+
+        kwargs = dict()
+        for par in self.parameters.parameters:
+            kwargs[par.name] = par.quantity
+
+        return self.evaluate_gradient(lon, lat, **kwargs)
+
+    @property
+    def evaluation_radius(self):
+        """Radius around ``(lon_0, lat_0)`` outside of which the model is zero
+        or negligible (`~astropy.coordinates.Angle`).
+
+        ``None`` means the model has to be evaluated on the full map.
+        """
+        return None
+
     def copy(self):
         """A deep copy."""
         return copy.deepcopy(self)
@@ -95,6 +126,15 @@ class SkyPointSource(SkySpatialModel):
         val = lon_val * lat_val
         return val.to("sr-1")
 
+    @property
+    def evaluation_radius(self):
+        """Evaluation radius (`~astropy.coordinates.Angle`).
+
+        Set to zero, the point source only contributes to the pixels next
+        to its position.
+        """
+        return Angle(0, "deg")
+
 
 class SkyGaussian(SkySpatialModel):
     r"""Two-dimensional symmetric Gaussian model.
@@ -138,6 +178,41 @@ class SkyGaussian(SkySpatialModel):
 
         return val * u.Unit("sr-1")
 
+    @staticmethod
+    def evaluate_gradient(lon, lat, lon_0, lat_0, sigma):
+        """Evaluate the gradient of the model (static function)."""
+        sep = angular_separation(lon, lat, lon_0, lat_0)
+        sep = sep.to("rad").value
+        sigma = sigma.to("rad").value
+        lon, lat = lon.to("rad").value, lat.to("rad").value
+        lon_0, lat_0 = lon_0.to("rad").value, lat_0.to("rad").value
+
+        norm = 1 / (2 * np.pi * sigma ** 2)
+        val = norm * np.exp(-0.5 * (sep / sigma) ** 2)
+
+        # derivative of the separation, sep / sin(sep) goes to one at sep = 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sep_factor = np.where(sep > 0, sep / np.sin(sep), 1.)
+
+        factor = val * sep_factor / sigma ** 2
+        d_lon_0 = factor * np.cos(lat) * np.cos(lat_0) * np.sin(lon - lon_0)
+        d_lat_0 = factor * (
+            np.sin(lat) * np.cos(lat_0)
+            - np.cos(lat) * np.sin(lat_0) * np.cos(lon - lon_0)
+        )
+        d_sigma = val * (sep ** 2 / sigma ** 3 - 2 / sigma)
+
+        unit = u.Unit("sr-1 rad-1")
+        return [d_lon_0 * unit, d_lat_0 * unit, d_sigma * unit]
+
+    @property
+    def evaluation_radius(self):
+        r"""Evaluation radius (`~astropy.coordinates.Angle`).
+
+        Set as :math:`5\sigma`.
+        """
+        return 5 * Angle(self.parameters["sigma"].quantity)
+
 
 class SkyDisk(SkySpatialModel):
     r"""Constant radial disk model.
@@ -183,6 +258,14 @@ class SkyDisk(SkySpatialModel):
 
         return val * u.Unit("sr-1")
 
+    @property
+    def evaluation_radius(self):
+        r"""Evaluation radius (`~astropy.coordinates.Angle`).
+
+        Set to the disk radius :math:`r_0`.
+        """
+        return Angle(self.parameters["r_0"].quantity)
+
 
 class SkyShell(SkySpatialModel):
     r"""Shell model
@@ -242,6 +325,16 @@ class SkyShell(SkySpatialModel):
 
         return norm * val * u.Unit("sr-1")
 
+    @property
+    def evaluation_radius(self):
+        r"""Evaluation radius (`~astropy.coordinates.Angle`).
+
+        Set to the outer radius :math:`r_{out}`.
+        """
+        radius = self.parameters["radius"].quantity
+        width = self.parameters["width"].quantity
+        return Angle(radius + width)
+
 
 class SkyDiffuseConstant(SkySpatialModel):
     """Spatially constant (isotropic) spatial model.
@@ -259,6 +352,10 @@ class SkyDiffuseConstant(SkySpatialModel):
     def evaluate(lon, lat, value):
         return value
 
+    @staticmethod
+    def evaluate_gradient(lon, lat, value):
+        return [u.Quantity(np.ones(np.shape(lon)))]
+
 
 class SkyDiffuseMap(SkySpatialModel):
     """Spatial sky map template model (2D).
@@ -332,3 +429,7 @@ class SkyDiffuseMap(SkySpatialModel):
         coord = {"lon": lon.to("deg").value, "lat": lat.to("deg").value}
         val = self.map.interp_by_coord(coord, **self._interp_kwargs)
         return u.Quantity(norm.value * val, self.map.unit, copy=False)
+
+    def evaluate_gradient(self, lon, lat, norm):
+        """Evaluate the gradient of the model."""
+        return [self.evaluate(lon, lat, norm=u.Quantity(1))]
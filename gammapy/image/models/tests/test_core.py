@@ -21,6 +21,7 @@ def test_sky_point_source():
     val = model(lon, lat)
     assert val.unit == "sr-1"
     assert_allclose(val.sum().value, 3282.80635)
+    assert_allclose(model.evaluation_radius.deg, 0)
 
 
 def test_sky_gaussian():
@@ -30,6 +31,7 @@ def test_sky_gaussian():
     val = model(lon, lat)
     assert val.unit == "sr-1"
     assert_allclose(val.value, [316.8970202, 118.6505303])
+    assert_allclose(model.evaluation_radius.deg, 5)
 
 
 def test_sky_disk():
@@ -40,6 +42,7 @@ def test_sky_disk():
     assert val.unit == "sr-1"
     desired = [261.263956, 0, 261.263956]
     assert_allclose(val.value, desired)
+    assert_allclose(model.evaluation_radius.deg, 2)
 
 
 def test_sky_shell():
@@ -51,6 +54,7 @@ def test_sky_shell():
     assert val.unit == "sr-1"
     desired = [55.979449, 57.831651, 94.919895]
     assert_allclose(val.value, desired)
+    assert_allclose(model.evaluation_radius.deg, 4)
 
 
 def test_sky_diffuse_constant():
@@ -60,6 +64,7 @@ def test_sky_diffuse_constant():
     val = model(lon, lat)
     assert val.unit == "sr-1"
     assert_allclose(val.value, 42)
+    assert model.evaluation_radius is None
 
 
 @requires_dependency("scipy")
@@ -92,3 +97,21 @@ def test_sky_diffuse_map_normalize():
     assert vals.unit == ""
     integral = vals.sum()
     assert_allclose(integral.value, 1, rtol=1e-4)
+
+
+def test_sky_gaussian_gradient():
+    model = SkyGaussian(lon_0="1 deg", lat_0="45 deg", sigma="1 deg")
+    lon = [1.5, 2, 359] * u.deg
+    lat = [45.5, 46, 44] * u.deg
+    gradient = model.gradient(lon, lat)
+
+    for par, value in zip(model.parameters.parameters, gradient):
+        par_value = par.value
+        eps = 1e-6
+        par.value = par_value + eps
+        val_up = model(lon, lat)
+        par.value = par_value - eps
+        val_lo = model(lon, lat)
+        par.value = par_value
+        expected = (val_up - val_lo) / (2 * eps * par.unit)
+        assert_allclose(value.to(expected.unit).value, expected.value, rtol=1e-5)
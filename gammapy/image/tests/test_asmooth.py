@@ -6,7 +6,8 @@ import astropy.units as u
 from astropy.convolution import Gaussian2DKernel
 from ...utils.testing import requires_data, requires_dependency
 from ...utils.scripts import make_path
-from ...maps import Map
+from ...utils.random import get_random_state
+from ...maps import Map, MapAxis, WcsGeom
 from ..asmooth import ASmooth
 
 
@@ -33,3 +34,34 @@ def test_asmooth():
     for name in smoothed:
         actual = smoothed[name].data[100, 100]
         assert_allclose(actual, desired[name])
+
+
+@requires_dependency("scipy")
+def test_asmooth_cube():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(40, 30), binsz=0.1, axes=[axis])
+
+    background = Map.from_geom(geom)
+    background.data += [[[1.]], [[0.2]]]
+    counts = Map.from_geom(geom)
+    counts.data = get_random_state(0).poisson(background.data + 0.)
+    counts.data[:, 15, 20] += [30, 10]
+
+    exposure = Map.from_geom(geom)
+    exposure.data += 1e10
+
+    scales = ASmooth.make_scales(5) * 0.2 * u.deg
+    asmooth = ASmooth(scales=scales, method="lima", threshold=3)
+    result = asmooth.run(counts, background, exposure)
+
+    for idx in range(2):
+        images = [
+            _.get_image_by_idx((idx,)) for _ in [counts, background, exposure]
+        ]
+        expected = asmooth.run(*images)
+
+        for name in ["counts", "background", "flux", "scale", "significance"]:
+            actual = result[name].data[idx]
+            assert_allclose(actual, expected[name].data, rtol=1e-10)
+
+    assert np.isfinite(result["scale"].data[:, 15, 20]).all()
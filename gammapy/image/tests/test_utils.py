@@ -0,0 +1,25 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose
+from astropy.convolution import Gaussian2DKernel, Tophat2DKernel
+from ...utils.testing import requires_dependency
+from ..utils import scale_cube
+
+
+@requires_dependency("scipy")
+def test_scale_cube():
+    data = np.zeros((3, 21, 21))
+    data[:, 10, 10] = [1, 2, 3]
+    kernels = [Gaussian2DKernel(1), Tophat2DKernel(2)]
+
+    cube = scale_cube(data, kernels, parallel=False)
+    assert cube.shape == (3, 21, 21, 2)
+
+    # the energy axis is not convolved
+    assert_allclose(cube.sum(axis=(1, 2)), [[1, 1], [2, 2], [3, 3]], rtol=1e-3)
+
+    # each plane agrees with the 2D result
+    cube_2d = scale_cube(data[1], kernels, parallel=False)
+    assert cube_2d.shape == (21, 21, 2)
+    assert_allclose(cube[1], cube_2d)
@@ -2,10 +2,9 @@
 """Image utility functions"""
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
-from multiprocessing import Pool
-from functools import partial
 import numpy as np
 from astropy.convolution import Gaussian2DKernel
+from ..utils.parallel import SharedArrayPool
 
 __all__ = ["scale_cube"]
 
@@ -16,14 +15,18 @@ def _fftconvolve_wrap(kernel, data):
     from scipy.signal import fftconvolve
     from scipy.ndimage.filters import gaussian_filter
 
+    # non-spatial axes of the data are not convolved
+    n_extra = data.ndim - 2
+
     # wrap gaussian filter as a special case, because the gain in
     # performance is factor ~100
     if isinstance(kernel, Gaussian2DKernel):
         width = kernel.model.x_stddev.value
         norm = kernel.array.sum()
-        return norm * gaussian_filter(data, width)
+        return norm * gaussian_filter(data, (0,) * n_extra + (width, width))
     else:
-        return fftconvolve(data, kernel.array, mode="same")
+        array = kernel.array.reshape((1,) * n_extra + kernel.array.shape)
+        return fftconvolve(data, array, mode="same")
 
 
 def scale_cube(data, kernels, parallel=True):
@@ -31,29 +34,30 @@ def scale_cube(data, kernels, parallel=True):
     Compute scale space cube.
 
     Compute scale space cube by convolving the data with a set of kernels and
-    stack the resulting images along the third axis.
+    stack the results along a new last axis. Only the last two (spatial) axes
+    of the data are convolved, additional leading axes such as an energy axis
+    are kept.
 
     Parameters
     ----------
     data : `~numpy.ndarray`
-        Input data.
+        Input data, with the spatial axes last.
     kernels: list of `~astropy.convolution.Kernel`
         List of convolution kernels.
     parallel : bool
-        Whether to use multiprocessing.
+        Whether to use multiprocessing. The data is shared with the worker
+        processes, see `~gammapy.utils.parallel.SharedArrayPool`.
 
     Returns
     -------
     cube : `~numpy.ndarray`
-        Array of the shape (len(kernels), data.shape)
+        Array of the shape ``data.shape + (len(kernels),)``
     """
-    wrap = partial(_fftconvolve_wrap, data=data)
+    arrays = {"data": data}
 
     if parallel:
-        pool = Pool()
-        result = pool.map(wrap, kernels)
-        pool.close()
-        pool.join()
+        with SharedArrayPool() as pool:
+            result = pool.map(_fftconvolve_wrap, kernels, arrays=arrays)
     else:
-        result = map(wrap, kernels)
-    return np.dstack(result)
+        result = [_fftconvolve_wrap(kernel, **arrays) for kernel in kernels]
+    return np.stack(result, axis=-1)
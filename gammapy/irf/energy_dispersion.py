@@ -77,6 +77,7 @@ class EnergyDispersion(object):
         ]
         self.data = NDDataArray(axes=axes, data=data, interp_kwargs=interp_kwargs)
         self.meta = OrderedDict(meta) if meta else OrderedDict()
+        self._banded_matrices = {}
 
     def __str__(self):
         ss = self.__class__.__name__
@@ -106,7 +107,39 @@ class EnergyDispersion(object):
                     len(data), self.e_true.nbins
                 )
             )
-        return np.dot(data, self.data.data)
+
+        matrix = self.get_banded_matrix()
+        unit = self.data.data.unit
+        if isinstance(data, Quantity):
+            unit = data.unit * unit
+            data = data.value
+        return Quantity(matrix.dot(data), unit, copy=False)
+
+    def get_banded_matrix(self, pdf_threshold=0):
+        """Compressed representation of the transposed PDF matrix.
+
+        Only the band of true energy bins with PDF values above
+        ``pdf_threshold`` is stored for every reconstructed energy bin, which
+        makes applying the energy dispersion much cheaper than the dense matrix
+        product. The result is cached per threshold.
+
+        Parameters
+        ----------
+        pdf_threshold : float
+            PDF values smaller or equal to this threshold are set to zero.
+
+        Returns
+        -------
+        matrix : `~gammapy.irf.energy_dispersion.BandedMatrix`
+            Matrix of shape ``(n_reco, n_true)``.
+        """
+        data = self.data.data
+        cached = self._banded_matrices.get(pdf_threshold)
+        if cached is None or cached[0] is not data:
+            matrix = BandedMatrix.from_dense(data.value.T, pdf_threshold)
+            cached = (data, matrix)
+            self._banded_matrices[pdf_threshold] = cached
+        return cached[1]
 
     @property
     def e_reco(self):
@@ -610,6 +643,145 @@ class EnergyDispersion(object):
         plt.tight_layout()
 
 
+class BandedMatrix(object):
+    """Banded sparse matrix, applied along the first axis of arrays.
+
+    For every row only the range of columns ``[lo, hi)`` between the first and
+    the last non-zero value is stored. This is well suited for energy
+    dispersion matrices, where each reconstructed energy bin only receives
+    contributions from a limited range of true energy bins.
+
+    Use `from_dense` to create it.
+
+    Parameters
+    ----------
+    shape : tuple
+        Matrix shape ``(n_rows, n_columns)``.
+    lo, hi : `~numpy.ndarray`
+        Column range stored for every row.
+    bands : list of `~numpy.ndarray`
+        Matrix values in the column range of every row.
+    """
+
+    def __init__(self, shape, lo, hi, bands):
+        self.shape = tuple(shape)
+        self.lo = lo
+        self.hi = hi
+        self.bands = bands
+
+        # flat list of stored elements, used for one dimensional data
+        ranges = list(zip(lo, hi))
+        rows = [
+            np.full(hi_ - lo_, idx, dtype=int) for idx, (lo_, hi_) in enumerate(ranges)
+        ]
+        cols = [np.arange(lo_, hi_) for lo_, hi_ in ranges]
+        self._rows = np.concatenate(rows + [np.zeros(0, dtype=int)])
+        self._cols = np.concatenate(cols + [np.zeros(0, dtype=int)])
+        self._values = np.concatenate(list(bands) + [np.zeros(0)])
+
+    @classmethod
+    def from_dense(cls, matrix, threshold=0):
+        """Create from a dense matrix.
+
+        Parameters
+        ----------
+        matrix : `~numpy.ndarray`
+            Dense matrix
+        threshold : float
+            Values smaller or equal to the threshold are dropped.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        matrix = np.where(matrix > threshold, matrix, 0)
+
+        nonzero = matrix != 0
+        has_values = nonzero.any(axis=1)
+        lo = np.where(has_values, nonzero.argmax(axis=1), 0)
+        hi = np.where(has_values, matrix.shape[1] - nonzero[:, ::-1].argmax(axis=1), 0)
+        bands = [
+            np.ascontiguousarray(row[lo_:hi_]) for row, lo_, hi_ in zip(matrix, lo, hi)
+        ]
+        return cls(matrix.shape, lo, hi, bands)
+
+    @property
+    def nnz(self):
+        """Number of stored values (int)."""
+        return len(self._values)
+
+    def to_dense(self):
+        """Convert to a dense matrix (`~numpy.ndarray`)."""
+        matrix = np.zeros(self.shape)
+        matrix[self._rows, self._cols] = self._values
+        return matrix
+
+    def dot(self, data, out=None):
+        """Matrix product with ``data`` along its first axis.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data of shape ``(n_columns, ...)``.
+        out : `~numpy.ndarray`, optional
+            C-contiguous ``float64`` output array of shape ``(n_rows, ...)``.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Result of shape ``(n_rows, ...)``.
+        """
+        data = np.asanyarray(data, dtype=np.float64)
+        n_rows = self.shape[0]
+
+        if data.ndim == 1:
+            weights = self._values * data[self._cols]
+            result = np.bincount(self._rows, weights=weights, minlength=n_rows)
+            if out is None:
+                return result
+            out[...] = result
+            return out
+
+        if out is None:
+            out = np.empty((n_rows,) + data.shape[1:], dtype=np.float64)
+
+        data_2d = data.reshape(data.shape[0], -1)
+        out_2d = out.reshape(n_rows, -1)
+        for idx in range(n_rows):
+            lo, hi = self.lo[idx], self.hi[idx]
+            if hi > lo:
+                np.dot(self.bands[idx], data_2d[lo:hi], out=out_2d[idx])
+            else:
+                out_2d[idx] = 0
+        return out
+
+    def dot_transposed(self, data):
+        """Product of the transposed matrix with ``data`` along its first axis.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data of shape ``(n_rows, ...)``.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Result of shape ``(n_columns, ...)``.
+        """
+        data = np.asanyarray(data, dtype=np.float64)
+        n_cols = self.shape[1]
+
+        if data.ndim == 1:
+            weights = self._values * data[self._rows]
+            return np.bincount(self._cols, weights=weights, minlength=n_cols)
+
+        out = np.zeros((n_cols,) + data.shape[1:], dtype=np.float64)
+        data_2d = data.reshape(data.shape[0], -1)
+        out_2d = out.reshape(n_cols, -1)
+        for idx in range(self.shape[0]):
+            lo, hi = self.lo[idx], self.hi[idx]
+            if hi > lo:
+                out_2d[lo:hi] += np.outer(self.bands[idx], data_2d[idx])
+        return out
+
+
 class EnergyDispersion2D(object):
     """Offset-dependent energy dispersion matrix.
 
@@ -55,14 +55,46 @@ class TestEnergyDispersion:
     def test_apply(self):
         counts = np.arange(len(self.e_true) - 1)
         actual = self.edisp.apply(counts)
+        assert isinstance(actual, u.Quantity)
+        assert actual.unit == ""
         assert_allclose(actual[0], 1.8612999017723058, atol=1e-3)
 
+        actual = self.edisp.apply(counts * u.ct)
+        assert actual.unit == "ct"
+
         counts = np.arange(len(self.e_true) - 4)
         with pytest.raises(ValueError) as exc:
             self.edisp.apply(counts)
         assert str(len(counts)) in str(exc.value)
         assert_allclose(actual[0], 1.8612999017723058, atol=1e-3)
 
+    def test_get_banded_matrix(self):
+        matrix = self.edisp.get_banded_matrix()
+        assert matrix.shape == (100, 100)
+        assert matrix.nnz < 0.5 * 100 * 100
+        assert_allclose(matrix.to_dense(), self.edisp.pdf_matrix.T)
+        assert self.edisp.get_banded_matrix() is matrix
+
+        truncated = self.edisp.get_banded_matrix(pdf_threshold=1e-3)
+        assert truncated.nnz < matrix.nnz
+
+        counts = np.arange(100.)
+        assert_allclose(matrix.dot(counts), np.dot(counts, self.edisp.pdf_matrix))
+
+        weights = np.linspace(-1, 1, 100)
+        assert_allclose(
+            matrix.dot_transposed(weights), np.dot(self.edisp.pdf_matrix, weights)
+        )
+
+        cube = np.random.RandomState(0).uniform(size=(100, 3, 4))
+        desired = np.einsum("ij,ikl->jkl", self.edisp.pdf_matrix, cube)
+        out = np.empty((100, 3, 4))
+        matrix.dot(cube, out=out)
+        assert_allclose(out, desired)
+
+        desired = np.einsum("ij,jkl->ikl", self.edisp.pdf_matrix, cube)
+        assert_allclose(matrix.dot_transposed(cube), desired)
+
     def test_get_bias(self):
         bias = self.edisp.get_bias(3.34 * u.TeV)
         assert_allclose(bias, self.bias, atol=1e-2)
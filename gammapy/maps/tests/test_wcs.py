@@ -296,3 +296,23 @@ def test_get_axis_index_by_name():
     assert geom.get_axis_index_by_name("Energy") == 0
     with pytest.raises(ValueError):
         geom.get_axis_index_by_name("time")
+
+
+@pytest.mark.parametrize("mode", ["trim", "partial"])
+def test_wcsgeom_cutout(mode):
+    axis = MapAxis.from_edges([1, 5, 10], name="energy")
+    geom = WcsGeom.create(
+        npix=(10, 8), binsz=1, proj="CAR", coordsys="GAL", axes=[axis]
+    )
+    position = SkyCoord(3.5, 2.5, unit="deg", frame="galactic")
+    cutout = geom.cutout(position=position, width=(4, 4) * u.deg, mode=mode)
+
+    parent_slices = cutout.cutout_info["parent-slices"]
+    cutout_slices = cutout.cutout_info["cutout-slices"]
+
+    # the parent and cutout pixels selected by the slices are identical
+    coord = geom.get_coord()
+    coord_cutout = cutout.get_coord()
+    assert coord.lon[parent_slices].size > 0
+    assert_allclose(coord.lon[parent_slices], coord_cutout.lon[cutout_slices])
+    assert_allclose(coord.lat[parent_slices], coord_cutout.lat[cutout_slices])
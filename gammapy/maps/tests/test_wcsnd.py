@@ -10,7 +10,7 @@ import astropy.units as u
 from ...utils.testing import requires_dependency, requires_data, mpl_plot_check
 from ...cube import PSFKernel
 from ...irf import EnergyDependentMultiGaussPSF
-from ..utils import fill_poisson
+from ..utils import fill_poisson, FFTMultiConvolver
 from ..geom import MapAxis, MapCoord, coordsys_to_frame
 from ..base import Map
 from ..wcs import WcsGeom
@@ -529,6 +529,61 @@ def test_convolve_pixel_scale_error():
         assert "Kernel shape larger" in str(err.value)
 
 
+@requires_dependency("scipy")
+def test_convolve_fft_cached():
+    from scipy.signal import fftconvolve
+
+    energy_axis = MapAxis.from_edges(np.logspace(-1., 1., 4), unit="TeV", name="energy")
+    geom = WcsGeom.create(binsz=0.1 * u.deg, width=(3, 2), axes=[energy_axis])
+    m = Map.from_geom(geom)
+    m.data = np.random.RandomState(0).uniform(size=m.data.shape)
+
+    kernel = PSFKernel.from_gauss(geom, sigma=0.2 * u.deg)
+    mc = m.convolve(kernel)
+
+    for idx in range(3):
+        desired = fftconvolve(m.data[idx], kernel.data[idx], mode="same")
+        assert_allclose(mc.data[idx], desired, rtol=1e-5, atol=1e-6)
+
+    assert kernel.get_convolver(m.data.shape) is kernel.get_convolver(m.data.shape)
+
+    mc2 = m.convolve(kernel)
+    assert_allclose(mc2.data, mc.data)
+
+    # the cache is cleared if the kernel changes
+    convolver = kernel.get_convolver(m.data.shape)
+    kernel.psf_kernel_map.data *= 2
+    assert kernel.get_convolver(m.data.shape) is not convolver
+    assert_allclose(m.convolve(kernel).data, 2 * mc.data, rtol=1e-5)
+
+
+@requires_dependency("scipy")
+def test_fft_multi_convolver():
+    from scipy.signal import fftconvolve
+
+    data = np.random.RandomState(0).uniform(size=(2, 20, 30))
+    kernels = [np.ones((3, 3)), np.ones((4, 6)), Gaussian2DKernel(2).array]
+
+    shape = [max(_.shape[axis] for _ in kernels) for axis in [0, 1]]
+    convolver = FFTMultiConvolver(data.shape, shape)
+    data_spectrum = convolver.data_spectrum(data)
+
+    for kernel in kernels:
+        kernel_spectrum = convolver.kernel_spectrum(kernel)
+        actual = convolver.convolve(data_spectrum, kernel_spectrum)
+        for idx in range(2):
+            desired = fftconvolve(data[idx], kernel, mode="same")
+            assert_allclose(actual[idx], desired, atol=1e-10)
+
+    out = np.empty(data.shape, dtype=np.float32)
+    result = convolver.convolve(data_spectrum, kernel_spectrum, out=out)
+    assert result is out
+    assert_allclose(out, actual, rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        convolver.kernel_spectrum(np.ones((30, 3)))
+
+
 @requires_dependency("matplotlib")
 def test_plot():
     m = WcsNDMap.create(binsz=0.1 * u.deg, width=1 * u.deg)
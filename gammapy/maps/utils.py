@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
 from astropy.io import fits
 from ..utils.random import get_random_state
 
@@ -136,3 +137,175 @@ def find_bintable_hdu(hdulist):
             return hdu
 
     raise AttributeError("No BinTable HDU found.")
+
+
+class FFTConvolver(object):
+    """Convolve stacks of images of a fixed shape with a fixed kernel.
+
+    The zero-padded Fourier transform of the kernel is computed once for the
+    given data shape, and all image planes are transformed in a single batched
+    real FFT. The padded input buffer is re-used between calls. The result is
+    the same as `scipy.signal.fftconvolve` with ``mode="same"`` applied to
+    every image plane.
+
+    Parameters
+    ----------
+    kernel : `~numpy.ndarray`
+        Kernel. A 2D kernel is applied to all image planes, a higher
+        dimensional kernel must match the non-spatial dimensions of the data.
+    shape : tuple
+        Shape of the data to convolve. The last two axes are the image axes.
+    """
+
+    def __init__(self, kernel, shape):
+        from scipy.fftpack import next_fast_len
+
+        kernel = np.asanyarray(kernel, dtype=np.float64)
+        self.shape = tuple(shape)
+
+        image_shape, kernel_shape = self.shape[-2:], kernel.shape[-2:]
+        if kernel.ndim > 2 and kernel.shape[:-2] != self.shape[:-2]:
+            raise ValueError(
+                "Kernel shape {} does not match data shape {}".format(
+                    kernel.shape, self.shape
+                )
+            )
+
+        self._fft_shape = tuple(
+            next_fast_len(n + k - 1) for n, k in zip(image_shape, kernel_shape)
+        )
+        self._slices = (Ellipsis,) + tuple(
+            slice((k - 1) // 2, (k - 1) // 2 + n)
+            for n, k in zip(image_shape, kernel_shape)
+        )
+        self._kernel_fft = np.fft.rfft2(kernel, self._fft_shape)
+        self._buffer = np.zeros(self.shape[:-2] + self._fft_shape)
+
+    def __call__(self, data, out=None):
+        """Convolve ``data``.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data with the shape given on init.
+        out : `~numpy.ndarray`, optional
+            Output array, may be ``data`` itself.
+
+        Returns
+        -------
+        out : `~numpy.ndarray`
+            Convolved data.
+        """
+        ny, nx = self.shape[-2:]
+        self._buffer[..., :ny, :nx] = data
+
+        spectrum = np.fft.rfft2(self._buffer)
+        spectrum *= self._kernel_fft
+        convolved = np.fft.irfft2(spectrum, self._fft_shape)
+
+        if out is None:
+            out = np.empty(self.shape, dtype=np.float64)
+        out[...] = convolved[self._slices]
+        return out
+
+
+class FFTMultiConvolver(object):
+    """Convolve data with many kernels, transforming the data only once.
+
+    All kernels are zero padded to ``kernel_shape``, keeping their centers
+    aligned, so the data are Fourier transformed once with a padding suitable
+    for the largest kernel and every convolution is one multiplication and one
+    inverse FFT. The result is the same as `scipy.signal.fftconvolve` with
+    ``mode="same"`` applied to every image plane.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the data to convolve. The last two axes are the image axes.
+    kernel_shape : tuple
+        Shape of the largest 2D kernel.
+    """
+
+    def __init__(self, shape, kernel_shape):
+        from scipy.fftpack import next_fast_len
+
+        self.shape = tuple(shape)
+        self.kernel_shape = tuple(kernel_shape)
+
+        image_shape = self.shape[-2:]
+        self._fft_shape = tuple(
+            next_fast_len(n + k - 1) for n, k in zip(image_shape, self.kernel_shape)
+        )
+        self._slices = (Ellipsis,) + tuple(
+            slice((k - 1) // 2, (k - 1) // 2 + n)
+            for n, k in zip(image_shape, self.kernel_shape)
+        )
+
+    def data_spectrum(self, data):
+        """Fourier transform of the zero padded data.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data with the shape given on init.
+
+        Returns
+        -------
+        spectrum : `~numpy.ndarray`
+            Data spectrum.
+        """
+        return np.fft.rfft2(data, self._fft_shape)
+
+    def kernel_spectrum(self, kernel):
+        """Fourier transform of a 2D kernel, centered in ``kernel_shape``.
+
+        Parameters
+        ----------
+        kernel : `~numpy.ndarray`
+            Kernel, not larger than ``kernel_shape``.
+
+        Returns
+        -------
+        spectrum : `~numpy.ndarray`
+            Kernel spectrum.
+        """
+        kernel = np.asanyarray(kernel, dtype=np.float64)
+        if any(k > size for k, size in zip(kernel.shape, self.kernel_shape)):
+            raise ValueError(
+                "Kernel shape {} exceeds {}".format(kernel.shape, self.kernel_shape)
+            )
+
+        padded = np.zeros(self._fft_shape)
+        oy, ox = [
+            (size - 1) // 2 - (k - 1) // 2
+            for size, k in zip(self.kernel_shape, kernel.shape)
+        ]
+        padded[oy : oy + kernel.shape[0], ox : ox + kernel.shape[1]] = kernel
+        return np.fft.rfft2(padded)
+
+    def convolve(self, data_spectrum, kernel_spectrum, out=None):
+        """Convolve data with a kernel, given their spectra.
+
+        Stacks of kernel spectra are supported, the spectra are broadcast
+        against each other.
+
+        Parameters
+        ----------
+        data_spectrum : `~numpy.ndarray`
+            Data spectrum, see `data_spectrum`.
+        kernel_spectrum : `~numpy.ndarray`
+            Kernel spectrum, see `kernel_spectrum`.
+        out : `~numpy.ndarray`, optional
+            Output array, the result is cast to its data type.
+
+        Returns
+        -------
+        convolved : `~numpy.ndarray`
+            Convolved data.
+        """
+        convolved = np.fft.irfft2(data_spectrum * kernel_spectrum, self._fft_shape)
+        if out is None:
+            return convolved[self._slices]
+
+        out[...] = convolved[self._slices]
+        return out
@@ -8,6 +8,7 @@ from astropy.io import fits
 from astropy.coordinates import SkyCoord, Angle
 from astropy.coordinates.angle_utilities import angular_separation
 from astropy.wcs.utils import proj_plane_pixel_scales
+from astropy.nddata import Cutout2D
 import astropy.units as u
 from regions import SkyRegion
 from ..utils.wcs import get_resampled_wcs
@@ -161,13 +162,26 @@ class WcsGeom(MapGeom):
     conv : {'gadf', 'fgst-ccube', 'fgst-template'}
         Serialization format convention.  This sets the default format
         that will be used when writing this geometry to a file.
+    cutout_info : dict, optional
+        For geometries created with `WcsGeom.cutout`, the slices selecting
+        the cutout in the parent data ("parent-slices") and the overlapping
+        part of the cutout data ("cutout-slices").
     """
 
     _slice_spatial_axes = slice(0, 2)
     _slice_non_spatial_axes = slice(2, -1)
     is_hpx = False
 
-    def __init__(self, wcs, npix, cdelt=None, crpix=None, axes=None, conv="gadf"):
+    def __init__(
+        self,
+        wcs,
+        npix,
+        cdelt=None,
+        crpix=None,
+        axes=None,
+        conv="gadf",
+        cutout_info=None,
+    ):
         self._wcs = wcs
         self._coordsys = get_coordys(wcs)
         self._projection = get_projection(wcs)
@@ -190,6 +204,7 @@ class WcsGeom(MapGeom):
             crpix = tuple(1.0 + (np.array(self._npix) - 1.0) / 2.)
 
         self._crpix = crpix
+        self.cutout_info = cutout_info
 
     @property
     def data_shape(self):
@@ -740,6 +755,49 @@ class WcsGeom(MapGeom):
         cdelt = copy.deepcopy(self._cdelt)
         return self.__class__(wcs, npix, cdelt=cdelt, axes=copy.deepcopy(self.axes))
 
+    def cutout(self, position, width, mode="trim"):
+        """Create a cutout geometry around a given position.
+
+        The cutout is pixel aligned with this geometry, the slices to
+        extract or stack data are stored in the ``cutout_info`` attribute
+        of the returned geometry.
+
+        Parameters
+        ----------
+        position : `~astropy.coordinates.SkyCoord`
+            Center position of the cutout region.
+        width : tuple of `~astropy.coordinates.Angle`
+            Angular sizes of the region in (lon, lat) in that specific order.
+            If only one value is passed, a square region is extracted.
+        mode : {'trim', 'partial', 'strict'}
+            Mode option for Cutout2D, for details see `~astropy.nddata.utils.Cutout2D`.
+
+        Returns
+        -------
+        cutout : `~gammapy.maps.WcsGeom`
+            Cutout geometry
+        """
+        width = _check_width(width)
+        # Cutout2D only needs the data shape, so pass a read-only view
+        data = np.broadcast_to(np.zeros(1), self.data_shape[-2:])
+        c2d = Cutout2D(
+            data=data,
+            wcs=self.wcs,
+            position=position,
+            # Cutout2D takes size with order (lat, lon)
+            size=width[::-1] * u.deg,
+            mode=mode,
+        )
+
+        # Create the slices with the non-spatial axis
+        cutout_info = {
+            "parent-slices": (Ellipsis,) + c2d.slices_original,
+            "cutout-slices": (Ellipsis,) + c2d.slices_cutout,
+        }
+        return self.__class__(
+            c2d.wcs, c2d.shape[::-1], axes=self.axes, cutout_info=cutout_info
+        )
+
     def downsample(self, factor):
 
         if not np.all(np.mod(self.npix[0], factor) == 0) or not np.all(
@@ -4,13 +4,11 @@ import logging
 import numpy as np
 from astropy.io import fits
 import astropy.units as u
-from astropy.nddata import Cutout2D
 from astropy.convolution import Tophat2DKernel
 from ..extern.skimage import block_reduce
 from ..utils.units import unit_from_fits_image_hdu
 from .geom import pix_tuple_to_idx
-from .wcs import _check_width
-from .utils import interp_to_order
+from .utils import interp_to_order, FFTConvolver
 from .wcsmap import WcsGeom, WcsMap
 from .reproject import reproject_car_to_hpx, reproject_car_to_wcs
 
@@ -552,7 +550,10 @@ class WcsNDMap(WcsMap):
         kernel : `~gammapy.cube.PSFKernel` or `numpy.ndarray`
             Convolution kernel.
         use_fft : bool
-            Use `scipy.signal.fftconvolve` or `scipy.ndimage.convolve`.
+            Use an FFT convolution or `scipy.ndimage.convolve`. With the default
+            ``mode="same"`` all image planes are convolved in a single batched FFT,
+            and the kernel FFT is cached on `~gammapy.cube.PSFKernel` objects.
+            Other options are passed to `scipy.signal.fftconvolve`.
         kwargs : dict
             Keyword arguments passed to `scipy.signal.fftconvolve` or
             `scipy.ndimage.convolve`.
@@ -571,13 +572,22 @@ class WcsNDMap(WcsMap):
         if use_fft:
             kwargs.setdefault("mode", "same")
 
+        convolver = None
         if isinstance(kernel, PSFKernel):
             kmap = kernel.psf_kernel_map
             if not np.allclose(
                 self.geom.pixel_scales.deg, kmap.geom.pixel_scales.deg, rtol=1e-5
             ):
                 raise ValueError("Pixel size of kernel and map not compatible.")
+            if use_fft and kwargs == {"mode": "same"}:
+                convolver = kernel.get_convolver(self.data.shape)
             kernel = kmap.data
+        elif use_fft and kwargs == {"mode": "same"}:
+            convolver = FFTConvolver(kernel, self.data.shape)
+
+        if convolver is not None:
+            convolver(self.data, out=convolved_data)
+            return self._init_copy(data=convolved_data)
 
         for img, idx in self.iter_by_image():
             idx = Ellipsis if kernel.ndim == 2 else idx
@@ -604,21 +614,7 @@ class WcsNDMap(WcsMap):
         cutout : `~gammapy.maps.WcsNDMap`
             Cutout map
         """
-        width = _check_width(width)
-        idx = (0,) * len(self.geom.axes)
-        c2d = Cutout2D(
-            data=self.data[idx],
-            wcs=self.geom.wcs,
-            position=position,
-            # Cutout2D takes size with order (lat, lon)
-            size=width[::-1] * u.deg,
-            mode=mode,
-        )
-
-        # Create the slices with the non-spatial axis
-        cutout_slices = Ellipsis, c2d.slices_original[0], c2d.slices_original[1]
-
-        geom = WcsGeom(c2d.wcs, c2d.shape[::-1], axes=self.geom.axes)
-        data = self.data[cutout_slices]
+        geom = self.geom.cutout(position=position, width=width, mode=mode)
+        data = self.data[geom.cutout_info["parent-slices"]]
 
         return self._init_copy(geom=geom, data=data)
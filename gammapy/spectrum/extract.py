@@ -48,6 +48,9 @@ class SpectrumExtraction(object):
     use_recommended_erange : bool
         Extract spectrum only within the recommended valid energy range of the
         effective area table (default is True).
+    cache : `~gammapy.data.ObservationCache`, optional
+        Cache for the extracted spectrum observations. Observations found in
+        the cache are not extracted again, new ones are added to the cache.
     """
 
     DEFAULT_TRUE_ENERGY = np.logspace(-2, 2.5, 109) * u.TeV
@@ -64,6 +67,7 @@ class SpectrumExtraction(object):
         containment_correction=False,
         max_alpha=1,
         use_recommended_erange=True,
+        cache=None,
     ):
 
         self.obs_list = obs_list
@@ -73,6 +77,7 @@ class SpectrumExtraction(object):
         self.containment_correction = containment_correction
         self.max_alpha = max_alpha
         self.use_recommended_erange = use_recommended_erange
+        self.cache = cache
         self.observations = SpectrumObservationList()
 
         self.containment = None
@@ -88,7 +93,40 @@ class SpectrumExtraction(object):
         for obs, bkg in zip(self.obs_list, self.bkg_estimate):
             if not self._alpha_ok(obs, bkg):
                 continue
-            self.observations.append(self.process(obs, bkg))
+            self.observations.append(self._process_cached(obs, bkg))
+
+    def _process_cached(self, obs, bkg):
+        """Process one observation, using the cache if available."""
+        if self.cache is None:
+            return self.process(obs, bkg)
+
+        key = self.cache.key(
+            obs,
+            bkg.on_region,
+            bkg.off_region,
+            bkg.a_on,
+            bkg.a_off,
+            bkg.method,
+            self.e_reco,
+            self.e_true,
+            self.containment_correction,
+            self.use_recommended_erange,
+        )
+        cached = self.cache.get(key)
+
+        if cached is None:
+            spectrum_observation = self.process(obs, bkg)
+            self.cache.set(key, (spectrum_observation, self.containment))
+        else:
+            log.info("Using cached observation: OBS_ID = {}".format(obs.obs_id))
+            spectrum_observation, self.containment = cached
+            # restore the state `process` leaves for the last observation
+            self._on_vector = spectrum_observation.on_vector
+            self._off_vector = spectrum_observation.off_vector
+            self._aeff = spectrum_observation.aeff
+            self._edisp = spectrum_observation.edisp
+
+        return spectrum_observation
 
     def _alpha_ok(self, obs, bkg):
         """Check if observation fulfills alpha criterion"""
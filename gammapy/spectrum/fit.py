@@ -2,13 +2,15 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
 import copy
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import astropy.units as u
 from ..utils.scripts import make_path
 from ..utils.fitting import Fit
 from .. import stats
-from .utils import CountsPredictor
 from . import SpectrumObservationList, SpectrumObservation
+from .utils import _get_energy_unit
 
 __all__ = ["SpectrumFit"]
 
@@ -37,16 +39,38 @@ class SpectrumFit(Fit):
         The intersection between the fit range and the observation thresholds will be used.
         If you want to control which bins are taken into account in the fit for each
         observation, use :func:`~gammapy.spectrum.PHACountsSpectrum.quality`
+    n_jobs : int
+        Number of parallel jobs. For ``n_jobs > 1`` the observations are split
+        into ``n_jobs`` groups, and `total_stat` and `total_stat_gradient` sum
+        the partial results of the groups computed by a worker pool. The pool
+        is created on first use and kept alive until `close` is called.
+    pool : {'process', 'thread'}
+        Worker pool type. Every group gets its own worker process, which
+        receives a copy of the observations of its group once, when the pool
+        is created, and the model on every call, so the model has to be
+        picklable.
     """
 
     def __init__(
-        self, obs_list, model, stat="wstat", forward_folded=True, fit_range=None
+        self,
+        obs_list,
+        model,
+        stat="wstat",
+        forward_folded=True,
+        fit_range=None,
+        n_jobs=1,
+        pool="process",
     ):
+        if pool not in ["process", "thread"]:
+            raise ValueError("Invalid pool type: {!r}".format(pool))
+
         self.obs_list = obs_list
         self._model = model.copy()
         self.stat = stat
         self.forward_folded = forward_folded
         self.fit_range = fit_range
+        self.n_jobs = n_jobs
+        self.pool = pool
 
         self._predicted_counts = None
         self._statval = None
@@ -75,6 +99,9 @@ class SpectrumFit(Fit):
             obs_list = SpectrumObservationList([obs_list])
 
         self._obs_list = SpectrumObservationList(obs_list)
+        # process workers and responses hold a copy of the observations
+        self._responses_unit = None
+        self.close()
 
     @property
     def bins_in_fit_range(self):
@@ -107,6 +134,8 @@ class SpectrumFit(Fit):
     def fit_range(self, fit_range):
         self._fit_range = fit_range
         self._apply_fit_range()
+        self._responses_unit = None
+        self.close()
 
     @property
     def true_fit_range(self):
@@ -163,50 +192,24 @@ class SpectrumFit(Fit):
         The result is stored as ``predicted_counts`` attribute.
         """
         predicted_counts = []
-        for obs in self.obs_list:
-            mu_sig = self._predict_counts_helper(obs, self._model, self.forward_folded)
-            predicted_counts.append(mu_sig)
+        for response in self._get_responses(self._model):
+            predicted_counts.append(response.predict_counts(self._model))
         self._predicted_counts = predicted_counts
 
-    def _predict_counts_helper(self, obs, model, forward_folded=True):
-        """Predict counts for one observation.
-
-        Parameters
-        ----------
-        obs : `~gammapy.spectrum.SpectrumObservation`
-            Response functions
-        model : `~gammapy.spectrum.models.SpectralModel`
-            Source or background model
-        forward_folded : bool, default: True
-            Fold model with IRFs
+    def _get_responses(self, model):
+        """Frozen response of every observation, created once.
 
-        Returns
-        ------
-        predicted_counts : `numpy.ndarray`
-            Predicted counts for one observation
+        The true energy unit follows the model amplitude (see `CountsPredictor`),
+        so the responses are re-created if it changes.
         """
-        predictor = CountsPredictor(model=model)
-        if forward_folded:
-            predictor.aeff = obs.aeff
-            predictor.edisp = obs.edisp
-        else:
-            predictor.e_true = obs.e_reco
-
-        predictor.livetime = obs.livetime
-
-        predictor.run()
-        counts = predictor.npred.data.data
-
-        # Check count unit (~unit of model amplitude)
-        if counts.unit.is_equivalent(""):
-            counts = counts.value
-        else:
-            raise ValueError("Predicted counts {}".format(counts))
-
-        # Apply AREASCAL column
-        counts *= obs.on_vector.areascal
-
-        return counts
+        energy_unit = _get_energy_unit(model)
+        if getattr(self, "_responses_unit", None) != energy_unit:
+            self._responses = [
+                _ObservationResponse(obs, valid_range, self.forward_folded, energy_unit)
+                for obs, valid_range in zip(self.obs_list, self.bins_in_fit_range)
+            ]
+            self._responses_unit = energy_unit
+        return self._responses
 
     def calc_statval(self):
         """Calc statistic for all observations.
@@ -215,18 +218,19 @@ class SpectrumFit(Fit):
         range are set to 0.
         """
         statval = []
-        for obs, npred in zip(self.obs_list, self.predicted_counts):
-            on_stat = self._calc_statval_helper(obs, npred)
+        responses = self._get_responses(self._model)
+        for response, npred in zip(responses, self.predicted_counts):
+            on_stat = self._calc_statval_helper(response, npred)
             statval.append(on_stat)
         self._statval = statval
         self._restrict_statval()
 
-    def _calc_statval_helper(self, obs, prediction):
+    def _calc_statval_helper(self, response, prediction):
         """Calculate ``statval`` for one observation.
 
         Parameters
         ----------
-        obs : `~gammapy.spectrum.SpectrumObservation`
+        response : `_ObservationResponse`
             Measured counts
         prediction : tuple of `~numpy.ndarray`
             Predicted counts
@@ -237,14 +241,14 @@ class SpectrumFit(Fit):
             Statval
         """
         if self.stat == "cash":
-            return stats.cash(n_on=obs.on_vector.data.data.value, mu_on=prediction)
+            return stats.cash(n_on=response.n_on, mu_on=prediction)
         elif self.stat == "cstat":
-            return stats.cstat(n_on=obs.on_vector.data.data.value, mu_on=prediction)
+            return stats.cstat(n_on=response.n_on, mu_on=prediction)
         elif self.stat == "wstat":
             on_stat_ = stats.wstat(
-                n_on=obs.on_vector.data.data.value,
-                n_off=obs.off_vector.data.data.value,
-                alpha=obs.alpha,
+                n_on=response.n_on,
+                n_off=response.n_off,
+                alpha=response.alpha,
                 mu_sig=prediction,
             )
             return np.nan_to_num(on_stat_)
@@ -262,11 +266,163 @@ class SpectrumFit(Fit):
             Model parameters
         """
         self._model.parameters = parameters
+        if self.n_jobs > 1:
+            return np.sum(self._map_groups("stat"), dtype=np.float64)
+
         self.predict_counts()
         self.calc_statval()
         total_stat = np.sum([np.sum(v) for v in self.statval], dtype=np.float64)
         return total_stat
 
+    def _total_stat_group(self, indices, model):
+        """Statistic summed over the observations with the given indices."""
+        responses = self._get_responses(model)
+        total_stat = 0
+        for idx in indices:
+            response = responses[idx]
+            npred = response.predict_counts(model)
+            statval = self._calc_statval_helper(response, npred)
+            total_stat += np.sum(statval[response.mask])
+        return total_stat
+
+    @property
+    def _groups(self):
+        """Observation indices handled by each parallel job."""
+        indices = np.arange(len(self.obs_list))
+        groups = np.array_split(indices, min(self.n_jobs, len(indices)))
+        return [group.tolist() for group in groups]
+
+    def _get_pool(self):
+        """Persistent worker pool, created on first use.
+
+        For process workers this is a list of single-process pools, one per
+        group in `_groups`, each holding only the observations of its group.
+        """
+        if self._pool is None:
+            if self.pool == "thread":
+                self._pool = ThreadPool(processes=self.n_jobs)
+            else:
+                self._pool = []
+                for group in self._groups:
+                    obs_list = SpectrumObservationList(
+                        [self.obs_list[idx] for idx in group]
+                    )
+                    initargs = (
+                        obs_list,
+                        self._model,
+                        self.stat,
+                        self.forward_folded,
+                        self.fit_range,
+                    )
+                    self._pool.append(
+                        Pool(processes=1, initializer=_init_worker, initargs=initargs)
+                    )
+        return self._pool
+
+    def _map_groups(self, which):
+        """Compute the partial ``stat`` or ``gradient`` of each group in the pool."""
+        pool = self._get_pool()
+        if self.pool == "thread":
+            # every thread gets its own model copy to set parameters on
+            args = [(which, group, self._model.copy()) for group in self._groups]
+            return pool.map(self._run_group, args)
+        else:
+            # the workers index their own observations only
+            results = [
+                worker.apply_async(
+                    _run_worker_group, ((which, list(range(len(group))), self._model),)
+                )
+                for worker, group in zip(pool, self._groups)
+            ]
+            return [_.get() for _ in results]
+
+    def _run_group(self, args):
+        which, indices, model = args
+        if which == "stat":
+            return self._total_stat_group(indices, model)
+        else:
+            return self._total_stat_gradient_group(indices, model)
+
+    def close(self):
+        """Shut down the worker pool used for ``n_jobs > 1``."""
+        pool = getattr(self, "_pool", None)
+        if isinstance(pool, list):
+            for worker in pool:
+                worker.terminate()
+        elif pool is not None:
+            pool.terminate()
+        self._pool = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def total_stat_gradient(self, parameters):
+        """Gradient of `total_stat` with respect to the parameter values.
+
+        The derivative of the statistic with respect to the predicted counts
+        is folded back through the energy dispersion once per observation and
+        then combined with the derivatives of the true counts.
+
+        Parameters
+        ----------
+        parameters : `~gammapy.utils.fitting.Parameters`
+            Model parameters
+
+        Returns
+        -------
+        gradient : `~numpy.ndarray` or None
+            Gradient, ``None`` if the model has no analytical gradient.
+        """
+        self._model.parameters = parameters
+        indices = list(range(len(self.obs_list)))
+        if self.n_jobs > 1:
+            gradients = self._map_groups("gradient")
+            if any(_ is None for _ in gradients):
+                return None
+            return np.sum(gradients, axis=0)
+
+        return self._total_stat_gradient_group(indices, self._model)
+
+    def _total_stat_gradient_group(self, indices, model):
+        """Gradient summed over the observations with the given indices."""
+        responses = self._get_responses(model)
+        gradient = np.zeros(len(model.parameters.parameters))
+
+        for idx in indices:
+            response = responses[idx]
+            true_gradient = response.true_counts_gradient(model)
+            if true_gradient is None:
+                return None
+
+            npred = response.predict_counts(model)
+            weights = self._calc_stat_derivative_helper(response, npred)
+            weights = np.nan_to_num(weights) * response.areascal
+            weights = np.where(response.mask, weights, 0)
+
+            if response.edisp is not None:
+                weights = response.edisp.dot_transposed(weights)
+
+            gradient += np.dot(true_gradient, weights)
+
+        return gradient
+
+    def _calc_stat_derivative_helper(self, response, prediction):
+        """Derivative of ``statval`` with respect to the predicted counts."""
+        if self.stat in ["cash", "cstat"]:
+            return stats.cash_derivative(n_on=response.n_on, mu_on=prediction)
+        elif self.stat == "wstat":
+            return stats.wstat_derivative(
+                n_on=response.n_on,
+                n_off=response.n_off,
+                alpha=response.alpha,
+                mu_sig=prediction,
+            )
+        else:
+            raise NotImplementedError("{}".format(self.stat))
+
     def _restrict_statval(self):
         """Apply valid fit range to statval.
         """
@@ -301,6 +457,8 @@ class SpectrumFit(Fit):
         from . import SpectrumFitResult
 
         # run again with best fit parameters
+        self.predict_counts()
+        self.calc_statval()
         model = self._model.copy()
 
         statname = self.stat
@@ -325,3 +483,113 @@ class SpectrumFit(Fit):
             )
 
         return results
+
+
+class _ObservationResponse(object):
+    """Frozen response of one observation used in the likelihood evaluation.
+
+    Holds the true energy edges, the effective area times livetime, the energy
+    dispersion matrix, ``AREASCAL``, the fit range mask and the measured
+    counts as plain arrays, so that predicting counts only needs the model
+    integral, one matrix-vector product with the energy dispersion and the
+    multiplication with ``AREASCAL``. The results are the same as with
+    `~gammapy.spectrum.CountsPredictor`.
+
+    Parameters
+    ----------
+    obs : `~gammapy.spectrum.SpectrumObservation`
+        Observation
+    mask : `~numpy.ndarray`
+        Bins in the fit range
+    forward_folded : bool
+        Fold the model with the IRFs
+    energy_unit : `~astropy.units.Unit`
+        True energy unit used for the model integration
+    """
+
+    def __init__(self, obs, mask, forward_folded, energy_unit):
+        if forward_folded:
+            aeff, edisp = obs.aeff, obs.edisp
+        else:
+            aeff, edisp = None, None
+
+        if aeff is not None:
+            e_true = aeff.energy.bins.to(energy_unit)
+            self._aeff = aeff.data.data
+        elif forward_folded:
+            raise ValueError("No true energy binning given")
+        else:
+            e_true = obs.e_reco
+            self._aeff = None
+
+        self.emin, self.emax = e_true[:-1], e_true[1:]
+        self.livetime = obs.livetime
+        self.edisp = None if edisp is None else edisp.get_banded_matrix()
+        self.areascal = obs.on_vector.areascal
+        self.mask = np.asarray(mask, dtype=bool)
+
+        self.n_on = obs.on_vector.data.data.value
+        if obs.off_vector is not None:
+            self.n_off = obs.off_vector.data.data.value
+            self.alpha = obs.alpha
+        else:
+            self.n_off, self.alpha = None, None
+
+        self._factors = {}
+
+    def _get_factor(self, unit):
+        """Factor converting a true energy bin integral in ``unit`` to counts."""
+        key = unit.to_string()
+        if key not in self._factors:
+            counts = u.Quantity(np.ones(len(self.emin)), unit)
+            if self._aeff is not None:
+                counts = counts * self._aeff
+
+            # Multiply with livetime if not already contained in aeff or model
+            if counts.unit.is_equivalent("s-1"):
+                counts = counts * self.livetime
+
+            try:
+                self._factors[key] = counts.to("").value
+            except u.UnitConversionError:
+                raise ValueError("Predicted counts {}".format(counts))
+        return self._factors[key]
+
+    def predict_counts(self, model):
+        """Predicted counts in reco energy, including ``AREASCAL``."""
+        flux = model.integral(emin=self.emin, emax=self.emax, intervals=True)
+        counts = flux.value * self._get_factor(flux.unit)
+        if self.edisp is not None:
+            counts = self.edisp.dot(counts)
+        return counts * self.areascal
+
+    def true_counts_gradient(self, model):
+        """Derivatives of the counts in true energy, see `CountsPredictor`."""
+        gradient = model.integral_gradient(emin=self.emin, emax=self.emax)
+        if gradient is None:
+            return None
+
+        result = []
+        for par, value in zip(model.parameters.parameters, gradient):
+            unit = value.unit * par.unit
+            result.append(value.value * self._get_factor(unit))
+        return np.array(result)
+
+
+_worker_fit = None
+
+
+def _init_worker(obs_list, model, stat, forward_folded, fit_range):
+    """Set up the `SpectrumFit` of a worker process for one group of observations."""
+    global _worker_fit
+    _worker_fit = SpectrumFit(
+        obs_list=obs_list,
+        model=model,
+        stat=stat,
+        forward_folded=forward_folded,
+        fit_range=fit_range,
+    )
+
+
+def _run_worker_group(args):
+    return _worker_fit._run_group(args)
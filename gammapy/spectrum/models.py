@@ -8,7 +8,7 @@ import astropy.units as u
 from astropy.table import Table
 from ..utils.energy import EnergyBounds
 from ..utils.nddata import NDDataArray, BinnedDataAxis
-from .utils import integrate_spectrum
+from .utils import integrate_spectrum, _trapz_loglog_gradient, _gauss_legendre_nodes
 from ..utils.scripts import make_path
 from ..utils.fitting import Parameter, Parameters
 
@@ -35,8 +35,15 @@ class SpectralModel(object):
     `~gammapy.utils.modeling.Parameters`
     See for example return pardict of
     `~gammapy.spectrum.models.PowerLaw`.
+
+    The ``integration_method`` class attribute sets the default method used
+    by `integral` and `energy_flux`, see
+    :func:`~gammapy.spectrum.integrate_spectrum`. It can be changed on
+    instances or overwritten by passing ``method`` to these methods.
     """
 
+    integration_method = "trapz_loglog"
+
     def __repr__(self):
         fmt = "{}()"
         return fmt.format(self.__class__.__name__)
@@ -147,6 +154,7 @@ class SpectralModel(object):
         **kwargs : dict
             Keyword arguments passed to :func:`~gammapy.spectrum.integrate_spectrum`
         """
+        kwargs.setdefault("method", self.integration_method)
         return integrate_spectrum(self, emin, emax, **kwargs)
 
     def integral_error(self, emin, emax, **kwargs):
@@ -164,6 +172,7 @@ class SpectralModel(object):
         integral, integral_error : tuple of `~astropy.units.Quantity`
             Tuple of integral flux and integral flux error.
         """
+        kwargs.setdefault("method", self.integration_method)
         emin = self._convert_energy(emin)
         emax = self._convert_energy(emax)
         unit = self.integral(emin, emax, **kwargs).unit
@@ -175,6 +184,74 @@ class SpectralModel(object):
         uarray = integrate_spectrum(f, emin.value, emax.value, **kwargs)
         return self._parse_uarray(uarray) * unit
 
+    def gradient(self, energy):
+        """Evaluate the derivatives of the model with respect to its parameters.
+
+        Models that provide an analytical gradient implement an
+        ``evaluate_gradient`` method with the same signature as ``evaluate``,
+        returning one derivative per parameter in parameter order.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy at which to evaluate
+
+        Returns
+        -------
+        gradient : list of `~astropy.units.Quantity` or None
+            Derivatives with respect to each parameter, ``None`` if the model
+            has no analytical gradient.
+        """
+        if not hasattr(self, "evaluate_gradient"):
+            return None
+
+        kwargs = dict()
+        for par in self.parameters.parameters:
+            kwargs[par.name] = par.quantity
+
+        return self.evaluate_gradient(energy, **kwargs)
+
+    def integral_gradient(self, emin, emax, method=None, order=5):
+        """Derivatives of the integral in contiguous energy bins.
+
+        The derivatives correspond to the integration used by `integral` with
+        ``intervals=True``, see :func:`~gammapy.spectrum.integrate_spectrum`.
+
+        Parameters
+        ----------
+        emin, emax : `~astropy.units.Quantity`
+            Lower and upper bounds of the energy bins.
+        method : {'trapz_loglog', 'gauss_legendre'}, optional
+            Integration method, default: ``integration_method``
+        order : int, optional
+            Number of nodes per bin of the Gauss-Legendre rule
+
+        Returns
+        -------
+        gradient : list of `~astropy.units.Quantity` or None
+            Derivatives of the integral in each bin with respect to each
+            parameter, ``None`` if the model has no analytical gradient.
+        """
+        method = method or self.integration_method
+        unit = emin.unit
+
+        if method == "gauss_legendre":
+            energy, weights = _gauss_legendre_nodes(
+                emin.value, emax.to(unit).value, order
+            )
+            gradient = self.gradient(energy * unit)
+            if gradient is None:
+                return None
+            return [np.sum(dvalue * weights, axis=-1) * unit for dvalue in gradient]
+
+        energy = np.append(emin.value, emax[-1:].to(unit).value) * unit
+        gradient = self.gradient(energy)
+        if gradient is None:
+            return None
+
+        value = self(energy)
+        return [_trapz_loglog_gradient(value, dvalue, energy) for dvalue in gradient]
+
     def energy_flux(self, emin, emax, **kwargs):
         """Compute energy flux in given energy range.
 
@@ -189,6 +266,7 @@ class SpectralModel(object):
         **kwargs : dict
             Keyword arguments passed to func:`~gammapy.spectrum.integrate_spectrum`
         """
+        kwargs.setdefault("method", self.integration_method)
 
         def f(x):
             return x * self(x)
@@ -214,6 +292,7 @@ class SpectralModel(object):
         energy_flux, energy_flux_error : tuple of `~astropy.units.Quantity`
             Tuple of energy flux and energy flux error.
         """
+        kwargs.setdefault("method", self.integration_method)
         emin = self._convert_energy(emin)
         emax = self._convert_energy(emax)
 
@@ -474,6 +553,11 @@ class ConstantModel(SpectralModel):
         """Evaluate the model (static function)."""
         return np.ones(len(np.atleast_1d(energy))) * const
 
+    @staticmethod
+    def evaluate_gradient(energy, const):
+        """Evaluate the gradient of the model (static function)."""
+        return [u.Quantity(np.ones(len(np.atleast_1d(energy))))]
+
 
 class CompoundSpectralModel(SpectralModel):
     """Represents the algebraic combination of two
@@ -566,6 +650,14 @@ class PowerLaw(SpectralModel):
         """Evaluate the model (static function)."""
         return amplitude * np.power((energy / reference), -index)
 
+    @staticmethod
+    def evaluate_gradient(energy, index, amplitude, reference):
+        """Evaluate the gradient of the model (static function)."""
+        xx = (energy / reference).to("")
+        pwl = np.power(xx, -index)
+        val = amplitude * pwl
+        return [-val * np.log(xx), pwl, val * index / reference]
+
     def integral(self, emin, emax, **kwargs):
         r"""Integrate power law analytically.
 
@@ -770,6 +862,20 @@ class PowerLaw2(SpectralModel):
         bottom = emax - emin * (emin / emax) ** (-index)
         return amplitude * (top / bottom) * np.power(energy / emax, -index)
 
+    @staticmethod
+    def evaluate_gradient(energy, amplitude, index, emin, emax):
+        """Evaluate the gradient of the model (static function)."""
+        top = -index + 1
+        xx = (energy / emax).to("")
+        qq = (emin / emax).to("") ** top
+        bottom = emax * (1 - qq)
+        shape = (top / bottom) * np.power(xx, -index)
+        val = amplitude * shape
+        d_index = -1 / top - np.log(xx) - qq * np.log((emin / emax).to("")) / (1 - qq)
+        d_emin = top * qq / (emin * (1 - qq))
+        d_emax = -top / bottom
+        return [shape, val * d_index, val * d_emin, val * d_emax]
+
     def integral(self, emin, emax, **kwargs):
         r"""Integrate power law analytically.
 
@@ -876,6 +982,8 @@ class ExponentialCutoffPowerLaw(SpectralModel):
         plt.show()
     """
 
+    integration_method = "gauss_legendre"
+
     def __init__(
         self,
         index=1.5,
@@ -904,6 +1012,14 @@ class ExponentialCutoffPowerLaw(SpectralModel):
             cutoff = exp(-energy * lambda_)
         return pwl * cutoff
 
+    @staticmethod
+    def evaluate_gradient(energy, index, amplitude, reference, lambda_):
+        """Evaluate the gradient of the model (static function)."""
+        xx = (energy / reference).to("")
+        shape = np.power(xx, -index) * np.exp(-(energy * lambda_).to(""))
+        val = amplitude * shape
+        return [-val * np.log(xx), shape, val * index / reference, -energy * val]
+
     @property
     def e_peak(self):
         r"""Spectral energy distribution peak energy (`~astropy.utils.Quantity`).
@@ -960,6 +1076,8 @@ class ExponentialCutoffPowerLaw3FGL(SpectralModel):
         plt.show()
     """
 
+    integration_method = "gauss_legendre"
+
     def __init__(
         self,
         index=1.5,
@@ -988,6 +1106,19 @@ class ExponentialCutoffPowerLaw3FGL(SpectralModel):
             cutoff = exp((reference - energy) / ecut)
         return pwl * cutoff
 
+    @staticmethod
+    def evaluate_gradient(energy, index, amplitude, reference, ecut):
+        """Evaluate the gradient of the model (static function)."""
+        xx = (energy / reference).to("")
+        shape = np.power(xx, -index) * np.exp(((reference - energy) / ecut).to(""))
+        val = amplitude * shape
+        return [
+            -val * np.log(xx),
+            shape,
+            val * (index / reference + 1 / ecut),
+            -val * (reference - energy) / ecut ** 2,
+        ]
+
 
 class PLSuperExpCutoff3FGL(SpectralModel):
     r"""Spectral super exponential cutoff power-law model used for 3FGL.
@@ -1026,6 +1157,8 @@ class PLSuperExpCutoff3FGL(SpectralModel):
         plt.show()
     """
 
+    integration_method = "gauss_legendre"
+
     def __init__(
         self,
         index_1=1.5,
@@ -1057,6 +1190,23 @@ class PLSuperExpCutoff3FGL(SpectralModel):
             cutoff = exp((reference / ecut) ** index_2 - (energy / ecut) ** index_2)
         return pwl * cutoff
 
+    @staticmethod
+    def evaluate_gradient(energy, amplitude, reference, ecut, index_1, index_2):
+        """Evaluate the gradient of the model (static function)."""
+        xx = (energy / reference).to("")
+        x_ref = (reference / ecut).to("")
+        x_energy = (energy / ecut).to("")
+        cutoff_ref, cutoff_energy = x_ref ** index_2, x_energy ** index_2
+        shape = np.power(xx, -index_1) * np.exp(cutoff_ref - cutoff_energy)
+        val = amplitude * shape
+        return [
+            shape,
+            val * (index_1 + index_2 * cutoff_ref) / reference,
+            -val * index_2 * (cutoff_ref - cutoff_energy) / ecut,
+            -val * np.log(xx),
+            val * (cutoff_ref * np.log(x_ref) - cutoff_energy * np.log(x_energy)),
+        ]
+
 
 class LogParabola(SpectralModel):
     r"""Spectral log parabola model.
@@ -1102,6 +1252,8 @@ class LogParabola(SpectralModel):
         plt.show()
     """
 
+    integration_method = "gauss_legendre"
+
     def __init__(
         self,
         amplitude=1E-12 * u.Unit("cm-2 s-1 TeV-1"),
@@ -1140,6 +1292,19 @@ class LogParabola(SpectralModel):
             exponent = -alpha - beta * log(xx)
         return amplitude * np.power(xx, exponent)
 
+    @staticmethod
+    def evaluate_gradient(energy, amplitude, reference, alpha, beta):
+        """Evaluate the gradient of the model (static function)."""
+        log_xx = np.log((energy / reference).to(""))
+        shape = np.exp(-alpha * log_xx - beta * log_xx ** 2)
+        val = amplitude * shape
+        return [
+            shape,
+            val * (alpha + 2 * beta * log_xx) / reference,
+            -val * log_xx,
+            -val * log_xx ** 2,
+        ]
+
     @property
     def e_peak(self):
         r"""Spectral energy distribution peak energy (`~astropy.utils.Quantity`).
@@ -1189,6 +1354,10 @@ class TableModel(SpectralModel):
         Meta information, meta['filename'] will be used for serialization
     """
 
+    # the log-log trapezoidal rule on bin edges treats the table as a power law
+    # between the nodes and misses the curvature of the interpolation
+    integration_method = "gauss_legendre"
+
     def __init__(
         self, energy, values, norm=1, values_scale="log", interp_kwargs=None, meta=None
     ):
@@ -1302,6 +1471,10 @@ class TableModel(SpectralModel):
         vals = np.clip(vals, 0, np.inf)
         return u.Quantity(norm.value * vals, self.values.unit, copy=False)
 
+    def evaluate_gradient(self, energy, norm):
+        """Evaluate the gradient of the model."""
+        return [self.evaluate(energy, norm=u.Quantity(1))]
+
 
 class Absorption(object):
     """Gamma-ray absorption models.
@@ -6,6 +6,7 @@ from numpy.testing import assert_allclose
 import astropy.units as u
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency, requires_data
+from ...data import ObservationCache
 from ...spectrum import SpectrumExtraction, SpectrumObservation
 from ...background.tests.test_reflected import bkg_estimator, obs_list
 
@@ -106,6 +107,36 @@ class TestSpectrumExtraction:
             extraction.observations[0].on_vector.energy.nodes,
         )
 
+    def test_cache(self, tmpdir):
+        cache = ObservationCache(str(tmpdir))
+        e_true = np.logspace(-1, 1.9, 70) * u.TeV
+
+        results, extractions = [], []
+        for _ in range(2):
+            extraction = SpectrumExtraction(
+                bkg_estimate=bkg_estimate(),
+                obs_list=obs_list(),
+                e_true=e_true,
+                containment_correction=True,
+                cache=cache,
+            )
+            extraction.run()
+            results.append(extraction.observations)
+            extractions.append(extraction)
+
+        # the state of the last processed observation is restored
+        assert_allclose(extractions[1].containment, extractions[0].containment)
+        assert extractions[1]._aeff is results[1][-1].aeff
+
+        # the second run reads all observations from the cache
+        assert len(tmpdir.listdir()) == len(results[0])
+        for obs, obs_cached in zip(*results):
+            assert obs.obs_id == obs_cached.obs_id
+            assert_quantity_allclose(
+                obs.on_vector.data.data, obs_cached.on_vector.data.data
+            )
+            assert_quantity_allclose(obs.aeff.data.data, obs_cached.aeff.data.data)
+
     @requires_dependency("sherpa")
     def test_sherpa(self, tmpdir, extraction):
         """Same as above for files to be used with sherpa"""
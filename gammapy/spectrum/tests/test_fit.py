@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
 import astropy.units as u
 import numpy as np
 from numpy.testing import assert_allclose
@@ -12,10 +13,19 @@ from ...spectrum import (
     SpectrumObservation,
     SpectrumFit,
     SpectrumFitResult,
+    CountsPredictor,
     models,
 )
 
 
+def _worker_observations():
+    """Observation IDs and number of responses held by a `SpectrumFit` worker."""
+    from .. import fit
+
+    obs_ids = [obs.obs_id for obs in fit._worker_fit.obs_list]
+    return obs_ids, len(fit._worker_fit._responses)
+
+
 @requires_dependency("sherpa")
 class TestFit:
     """Test fitter on counts spectra without any IRFs"""
@@ -311,6 +321,68 @@ class TestSpectralFit:
         assert actual.unit == "cm-2 s-1 TeV-1"
         assert_allclose(actual.value, 5.118e-11, rtol=1e-3)
 
+    def test_joint_fit_gradient(self):
+        fit = SpectrumFit(self.obs_list, self.pwl)
+        assert fit.has_gradient
+        fit.run(optimize_opts={"gradient": True})
+        actual = fit.result[0].model.parameters["index"].value
+        assert_allclose(actual, 2.7611, rtol=1e-3)
+
+        actual = fit.result[0].model.parameters["amplitude"].quantity
+        assert_allclose(actual.value, 5.118e-11, rtol=1e-3)
+
+        with pytest.raises(ValueError):
+            fit.optimize(backend="sherpa", gradient=True)
+
+    @pytest.mark.parametrize("pool", ["thread", "process"])
+    def test_joint_fit_parallel(self, pool):
+        fit = SpectrumFit(self.obs_list, self.pwl)
+        fit_parallel = SpectrumFit(self.obs_list, self.pwl, n_jobs=2, pool=pool)
+        parameters = fit._model.parameters
+
+        actual = fit_parallel.total_stat(parameters)
+        assert_allclose(actual, fit.total_stat(parameters), rtol=1e-10)
+
+        actual = fit_parallel.total_stat_gradient(parameters)
+        assert_allclose(actual, fit.total_stat_gradient(parameters), rtol=1e-10)
+
+        # the pool is kept alive between calls
+        pool = fit_parallel._pool
+        fit_parallel.total_stat(parameters)
+        assert fit_parallel._pool is pool
+
+        fit_parallel.close()
+        assert fit_parallel._pool is None
+
+    def test_joint_fit_parallel_worker_observations(self):
+        fit = SpectrumFit(self.obs_list, self.pwl, n_jobs=2, pool="process")
+        fit.total_stat(fit._model.parameters)
+
+        # every worker holds and evaluates only the observations of its group
+        for worker, group in zip(fit._pool, fit._groups):
+            obs_ids, n_responses = worker.apply(_worker_observations)
+            assert obs_ids == [self.obs_list[idx].obs_id for idx in group]
+            assert n_responses == len(group)
+
+        fit.close()
+
+    def test_predict_counts_responses(self):
+        fit = SpectrumFit(self.obs_list, self.pwl)
+        fit.predict_counts()
+        responses = fit._responses
+
+        obs = self.obs_list[0]
+        predictor = CountsPredictor(
+            model=self.pwl, aeff=obs.aeff, edisp=obs.edisp, livetime=obs.livetime
+        )
+        predictor.run()
+        desired = predictor.npred.data.data.value * obs.on_vector.areascal
+        assert_allclose(fit.predicted_counts[0], desired, rtol=1e-10)
+
+        # responses are reused between calls
+        fit.predict_counts()
+        assert fit._responses is responses
+
     def test_stacked_fit(self):
         stacked_obs = self.obs_list.stack()
         obs_list = SpectrumObservationList([stacked_obs])
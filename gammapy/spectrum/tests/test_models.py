@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
 import astropy.units as u
 from ...utils.energy import EnergyBounds
 from ...utils.testing import assert_quantity_allclose
@@ -11,6 +12,7 @@ from ..models import (
     ExponentialCutoffPowerLaw,
     ExponentialCutoffPowerLaw3FGL,
     LogParabola,
+    PLSuperExpCutoff3FGL,
     TableModel,
     AbsorbedSpectralModel,
     Absorption,
@@ -75,8 +77,8 @@ TEST_MODELS = [
             lambda_=0.1 / u.TeV,
         ),
         val_at_2TeV=u.Quantity(1.080321705479446, "cm-2 s-1 TeV-1"),
-        integral_1_10TeV=u.Quantity(3.765838739678921, "cm-2 s-1"),
-        eflux_1_10TeV=u.Quantity(9.901735870666526, "TeV cm-2 s-1"),
+        integral_1_10TeV=u.Quantity(3.7658833775247835, "cm-2 s-1"),
+        eflux_1_10TeV=u.Quantity(9.901910949450345, "TeV cm-2 s-1"),
         e_peak=4 * u.TeV,
     ),
     dict(
@@ -88,8 +90,8 @@ TEST_MODELS = [
             ecut=10 * u.TeV,
         ),
         val_at_2TeV=u.Quantity(0.7349563611124971, "cm-2 s-1 TeV-1"),
-        integral_1_10TeV=u.Quantity(2.6034046173089, "cm-2 s-1"),
-        eflux_1_10TeV=u.Quantity(5.340285560055799, "TeV cm-2 s-1"),
+        integral_1_10TeV=u.Quantity(2.603428691884947, "cm-2 s-1"),
+        eflux_1_10TeV=u.Quantity(5.3403569133262, "TeV cm-2 s-1"),
     ),
     dict(
         name="logpar",
@@ -100,8 +102,8 @@ TEST_MODELS = [
             beta=0.5 * u.Unit(""),
         ),
         val_at_2TeV=u.Quantity(0.6387956571420305, "cm-2 s-1 TeV-1"),
-        integral_1_10TeV=u.Quantity(2.255689748270628, "cm-2 s-1"),
-        eflux_1_10TeV=u.Quantity(3.9586515834989267, "TeV cm-2 s-1"),
+        integral_1_10TeV=u.Quantity(2.255791433530135, "cm-2 s-1"),
+        eflux_1_10TeV=u.Quantity(3.9588300406806014, "TeV cm-2 s-1"),
         e_peak=0.74082 * u.TeV,
     ),
     dict(
@@ -113,8 +115,8 @@ TEST_MODELS = [
             beta=1.151292546497023 * u.Unit(""),
         ),
         val_at_2TeV=u.Quantity(0.6387956571420305, "cm-2 s-1 TeV-1"),
-        integral_1_10TeV=u.Quantity(2.255689748270628, "cm-2 s-1"),
-        eflux_1_10TeV=u.Quantity(3.9586515834989267, "TeV cm-2 s-1"),
+        integral_1_10TeV=u.Quantity(2.255791433530135, "cm-2 s-1"),
+        eflux_1_10TeV=u.Quantity(3.9588300406806014, "TeV cm-2 s-1"),
         e_peak=0.74082 * u.TeV,
     ),
     dict(
@@ -226,6 +228,56 @@ def test_models(spectrum):
     assert_quantity_allclose(val[0], spectrum["val_at_2TeV"])
 
 
+@pytest.mark.parametrize("spectrum", TEST_MODELS, ids=[_["name"] for _ in TEST_MODELS])
+def test_models_gradient(spectrum):
+    model = spectrum["model"].copy()
+    energy = [1.5, 3, 7] * u.TeV
+    gradient = model.gradient(energy)
+    if gradient is None:
+        pytest.skip("No analytical gradient for {}".format(spectrum["name"]))
+
+    for par, value in zip(model.parameters.parameters, gradient):
+        par_value = par.value
+        eps = 1e-6 * abs(par_value)
+        par.value = par_value + eps
+        val_up = model(energy)
+        par.value = par_value - eps
+        val_lo = model(energy)
+        par.value = par_value
+        expected = (val_up - val_lo) / (2 * eps * par.unit)
+        assert_quantity_allclose(value, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        PowerLaw(index=2.3, amplitude="4 cm-2 s-1 TeV-1", reference="1 TeV"),
+        ExponentialCutoffPowerLaw(
+            index=1.6, amplitude="4 cm-2 s-1 TeV-1", lambda_="0.1 TeV-1"
+        ),
+        PLSuperExpCutoff3FGL(
+            index_1=1.5, index_2=1.2, amplitude="4 cm-2 s-1 TeV-1", ecut="5 TeV"
+        ),
+    ],
+)
+def test_integral_gradient(model):
+    model = model.copy()
+    edges = np.logspace(0, 1, 5) * u.TeV
+    emin, emax = edges[:-1], edges[1:]
+    gradient = model.integral_gradient(emin, emax)
+
+    for par, value in zip(model.parameters.parameters, gradient):
+        par_value = par.value
+        eps = 1e-6 * abs(par_value)
+        par.value = par_value + eps
+        val_up = model.integral(emin, emax, intervals=True)
+        par.value = par_value - eps
+        val_lo = model.integral(emin, emax, intervals=True)
+        par.value = par_value
+        expected = (val_up - val_lo) / (2 * eps * par.unit)
+        assert_quantity_allclose(value, expected, rtol=1e-5)
+
+
 @requires_dependency("matplotlib")
 @requires_data("gammapy-extra")
 def test_table_model_from_file():
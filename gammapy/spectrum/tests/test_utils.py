@@ -78,7 +78,73 @@ def test_integrate_spectrum_ecpl():
     res = ecpl.integral_error(emin, emax)
 
     assert res.unit == "cm-2 s-1"
-    assert_allclose(res.value, [5.95657824e-13, 9.27830251e-14], rtol=1e-5)
+    assert_allclose(res.value, [5.95663600e-13, 9.27843006e-14], rtol=1e-5)
+
+
+@pytest.mark.parametrize("method", ["trapz_loglog", "gauss_legendre"])
+def test_integrate_spectrum_methods(method):
+    ecpl = ExponentialCutoffPowerLaw(
+        index=1.6,
+        amplitude=4 * u.Unit("cm-2 s-1 TeV-1"),
+        reference=1 * u.TeV,
+        lambda_=0.1 / u.TeV,
+    )
+    desired = 3.7658833775247835 * u.Unit("cm-2 s-1")
+
+    val, err = integrate_spectrum(
+        ecpl, 1 * u.TeV, 10 * u.TeV, method=method, return_error=True
+    )
+    assert_quantity_allclose(val, desired, atol=2 * err)
+
+    # the integrals in the sub-intervals of the scalar range sum to the total
+    val_intervals = integrate_spectrum(
+        ecpl, 1 * u.TeV, 10 * u.TeV, method=method, intervals=True
+    )
+    assert val_intervals.shape[0] > 1
+    assert_quantity_allclose(val_intervals.sum(), val, rtol=1e-12)
+
+    # one evaluation for all bins, with the error reported per bin
+    energy = np.logspace(0, 1, 11) * u.TeV
+    val, err = integrate_spectrum(
+        ecpl, energy[:-1], energy[1:], method=method, intervals=True, return_error=True
+    )
+    assert val.shape == err.shape == (10,)
+    assert_quantity_allclose(val.sum(), desired, atol=2 * err.sum())
+
+    if method == "gauss_legendre":
+        assert_quantity_allclose(val.sum(), desired, rtol=1e-9)
+
+
+@requires_dependency("scipy")
+def test_integrate_spectrum_table_model():
+    from scipy.integrate import quad
+
+    energy = [0.1, 0.2, 0.3, 0.4] * u.TeV
+    values = [4., 3., 1., 0.1] * u.Unit("TeV-1")
+
+    # with linear interpolation in log-log the table is a power law between nodes
+    model = TableModel(energy, values, interp_kwargs={"kind": "linear"})
+    x, y = energy.value, values.value
+    index = -np.log(y[1:] / y[:-1]) / np.log(x[1:] / x[:-1])
+    desired = y[:-1] * x[:-1] / (1 - index) * ((x[1:] / x[:-1]) ** (1 - index) - 1)
+    actual = model.integral(energy[:-1], energy[1:], intervals=True)
+    assert_allclose(actual.to("").value, desired, rtol=1e-8)
+
+    # the default cubic interpolation is curved between the nodes, which the
+    # log-log trapezoidal rule on the bin edges misses by ~2 %
+    model = TableModel(energy, values)
+    desired = [
+        quad(lambda x: model(x * u.TeV).value, emin, emax, epsrel=1e-12)[0]
+        for emin, emax in zip(energy.value[:-1], energy.value[1:])
+    ]
+    actual = model.integral(energy[:-1], energy[1:], intervals=True)
+    assert_allclose(actual.to("").value, desired, rtol=1e-6)
+    assert_allclose(np.sum(desired), 0.5667242706650149, rtol=1e-9)
+
+
+def test_integrate_spectrum_invalid_method():
+    with pytest.raises(ValueError):
+        integrate_spectrum(lambda x: x, 1, 10, method="simpson")
 
 
 def get_test_cases():
@@ -138,7 +204,8 @@ def get_test_cases():
                     energy=[0.1, 0.2, 0.3, 0.4] * u.TeV,
                     values=[4., 3., 1., 0.1] * u.Unit("TeV-1"),
                 ),
-                npred=0.5545130625383198,
+                # see test_integrate_spectrum_table_model
+                npred=0.5667243085918126,
                 e_true=[0.1, 0.2, 0.3, 0.4] * u.TeV,
             ),
         ]
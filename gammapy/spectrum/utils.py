@@ -79,15 +79,7 @@ class CountsPredictor(object):
     def integrate_model(self):
         """Integrate model in true energy space"""
         if self.aeff is not None:
-            # TODO: True energy is converted to model amplitude unit. See issue 869
-            ref_unit = None
-            try:
-                for unit in self.model.parameters["amplitude"].quantity.unit.bases:
-                    if unit.is_equivalent("eV"):
-                        ref_unit = unit
-            except IndexError:
-                ref_unit = "TeV"
-            self.e_true = self.aeff.energy.bins.to(ref_unit)
+            self.e_true = self.aeff.energy.bins.to(_get_energy_unit(self.model))
         else:
             if self.e_true is None:
                 raise ValueError("No true energy binning given")
@@ -123,7 +115,35 @@ class CountsPredictor(object):
         )
 
 
-def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
+def _get_energy_unit(model):
+    """True energy unit used to integrate the model.
+
+    The true energy is converted to the energy unit of the model amplitude.
+    """
+    # TODO: True energy is converted to model amplitude unit. See issue 869
+    ref_unit = None
+    try:
+        for unit in model.parameters["amplitude"].quantity.unit.bases:
+            if unit.is_equivalent("eV"):
+                ref_unit = unit
+    except IndexError:
+        ref_unit = "TeV"
+    return ref_unit
+
+
+INTEGRATION_METHODS = ["trapz_loglog", "gauss_legendre"]
+
+
+def integrate_spectrum(
+    func,
+    xmin,
+    xmax,
+    ndecade=100,
+    intervals=False,
+    method="trapz_loglog",
+    order=5,
+    return_error=False,
+):
     """
     Integrate 1d function using the log-log trapezoidal rule. If scalar values
 
@@ -132,6 +152,14 @@ def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
     oversampling is performed and the integral is computed in the provided
     grid.
 
+    With ``method="gauss_legendre"`` each interval is integrated with a fixed
+    order Gauss-Legendre rule in log energy instead, evaluating ``func`` once
+    for all intervals and nodes. For scalar xmin and xmax the range is split
+    into sub-intervals, such that the number of function evaluations is the
+    same as for the oversampled trapezoidal rule. With ``intervals=True`` the
+    integrals in these sub-intervals are returned, like the integrals in the
+    oversampled grid for the trapezoidal rule.
+
     Parameters
     ----------
     func : callable
@@ -144,15 +172,61 @@ def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
         Number of grid points per decade used for the integration.
         Default : 100.
     intervals : bool, optional
-        Return integrals in the grid not the sum, default: False
+        Return integrals in the grid not the sum, default: False. For scalar
+        xmin and xmax the grid is the oversampled grid (trapezoidal rule) or
+        the sub-intervals (Gauss-Legendre rule) described above.
+    method : {'trapz_loglog', 'gauss_legendre'}
+        Integration method, default: 'trapz_loglog'
+    order : int, optional
+        Number of nodes per interval of the Gauss-Legendre rule, default: 5
+    return_error : bool, optional
+        Also return a crude estimate of the integration error. It is only the
+        difference to the integral computed on a grid refined by a factor
+        two (scaled by 4/3 for the trapezoidal rule) or with one more node per
+        interval (Gauss-Legendre rule), not a rigorous bound. Default: False
+
+    Returns
+    -------
+    val : `~astropy.units.Quantity` or array-like
+        Integral
+    err : `~astropy.units.Quantity` or array-like
+        Absolute integration error estimate, only if ``return_error=True``
     """
-    is_quantity = False
+    if method == "trapz_loglog":
+        integrate = _integrate_trapz_loglog
+    elif method == "gauss_legendre":
+        integrate = _integrate_gauss_legendre
+    else:
+        raise ValueError(
+            "Invalid integration method: {!r}, choose one of {}".format(
+                method, INTEGRATION_METHODS
+            )
+        )
+
+    unit = 1
     if isinstance(xmin, Quantity):
         unit = xmin.unit
         xmin = xmin.value
         xmax = xmax.to(unit).value
-        is_quantity = True
 
+    def f(x):
+        return func(x * unit)
+
+    val = integrate(f, xmin, xmax, ndecade, order, intervals, refine=False) * unit
+
+    if return_error:
+        val_refined = integrate(f, xmin, xmax, ndecade, order, intervals, refine=True)
+        err = np.abs(val_refined * unit - val)
+        if method == "trapz_loglog":
+            # Richardson estimate for a second order rule
+            err = err * 4. / 3
+        return val, err
+
+    return val
+
+
+def _integrate_trapz_loglog(func, xmin, xmax, ndecade, order, intervals, refine):
+    """Log-log trapezoidal rule, see `integrate_spectrum`."""
     if np.isscalar(xmin):
         logmin = np.log10(xmin)
         logmax = np.log10(xmax)
@@ -161,14 +235,74 @@ def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
     else:
         x = np.append(xmin, xmax[-1])
 
-    if is_quantity:
-        x = x * unit
+    if not refine:
+        return _trapz_loglog(func(x), x, intervals=intervals)
 
+    # insert the logarithmic bin centers and sum the pairs of sub-intervals
+    x_fine = np.empty(2 * len(x) - 1)
+    x_fine[::2], x_fine[1::2] = x, np.sqrt(x[:-1] * x[1:])
+    val = _trapz_loglog(func(x_fine), x_fine, intervals=True)
+    val = val[::2] + val[1::2]
+
+    if intervals:
+        return val
+
+    return np.sum(val)
+
+
+def _integrate_gauss_legendre(func, xmin, xmax, ndecade, order, intervals, refine):
+    """Gauss-Legendre rule in log energy, see `integrate_spectrum`."""
+    if np.isscalar(xmin):
+        decades = np.log10(xmax / xmin)
+        n_panels = max(int(np.ceil(decades * ndecade / order)), 1)
+        x = np.logspace(np.log10(xmin), np.log10(xmax), n_panels + 1)
+        xmin, xmax = x[:-1], x[1:]
+
+    if refine:
+        order += 1
+
+    x, weights = _gauss_legendre_nodes(xmin, xmax, order)
     y = func(x)
 
-    val = _trapz_loglog(y, x, intervals=intervals)
+    try:
+        y_unit = y.unit
+        y = y.value
+    except AttributeError:
+        y_unit = 1
 
-    return val
+    val = np.sum(y * weights, axis=-1)
+
+    if not intervals:
+        val = np.sum(val)
+
+    return val * y_unit
+
+
+def _gauss_legendre_nodes(xmin, xmax, order):
+    """Nodes and weights of the Gauss-Legendre rule in log energy.
+
+    The weights include the Jacobian ``x`` of the log transformation, so that
+    the integral of ``y = func(x)`` is ``np.sum(y * weights, axis=-1)``.
+
+    Parameters
+    ----------
+    xmin, xmax : array-like
+        Integration range minimum and maximum
+    order : int
+        Number of nodes per interval
+
+    Returns
+    -------
+    x, weights : `~numpy.ndarray`
+        Nodes and weights, with an additional last axis of length ``order``.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    logmin = np.log(np.asarray(xmin, dtype=float))[..., np.newaxis]
+    logmax = np.log(np.asarray(xmax, dtype=float))[..., np.newaxis]
+
+    half_width = 0.5 * (logmax - logmin)
+    x = np.exp(logmin + half_width * (nodes + 1))
+    return x, x * half_width * weights
 
 
 # This function is copied over from https://github.com/zblz/naima/blob/master/naima/utils.py#L261
@@ -259,3 +393,67 @@ def _trapz_loglog(y, x, axis=-1, intervals=False):
     ret = np.add.reduce(trapzs, axis) * x_unit * y_unit
 
     return ret
+
+
+def _trapz_loglog_gradient(y, dy, x):
+    r"""Derivative of the log-log trapezoidal integrals in each interval.
+
+    The log-log trapezoidal rule for one interval can be written as
+    :math:`I = L (u_2 - u_1) / \log(u_2 / u_1)` with :math:`u = x y` and
+    :math:`L = \log(x_2 / x_1)`. Its derivative with respect to a model
+    parameter is obtained by the chain rule from the derivatives ``dy`` of
+    the function values at the interval edges.
+
+    Parameters
+    ----------
+    y : array_like
+        Function values at the interval edges.
+    dy : array_like
+        Derivative of the function values with respect to one parameter.
+    x : array_like
+        Interval edges.
+
+    Returns
+    -------
+    gradient : array_like
+        Derivative of the integral in each interval.
+    """
+    try:
+        y = y.value
+    except AttributeError:
+        pass
+    try:
+        dy_unit = dy.unit
+        dy = dy.value
+    except AttributeError:
+        dy_unit = 1.
+    try:
+        x_unit = x.unit
+        x = x.value
+    except AttributeError:
+        x_unit = 1.
+
+    y = np.asanyarray(y, dtype=np.float64) * np.ones(x.shape)
+    dy = np.asanyarray(dy, dtype=np.float64) * np.ones(x.shape)
+    x = np.asanyarray(x, dtype=np.float64)
+
+    x1, x2 = x[:-1], x[1:]
+    u1, u2 = x1 * y[:-1], x2 * y[1:]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_x = np.log(x2 / x1)
+        t = np.log(u2 / u1)
+        small = np.abs(t) < 1e-3
+        t_ = np.where(small, 1., t)
+        # use a series expansion for almost constant u to avoid cancellation
+        d_u1 = np.where(
+            small, 0.5 + t / 6. + t ** 2 / 24., (np.expm1(t_) - t_) / t_ ** 2
+        )
+        d_u2 = np.where(
+            small, 0.5 - t / 6. + t ** 2 / 24., (t_ + np.expm1(-t_)) / t_ ** 2
+        )
+        grads = log_x * (d_u1 * x1 * dy[:-1] + d_u2 * x2 * dy[1:])
+
+    tozero = (y[:-1] == 0.) | (y[1:] == 0.) | (x1 == x2)
+    grads[tozero] = 0.
+    return grads * x_unit * dy_unit
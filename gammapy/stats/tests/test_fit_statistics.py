@@ -118,6 +118,30 @@ def test_cstat(test_data, reference_values):
     assert_allclose(statsvec, reference_values["cstat"])
 
 
+def test_cash_derivative(test_data):
+    n_on, mu_on = test_data["n_on"], test_data["mu_sig"]
+    eps = 1e-6 * mu_on
+    desired = (stats.cash(n_on, mu_on + eps) - stats.cash(n_on, mu_on - eps)) / (
+        2 * eps
+    )
+    actual = stats.cash_derivative(n_on=n_on, mu_on=mu_on)
+    assert_allclose(actual, desired, rtol=1e-5)
+
+
+def test_wstat_derivative(test_data):
+    kwargs = dict(
+        n_on=test_data["n_on"], n_off=test_data["n_off"], alpha=test_data["alpha"]
+    )
+    mu_sig = test_data["mu_sig"]
+    eps = 1e-6 * mu_sig
+    desired = (
+        stats.wstat(mu_sig=mu_sig + eps, **kwargs)
+        - stats.wstat(mu_sig=mu_sig - eps, **kwargs)
+    ) / (2 * eps)
+    actual = stats.wstat_derivative(mu_sig=mu_sig, **kwargs)
+    assert_allclose(actual, desired, rtol=1e-4)
+
+
 def test_wstat_corner_cases():
     """test WSTAT formulae for corner cases"""
     n_on = 0
@@ -31,6 +31,19 @@ class Fit(object):
         """Total likelihood given the current model parameters"""
         pass
 
+    def total_stat_gradient(self, parameters):
+        """Gradient of the total likelihood with respect to the parameter values.
+
+        Returns ``None`` by default, in which case the optimizer computes
+        derivatives numerically.
+        """
+        return None
+
+    @property
+    def has_gradient(self):
+        """Whether `total_stat_gradient` is implemented (bool)."""
+        return type(self).total_stat_gradient is not Fit.total_stat_gradient
+
     def likelihood_profiles(self, model, parameters="all"):
         """Compute likelihood profiles for multiple parameters.
 
@@ -114,13 +127,18 @@ class Fit(object):
         ts = np.abs(stat_null - stat_best_fit)
         return np.sign(amplitude) * np.sqrt(ts)
 
-    def optimize(self, backend="minuit", **kwargs):
+    def optimize(self, backend="minuit", gradient=False, **kwargs):
         """Run the optimization
 
         Parameters
         ----------
         backend : {"minuit", "sherpa"}
             Which fitting backend to use.
+        gradient : bool
+            Pass the analytical gradient `total_stat_gradient` to the optimizer.
+            Only supported by the `"minuit"` backend and by fits implementing
+            `total_stat_gradient`. By default the optimizer computes the
+            derivatives numerically.
         **kwargs : dict
             Keyword arguments passed to the optimizer. For the `"minuit"` backend
             see https://iminuit.readthedocs.io/en/latest/api.html#iminuit.Minuit
@@ -148,6 +166,18 @@ class Fit(object):
             parameters.autoscale()
 
         optimize = self._optimize_funcs[backend]
+
+        if gradient:
+            if backend != "minuit":
+                raise ValueError(
+                    "Gradient not supported by backend: {!r}".format(backend)
+                )
+            if not self.has_gradient:
+                raise ValueError(
+                    "{} has no analytical gradient".format(type(self).__name__)
+                )
+            kwargs["gradient"] = self.total_stat_gradient
+
         factors, info, optimizer = optimize(
             parameters=parameters, function=self.total_stat, **kwargs
         )
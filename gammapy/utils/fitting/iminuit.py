@@ -10,7 +10,7 @@ __all__ = ["optimize_iminuit"]
 log = logging.getLogger(__name__)
 
 
-def optimize_iminuit(parameters, function, **kwargs):
+def optimize_iminuit(parameters, function, gradient=None, **kwargs):
     """iminuit optimization
 
     Parameters
@@ -19,6 +19,9 @@ def optimize_iminuit(parameters, function, **kwargs):
         Parameters with starting values
     function : callable
         Likelihood function
+    gradient : callable, optional
+        Gradient of the likelihood function with respect to the parameter
+        values. If not given, Minuit computes the derivatives numerically.
     **kwargs : dict
         Options passed to `iminuit.Minuit` constructor
 
@@ -36,7 +39,10 @@ def optimize_iminuit(parameters, function, **kwargs):
     kwargs.update(make_minuit_par_kwargs(parameters))
 
     parnames = _make_parnames(parameters)
-    minuit_func = MinuitFunction(function, parameters)
+    minuit_func = MinuitFunction(function, parameters, gradient)
+
+    if gradient is not None:
+        kwargs["grad"] = minuit_func.grad
 
     minuit = Minuit(minuit_func.fcn, forced_parameters=parnames, **kwargs)
     minuit.migrad()
@@ -80,16 +86,27 @@ class MinuitFunction(object):
         Parameters with starting values
     function : callable
         Likelihood function
+    gradient : callable, optional
+        Gradient of the likelihood function
     """
 
-    def __init__(self, function, parameters):
+    def __init__(self, function, parameters, gradient=None):
         self.function = function
         self.parameters = parameters
+        self.gradient = gradient
 
     def fcn(self, *factors):
         self.parameters.set_parameter_factors(factors)
         return self.function(self.parameters)
 
+    def grad(self, *factors):
+        self.parameters.set_parameter_factors(factors)
+        gradient = self.gradient(self.parameters)
+        if gradient is None:
+            raise ValueError("Model has no analytical gradient, use gradient=False")
+        scales = [par.scale for par in self.parameters.parameters]
+        return gradient * np.array(scales)
+
 
 def make_minuit_par_kwargs(parameters):
     """Create *Parameter Keyword Arguments* for the `Minuit` constructor.
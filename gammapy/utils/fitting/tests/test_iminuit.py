@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
 from numpy.testing import assert_allclose
 from ...testing import requires_dependency
 from .. import Parameter, Parameters, optimize_iminuit
@@ -44,3 +45,27 @@ def test_iminuit():
     # The next assert can be added when we no longer test on iminuit 1.2
     # See https://github.com/gammapy/gammapy/pull/1771
     # assert states[1]["upper_limit"] is None
+
+
+def grad(parameters):
+    x = parameters["x"].value
+    y = parameters["y"].value
+    z = parameters["z"].value
+    return np.array([2 * (x - 2), 2 * (y - 3), 2 * (z - 4)])
+
+
+@requires_dependency("iminuit")
+def test_iminuit_gradient():
+    pars = Parameters(
+        [Parameter("x", 2.1), Parameter("y", 3.1), Parameter("z", 0.41, scale=10)]
+    )
+
+    factors, info, minuit = optimize_iminuit(
+        function=fcn, parameters=pars, gradient=grad
+    )
+    assert info["success"]
+
+    pars.set_parameter_factors(factors)
+    assert_allclose(pars["x"].value, 2, rtol=1e-3)
+    assert_allclose(pars["y"].value, 3, rtol=1e-3)
+    assert_allclose(pars["z"].value, 4, rtol=1e-3)
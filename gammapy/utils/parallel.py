@@ -0,0 +1,216 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Utilities to run computations in parallel with shared input arrays."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import os
+import shutil
+import tempfile
+from collections import deque
+from multiprocessing import Pool, cpu_count
+import numpy as np
+
+__all__ = ["SharedArrayPool"]
+
+# Arrays attached by the current worker process, see `_attach_arrays`
+_ATTACHED = {"dirname": None, "arrays": {}}
+
+
+def _attach_arrays(filenames):
+    """Memory map the shared arrays in a worker process.
+
+    The memory maps are kept for all tasks of one `SharedArrayPool.map` call,
+    so every worker opens every file only once.
+    """
+    dirname = os.path.dirname(next(iter(filenames.values()), ""))
+    if _ATTACHED["dirname"] != dirname:
+        _ATTACHED["dirname"], _ATTACHED["arrays"] = dirname, {}
+
+    arrays = _ATTACHED["arrays"]
+    for name, filename in filenames.items():
+        if name not in arrays:
+            # copy-on-write, so that code expecting writeable arrays works
+            arrays[name] = np.load(filename, mmap_mode="c")
+    return {name: arrays[name] for name in filenames}
+
+
+def _run_chunk(args):
+    func, filenames, items = args
+    arrays = _attach_arrays(filenames)
+    return [func(item, **arrays) for item in items]
+
+
+class SharedArrayPool(object):
+    """Worker pool sharing large read-only arrays with the workers.
+
+    `multiprocessing.Pool` pickles all function arguments and sends them to
+    the workers with every task. Here the large input arrays are instead
+    written once per `map` call to ``.npy`` files, which the workers
+    memory map. The files are placed in ``/dev/shm`` if available, so on
+    Linux the data is held in shared memory and never copied to the
+    workers. The items are sent to the workers in chunks.
+
+    The worker processes are started on the first `map` call and kept alive
+    until `close` is called, so one pool can be reused for many calls.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        Number of worker processes, by default the number of CPUs. For
+        ``n_jobs=1`` everything is computed in the current process.
+    chunksize : int, optional
+        Number of items per task. By default the items are split into
+        ``4 * n_jobs`` chunks.
+    tmpdir : str, optional
+        Directory for the shared array files, by default ``/dev/shm`` if it
+        exists and the system temp directory otherwise.
+
+    Examples
+    --------
+    Convolve an image with many kernels::
+
+        from functools import partial
+        from scipy.signal import fftconvolve
+        from gammapy.utils.parallel import SharedArrayPool
+
+        def convolve(kernel, image):
+            return fftconvolve(image, kernel, mode="same")
+
+        with SharedArrayPool(n_jobs=4) as pool:
+            images = pool.map(convolve, kernels, arrays={"image": image})
+    """
+
+    def __init__(self, n_jobs=None, chunksize=None, tmpdir=None):
+        self.n_jobs = n_jobs or cpu_count()
+        self.chunksize = chunksize
+        self.tmpdir = tmpdir
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_pool(self):
+        """Persistent worker pool, created on first use."""
+        if self._pool is None:
+            self._pool = Pool(processes=self.n_jobs)
+        return self._pool
+
+    def _get_tmpdir(self):
+        if self.tmpdir is not None:
+            return self.tmpdir
+        elif os.path.isdir("/dev/shm"):
+            return "/dev/shm"
+        else:
+            return None
+
+    def _split(self, items):
+        """Split items into chunks of ``chunksize``."""
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = int(np.ceil(len(items) / (4 * self.n_jobs)))
+        chunksize = max(chunksize, 1)
+        return [items[idx : idx + chunksize] for idx in range(0, len(items), chunksize)]
+
+    def map(self, func, items, arrays=None):
+        """Compute ``func(item, **arrays)`` for every item.
+
+        Parameters
+        ----------
+        func : callable
+            Function to apply, must be picklable, e.g. a module level function
+            or a `functools.partial` of one.
+        items : iterable
+            Items to apply the function to. They are pickled and should be
+            small, e.g. pixel positions.
+        arrays : dict of `~numpy.ndarray`, optional
+            Large input arrays, passed to the function as keyword arguments.
+            They are shared with the workers and must not be modified.
+
+        Returns
+        -------
+        results : list
+            Results in the order of the items.
+        """
+        items = list(items)
+        arrays = arrays or {}
+
+        if self.n_jobs == 1 or len(items) == 0:
+            return [func(item, **arrays) for item in items]
+
+        dirname = tempfile.mkdtemp(prefix="gammapy-", dir=self._get_tmpdir())
+        try:
+            filenames = self._save_arrays(arrays, dirname)
+            tasks = [(func, filenames, chunk) for chunk in self._split(items)]
+            results = self._get_pool().map(_run_chunk, tasks)
+        finally:
+            shutil.rmtree(dirname, ignore_errors=True)
+
+        return [result for chunk in results for result in chunk]
+
+    def imap(self, func, items, arrays=None, max_in_flight=None):
+        """Lazily compute ``func(item, **arrays)`` for every item.
+
+        In contrast to `map`, items are taken from the iterable only when
+        there is room for them and results are yielded as soon as they are
+        ready. Together with a lazy iterable of items this bounds the memory
+        to ``max_in_flight`` items and results, independent of the number of
+        items.
+
+        Parameters
+        ----------
+        func : callable
+            Function to apply, must be picklable.
+        items : iterable
+            Items to apply the function to, sent to the workers one by one.
+        arrays : dict of `~numpy.ndarray`, optional
+            Large input arrays, passed to the function as keyword arguments.
+        max_in_flight : int, optional
+            Maximum number of items submitted to the workers, whose results
+            were not yet yielded. Default is ``2 * n_jobs``.
+
+        Yields
+        ------
+        result : object
+            Results in the order of the items.
+        """
+        arrays = arrays or {}
+
+        if self.n_jobs == 1:
+            for item in items:
+                yield func(item, **arrays)
+            return
+
+        max_in_flight = max_in_flight or 2 * self.n_jobs
+        dirname = tempfile.mkdtemp(prefix="gammapy-", dir=self._get_tmpdir())
+        try:
+            filenames = self._save_arrays(arrays, dirname)
+            pool = self._get_pool()
+
+            pending = deque()
+            for item in items:
+                task = (func, filenames, [item])
+                pending.append(pool.apply_async(_run_chunk, (task,)))
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().get()[0]
+
+            while pending:
+                yield pending.popleft().get()[0]
+        finally:
+            shutil.rmtree(dirname, ignore_errors=True)
+
+    @staticmethod
+    def _save_arrays(arrays, dirname):
+        """Write arrays to ``.npy`` files, return dict of filenames."""
+        filenames = {}
+        for name, array in arrays.items():
+            filenames[name] = os.path.join(dirname, name + ".npy")
+            np.save(filenames[name], np.asarray(array))
+        return filenames
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
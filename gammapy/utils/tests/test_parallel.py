@@ -0,0 +1,48 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ..parallel import SharedArrayPool
+
+
+def _weighted_sum(idx, data, weights):
+    return np.sum(data[idx] * weights)
+
+
+@pytest.mark.parametrize("n_jobs, chunksize", [(1, None), (2, None), (2, 3)])
+def test_shared_array_pool(n_jobs, chunksize, tmpdir):
+    data = np.arange(20.).reshape(10, 2)
+    weights = np.array([1., 2.])
+
+    pool = SharedArrayPool(n_jobs=n_jobs, chunksize=chunksize, tmpdir=str(tmpdir))
+    with pool:
+        arrays = {"data": data, "weights": weights}
+        actual = pool.map(_weighted_sum, range(10), arrays=arrays)
+        assert_allclose(actual, np.sum(data * weights, axis=1))
+
+        # the pool can be reused with other arrays
+        arrays = {"data": -data, "weights": weights}
+        actual = pool.map(_weighted_sum, [0, 9], arrays=arrays)
+        assert_allclose(actual, [-2, -56])
+
+    assert pool._pool is None
+    # shared array files are removed after every call
+    assert tmpdir.listdir() == []
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_shared_array_pool_imap(n_jobs, tmpdir):
+    data = np.arange(20.).reshape(10, 2)
+    weights = np.array([1., 2.])
+
+    # items are consumed lazily from a generator
+    items = (idx for idx in range(10))
+
+    with SharedArrayPool(n_jobs=n_jobs, tmpdir=str(tmpdir)) as pool:
+        arrays = {"data": data, "weights": weights}
+        results = pool.imap(_weighted_sum, items, arrays=arrays, max_in_flight=3)
+        actual = list(results)
+
+    assert_allclose(actual, np.sum(data * weights, axis=1))
+    assert tmpdir.listdir() == []